@@ -1,6 +1,6 @@
 import inflect
 from typing import List
-from equatable import EquatableMixin
+from equatable import ValueMixin
 from typing import Dict, Any, Optional
 
 
@@ -27,14 +27,17 @@ class PostProcessed:
     """
     A type which can be modified before being send to the game, or used.
     """
+    __slots__ = ()
+
     def post_processed(self):
         return self
 
 
-class Action(EquatableMixin, PostProcessed):
+class Action(ValueMixin, PostProcessed):
     """
     An action that the player can command the spy to make.
     """
+    __slots__ = ()
 
     def positive_responses(self, game_response: GameResponse) -> List[str]:
         """
@@ -125,6 +128,7 @@ class Stop(Action):
     """
     Tells the spy to stop whatever they're doing.
     """
+    __slots__ = ()
 
     def __str__(self):
         return 'stop'
@@ -140,9 +144,11 @@ class Composite(Action):
     """
     An action made of multiple actions, e.g. go left then go right.
     """
+    __slots__ = ('actions',)
 
     def __init__(self, actions: List[Action]):
-        self.actions = actions
+        # Stored as a tuple so the composite is immutable and hashable.
+        self.actions = tuple(actions)
 
     def __getitem__(self, index: int) -> Action:
         return self.actions[index]
@@ -1,12 +1,14 @@
 from actions.action import PostProcessed
 from typing import List
-from equatable import EquatableMixin
+from equatable import ValueMixin
 
 
-class Conversation(PostProcessed, EquatableMixin):
+class Conversation(PostProcessed, ValueMixin):
     """
     Represents a response that does not need to be sent to the game server.
     """
+    __slots__ = ()
+
     def responses(self) -> List[str]:
         """
         :return: default responses for if no action was parsed.
@@ -18,6 +20,8 @@ class Greeting(Conversation):
     """
     The player said a greeting to the spy, e.g. Hello.
     """
+    __slots__ = ()
+
     def responses(self) -> List[str]:
         return [
             "Hello",
@@ -31,6 +35,8 @@ class WhatName(Conversation):
     """
     The player asked what the spy's name is.
     """
+    __slots__ = ()
+
     def responses(self) -> List[str]:
         return [
             "Ethan Hunt"
@@ -41,6 +47,8 @@ class WhoAreYou(Conversation):
     """
     The player asked who the spy was.
     """
+    __slots__ = ()
+
     def responses(self) -> List[str]:
         return [
             "Me? ... I know who I am!"
@@ -51,6 +59,8 @@ class Obscenity(Conversation):
     """
     The player swore at the spy.
     """
+    __slots__ = ()
+
     def responses(self) -> List[str]:
         return [
             "I don't appreciate that",
@@ -62,8 +72,10 @@ class Repeat(Conversation):
     """
     The player asked the spy to repeat something.
     """
+    __slots__ = ('words',)
+
     def __init__(self, words: List[str]):
-        self.words = words
+        self.words = tuple(words)
 
     def responses(self) -> List[str]:
         return [' '.join(self.words)]
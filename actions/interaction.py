@@ -8,6 +8,7 @@ class PickUp(PartialClassMixin, Action):
     """
     Tells the spy to pick up an object, e.g. pick up the rock on your left.
     """
+    __slots__ = ('object_name', 'direction')
 
     object_name: str
     direction: ObjectRelativeDirection
@@ -31,6 +32,7 @@ class Throw(Action):
     """
     Tells the spy to throw whatever object they've picked up.
     """
+    __slots__ = ('target',)
 
     target: Location
 
@@ -54,6 +56,7 @@ class ThrowAtGuard(Action):
     """
     Tells the spy to throw whatever they've picked up at a guard.
     """
+    __slots__ = ('direction',)
 
     # The direction of the guard to throw something at, relative to the spy.
     direction: ObjectRelativeDirection
@@ -78,6 +81,7 @@ class StrangleGuard(Action):
     """
     Tells the spy to kill the guard by strangling them.
     """
+    __slots__ = ('direction',)
 
     # The direction of the guard.
     direction: ObjectRelativeDirection
@@ -99,6 +103,7 @@ class AutoTakeOutGuard(Action):
     Tells the spy to kill the guard. This is either performed by throwing something at the guard, or by strangling
     them. The choice is made depending on whether the spy is holding something or not.
     """
+    __slots__ = ('direction',)
 
     # The direction of the guard.
     direction: ObjectRelativeDirection
@@ -119,6 +124,8 @@ class Drop(Action):
     """
     Tells the spy to drop the object they're holding.
     """
+    __slots__ = ()
+
     def __str__(self):
         return 'drop'
 
@@ -127,6 +134,7 @@ class Hack(PartialClassMixin, Action):
     """
     Tells the spy to hack an object.
     """
+    __slots__ = ('object_name', 'direction')
     # The specific name of the object to hack, e.g. hacking a server equates to hacking a terminal.
     object_name: str
     # The direction, relative to the spy, of the object.
@@ -163,6 +171,7 @@ class Pickpocket(Action):
     """
     Tells the spy to pickpocket a guard.
     """
+    __slots__ = ('direction',)
 
     # The direction of the guard relative to the spy.
     direction: ObjectRelativeDirection
@@ -178,5 +187,7 @@ class DestroyGenerator(Action):
     """
     Tells the spy to destroy the generator.
     """
+    __slots__ = ()
+
     def __str__(self):
         return 'destroy generator'
@@ -1,4 +1,4 @@
-from equatable import EquatableMixin
+from equatable import EquatableMixin, ValueMixin
 from utils import PartialClassMixin
 from typing import Optional
 
@@ -38,17 +38,18 @@ class FloorDirection:
     DOWN = 'down'
 
 
-class Location(EquatableMixin):
+class Location(ValueMixin):
     """
     Base class for locations.
     """
-    pass
+    __slots__ = ()
 
 
 class Absolute(Location):
     """
     Represents the location of a unique object in the map.
     """
+    __slots__ = ('place_name',)
 
     place_name: str
 
@@ -66,6 +67,7 @@ class Positional(PartialClassMixin, Location):
     """
     The location of an object, out of many, relative to the player. E.g. the third door on the left.
     """
+    __slots__ = ('position', 'object_name', 'direction')
 
     position: int             # e.g. third
     object_name: str          # e.g. door
@@ -84,6 +86,7 @@ class Directional(Location):
     """
     Directional locations relative to the player, e.g. forwards 10 meters.
     """
+    __slots__ = ('direction', 'distance')
 
     direction: MoveDirection
     distance: Distance
@@ -100,6 +103,7 @@ class Stairs(Location):
     """
     A location up or downstairs from the current location of the player.
     """
+    __slots__ = ('direction',)
 
     # If None, then the game decides where the spy should go, e.g. if there are only stairs upwards.
     direction: Optional[FloorDirection]
@@ -115,6 +119,7 @@ class Behind(Location):
     """
     A location behind an object.
     """
+    __slots__ = ('object_name',)
 
     object_name: str
 
@@ -129,6 +134,7 @@ class EndOf(Location):
     """
     E.g. Go to the end of the room, corridor, room 102, etc
     """
+    __slots__ = ('object_name',)
 
     object_name: str
 
@@ -19,6 +19,7 @@ class Turn(Action):
     """
     Tells the spy to turn to a particular direction.
     """
+    __slots__ = ('direction',)
 
     direction: MoveDirection
 
@@ -33,6 +34,7 @@ class ChangeStance(Action):
     """
     Tells the spy to change their stance.
     """
+    __slots__ = ('stance',)
 
     stance: Stance
 
@@ -47,6 +49,7 @@ class ChangeSpeed(Action):
     """
     Tells the spy to change the speed they're performing their current movement at.
     """
+    __slots__ = ('speed',)
 
     speed: Speed
 
@@ -61,6 +64,7 @@ class Move(PartialClassMixin, Action):
     """
     Tells the spy to move to a location.
     """
+    __slots__ = ('speed', 'location', 'stance')
 
     def __init__(self, speed: Speed, location: Location, stance: Optional[Stance]):
         """
@@ -110,6 +114,7 @@ class Hide(Action):
     """
     Tells the spy to hide behind an object. If no object is given, the spy will hide behind the closest object.
     """
+    __slots__ = ('object_name',)
 
     def __init__(self, object_name: Optional[str]):
         self.object_name = object_name
@@ -133,6 +138,7 @@ class ThroughDoor(Action):
     """
     Tells the spy to open the nearest door and walk through it.
     """
+    __slots__ = ('direction',)
 
     direction: ObjectRelativeDirection
 
@@ -147,5 +153,7 @@ class LeaveRoom(Action):
     """
     Tells the spy to leave they room they are in.
     """
+    __slots__ = ()
+
     def __str__(self):
         return 'leave the room'
@@ -19,13 +19,20 @@ class Question(Action, PostProcessed):
     Base class for questions. Used to identify questions so they can be sent
     to a different handler in the game server.
     """
-    pass
+    __slots__ = ()
+
+    # Whether the answer only changes when the spy performs an action, so the game's response can be reused until the
+    # spy acts, e.g. the spy's location. The answers of other questions, e.g. about guards, change by themselves.
+    idempotent = False
 
 
 class InventoryContentsQuestion(Question):
     """
     An action to ask the spy what's in their inventory.
     """
+    __slots__ = ()
+    idempotent = True
+
     def __str__(self):
         return 'inventory contents question'
 
@@ -58,6 +65,9 @@ class LocationQuestion(Question):
     """
     An action to ask the spy where they are.
     """
+    __slots__ = ()
+    idempotent = True
+
     def __str__(self):
         return 'location question'
 
@@ -78,6 +88,8 @@ class GuardsQuestion(Question):
     """
     An action to ask the spy if they can see any guards.
     """
+    __slots__ = ()
+
     def __str__(self):
         return 'guards question'
 
@@ -121,6 +133,9 @@ class SurroundingsQuestion(Question):
     """
     An action to ask the spy what they can see around them.
     """
+    __slots__ = ()
+    idempotent = True
+
     def __str__(self):
         return 'surroundings question'
 
@@ -167,6 +182,7 @@ class SeeObjectQuestion(Question):
     """
     An action to ask the spy whether they can see a specific object, e.g. 'Can you see a rock near you?'
     """
+    __slots__ = ('object_name',)
 
     def __init__(self, object_name: str):
         """
@@ -1,24 +1,45 @@
+import functools
 import json
+import os
 import random
-from unittest import TestLoader, TextTestRunner
+from eventlet import tpool
 import requests
-from flask import Flask, render_template
+from concurrent.futures import Executor, ProcessPoolExecutor
+from flask import Flask, render_template, jsonify, request as request_context
 from flask_socketio import SocketIO, emit
 from nltk.corpus import wordnet as wn
 from requests import Response
 
 import inflect
-from interface.speech_responder import SpeechResponder
-from actions.action import Action, ActionErrorCode
+from interface.speech_responder import SpeechResponder, Hypothesis
+from actions.action import Action
 from actions.conversation import Conversation
 from encoders.encode_action import ActionEncoder
-from parsing.parser import Parser
-from parsing.parse_action import statement
+from parsing.parser import Parser, semantic_similarity, use_adaptive_order
+from parsing.warmup_corpus import read_corpus, warm_up, coverage_report
+from parsing.synset_index import build_synset_index, use_subset, seed_words
+from parsing.wordnet_subset import build_subset, load_subset
+from parsing.word_vectors import VectorSimilarity
+from parsing.similarity_backend import use_backend
+from parsing.cache_snapshot import load_snapshot, save_snapshot, save_snapshots_periodically, snapshot_version
+from parsing.shared_cache import SharedSimilarityCache, use_shared_cache
+from parsing.parse_action import statement, parse_single_action, stop
+from parsing.pre_processing import pre_process
+from parsing.statement_classifier import StatementClassifier, examples_from_log, train
+from parsing.grammar_profile import PROFILES
 from actions.action import GameResponse
 from actions.question import Question
 from random import randrange
-from interface.conversation_logging import log_conversation
+from interface.mock_game import mock_game_response
+from interface.metrics import metrics
+from interface.startup import Startup
+from interface import prefork
+from interface.conversation_logging import log_conversation, LOG_FILENAME
+from interface.load_controller import LoadController
+from interface.question_cache import QuestionCache
+from interface.session_queue import SessionQueue, SessionQueues
 from unittest.mock import Mock
+from typing import Optional, Callable, List, Set, Tuple, Union
 
 
 app = Flask(__name__, static_url_path='')
@@ -32,10 +53,91 @@ GAME_MODE = True
 # The address of the game server. This will only be used if GAME_MODE is enabled.
 GAME_SERVER = 'http://192.168.1.10:8080/'
 
-# If True, all tests are run before the server is started, thus filling the cache for the semantic similarity.
-# This allows for responses to be generated more quickly.
+# If True, the transcripts in the warmup corpus are parsed when the server starts, thus filling the cache for the
+# semantic similarity. This allows for responses to be generated more quickly.
 FILL_CACHE = True
 
+# The number of worker processes to serve with, see `gunicorn.conf.py`. If more than 0, the server preloads before the
+# workers are forked, so they share the loaded WordNet and warmed caches. Otherwise a single process preloads in the
+# background after it starts. `gunicorn.conf.py` reads this without importing the app, so it must be a literal.
+PREFORK_WORKERS = 0
+
+# The file the semantic similarities are cached in, which is shared by all worker processes so each similarity is only
+# computed once by any of them. Only used with `PREFORK_WORKERS`. Similarities read from it have float32 precision.
+# None caches the similarities in each process.
+SHARED_SIMILARITY_CACHE = None
+
+# The number of similarities the shared cache holds. Each uses 16 bytes.
+SHARED_SIMILARITY_CACHE_SIZE = 1 << 20
+
+# The file of transcripts, one per line, parsed to fill the cache. It is generated from the grammar by
+# `parsing/warmup_corpus.py`.
+WARMUP_CORPUS = 'warmup_corpus.txt'
+
+# The number of worker processes used to parse the parts of composite actions (e.g. 'go left then pick up the rock')
+# concurrently. If 0, the parts are parsed one after the other in the server process.
+COMPOSITE_WORKERS = 0
+
+# The number of distinct parses of each transcript to keep. If the game cannot perform the action of the strongest
+# parse, the others are used without parsing the transcript again, see `ALTERNATIVE_MARGIN`. Keeping more than one
+# parse stops `strongest` returning as soon as a parser gives the maximum response, so parsing is slower.
+BEAM_WIDTH = 1
+
+# If the game cannot perform the action of the strongest parse, alternative actions of the same type whose response is
+# at most this much lower are sent to the game in turn, e.g. picking up another object. The other alternatives are
+# often actions the player did not say, so they are shown to the player to choose from instead.
+ALTERNATIVE_MARGIN = 0.1
+
+# The file the lexical caches (e.g. semantic similarity, POS tags) are saved to, so they can be restored when the
+# server restarts instead of filling the cache again. None disables saving and restoring.
+CACHE_SNAPSHOT = 'lexical_cache.snapshot'
+
+# The number of seconds between saving snapshots of the lexical caches.
+CACHE_SNAPSHOT_INTERVAL = 300
+
+# The directory the subset of WordNet used by the grammar is saved to. If the subset exists it is loaded instead of the
+# full WordNet, which is only loaded if a word outside the subset is parsed. None always loads the full WordNet.
+WORDNET_SUBSET = 'wordnet_subset'
+
+# The directory of word vectors used to compare the meaning of words instead of WordNet, see `parsing/word_vectors.py`.
+# None uses WordNet.
+WORD_VECTORS = None
+
+# The file the statement classifier is saved to. The classifier is used to skip parsing with the grammars of actions,
+# questions, or conversation if the transcript is very unlikely to be one of them. If the file does not exist, the
+# classifier is trained from the conversation log when the server starts. None parses with every grammar.
+STATEMENT_CLASSIFIER = None
+
+# The minimum probability the statement classifier must give a family of grammars for it to be parsed with.
+STATEMENT_MARGIN = 0.05
+
+# Whether the alternative actions and questions are parsed in order of how often they are what players say, so parsing
+# can stop sooner. The parses are the same either way. Only alternatives whose maximum response is below 1 can be
+# skipped, which few are, so it is off by default.
+ADAPTIVE_ORDER = False
+
+# For the cheaper grammar profiles (exact words and spelling, then exact words only), the number of transcripts being
+# parsed or waiting in the players' queues, and the recent parse latency, in seconds, above which the profile is used
+# when the server is saturated. None always uses the full grammar, which compares the meaning of words.
+LOAD_THRESHOLDS = None
+
+# The number of seconds the game's responses to questions whose answers only change when the spy acts, e.g. where the
+# spy is, are reused for when the player asks again. The responses of a player are also forgotten when an action is sent
+# for them. None always sends questions to the game.
+QUESTION_CACHE_TTL = 2.0
+
+# Whether a player's new transcript replaces their transcripts waiting to be responded to, e.g. a 'stop' after a 'go',
+# rather than being responded to after them.
+SUPERSEDE_REQUESTS = True
+
+# The maximum number of a player's transcripts waiting to be responded to. Once reached, the player is asked to slow
+# down instead. Transcripts telling the spy to stop are always responded to next.
+MAX_PENDING_REQUESTS = 4
+
+# The minimum number of seconds between parsing a player's interim transcripts while they are speaking. Interim
+# transcripts which arrive sooner replace the one waiting, so only the newest is parsed.
+INTERIM_INTERVAL = 0.25
+
 
 def action_was_successful(game_json: GameResponse) -> bool:
     return game_json.get('type') != 'failure'
@@ -86,27 +188,62 @@ def make_parse_failure_speech_response(transcript: str) -> str:
     return r
 
 
-def make_speech_responder() -> SpeechResponder:
+def make_speech_responder(executor: Optional[Executor] = None) -> SpeechResponder:
     """
+    :param executor: used to parse the parts of composite actions concurrently.
     :return: a speech responder that parses actions and that responds to:
                - success with a random success speech from the action.
                - partial with speech determined by the type that failed to parse.
                - failure with a conversation parser.
     """
-    return SpeechResponder(statement(), make_action_speech_response, make_partial_speech_response, make_parse_failure_speech_response)
+    classifier = load_statement_classifier()
+    parser = statement(executor, BEAM_WIDTH, classifier, STATEMENT_MARGIN)
+
+    profiles = {}
+    load_controller = None
+    if LOAD_THRESHOLDS:
+        # The cheaper grammars are created up front, so switching between them under load costs nothing.
+        for profile in PROFILES[1:]:
+            profiles[profile] = statement(executor, BEAM_WIDTH, classifier, STATEMENT_MARGIN, profile)
+        # The transcripts waiting in the players' queues are counted in the load, since they are parsed one at a time.
+        load_controller = LoadController(LOAD_THRESHOLDS, backlog=lambda: g_session_queues.pending())
+
+    return SpeechResponder(parser, make_action_speech_response, make_partial_speech_response,
+                           make_parse_failure_speech_response, profiles=profiles, load_controller=load_controller)
+
+
+def load_statement_classifier() -> Optional[StatementClassifier]:
+    """
+    :return: the statement classifier, or None if it is disabled or has not been trained.
+    """
+    if STATEMENT_CLASSIFIER and os.path.exists(STATEMENT_CLASSIFIER):
+        return StatementClassifier.load(STATEMENT_CLASSIFIER)
+    return None
 
 
+# The grammar is created with the backend used to compare the meaning of words.
+if WORD_VECTORS:
+    use_backend(VectorSimilarity(WORD_VECTORS))
+
+use_adaptive_order(ADAPTIVE_ORDER)
+
 # Used to formulate responses to the user. This is initialised in main.
 g_speech_responder: SpeechResponder = make_speech_responder()
 
+# The game's responses to the questions asked by each player.
+g_question_cache: Optional[QuestionCache] = QuestionCache(QUESTION_CACHE_TTL) if QUESTION_CACHE_TTL else None
+
 
 def post_to_game(addr_postfix: str, action: Action) -> Response:
     """
     :return: the response of sending the action json to the server.
     """
-    action_json = json.loads(json.dumps(action, cls=ActionEncoder))
+    with metrics.timed('encode'):
+        action_json = json.loads(json.dumps(action, cls=ActionEncoder))
+
     addr = GAME_SERVER + addr_postfix
-    return requests.post(addr, json=action_json)
+    with metrics.timed('game'):
+        return requests.post(addr, json=action_json)
 
 
 def mock_post_to_game(addr_postfix: str, action: Action) -> Mock:
@@ -115,16 +252,7 @@ def mock_post_to_game(addr_postfix: str, action: Action) -> Mock:
     """
     r = Mock(spec=Response)
     r.status_code = 200
-    r.json.return_value = {
-        'type': 'success',  # Indicates whether the action could be performed in the game.
-        'inventory_item': 'rock',  # For if the user asks what the spy is carrying.
-        'location': 'the computer lab',  # For if the user asks where the spy is.
-        'num_guards': randrange(0, 10),  # For if the user asks about guards
-        'surroundings': ['server', 'camera', 'camera'],  # For if the user asks about the spy's surroundings
-        'mins_remaining': randrange(1, 5),
-        'error_code': ActionErrorCode.CANNOT_SEE,
-        'subject': 'rock'
-    }
+    r.json.return_value = mock_game_response()
     return r
 
 
@@ -137,17 +265,43 @@ def random_from_json(filename: str) -> str:
     return random.choice(entries)
 
 
-def process_transcript(transcript: str) -> str:
+def process_transcript(transcript: str, session: Optional[str] = None) -> str:
     """
+    :param session: identifies the player, e.g. the id of their socket.
     :return: parses the transcript into an action, then sends the action to the game server, then speaks a response.
     """
     log_conversation('transcript', transcript, print_nl_before=True)
 
     Parser.num_created = 0
     # The responder is used to keep track of state, such as whether the last transcript parsed to a partial.
-    make_speech, action = g_speech_responder.parse(transcript)
+    make_speech, action = g_speech_responder.parse(transcript, session)
     print('Processed using', Parser.num_created, 'parsers')
 
+    return respond_to_parse(make_speech, action, session)
+
+
+def process_hypotheses(hypotheses: List[Hypothesis], session: Optional[str] = None) -> str:
+    """
+    :param hypotheses: the transcripts of what the player may have said, and the confidence of the speech recogniser.
+    :return: parses all the hypotheses, and uses the best to create a response as in `process_transcript`.
+    """
+    log_conversation('hypotheses', hypotheses, print_nl_before=True)
+
+    Parser.num_created = 0
+    make_speech, action, transcript = g_speech_responder.parse_hypotheses(hypotheses, session)
+    print('Processed using', Parser.num_created, 'parsers')
+    log_conversation('transcript', transcript)
+
+    return respond_to_parse(make_speech, action, session)
+
+
+def respond_to_parse(make_speech: Callable[[GameResponse], str], action: Optional[Action], session: Optional[str] = None) -> str:
+    """
+    :param make_speech: creates the speech response from the game's response to the action.
+    :param action: the action parsed from what the player said, if one was parsed.
+    :param session: identifies the player, used to reuse the answers to the questions they asked.
+    :return: sends the action to the game server, then creates the speech response.
+    """
     response = 'Error'
 
     # If an action was parsed, send it to the server. The response is then dependent on whether the spy could
@@ -155,45 +309,182 @@ def process_transcript(transcript: str) -> str:
     if action:
         if isinstance(action, Conversation):
             log_conversation('conversation', action)
-            response = random.choice(action.responses())
+            with metrics.timed('speech'):
+                response = random.choice(action.responses())
 
         else:
-            log_conversation('action', action)
-
-            send_to_game = post_to_game if GAME_MODE else mock_post_to_game
-            # Actions are sent to different places depending on their type.
-            addr_postfix = 'questions' if isinstance(action, Question) else 'action'
-            log_conversation('sending to', addr_postfix)
-
             # Sending the action to the game may fail, e.g. if there is no response from the game.
             # In this case we will ask the user to speak the action again.
             try:
-                game_response = send_to_game(addr_postfix, action)
-                log_conversation('game response code', game_response.status_code)
-
-                if game_response.status_code == 200:
-                    # Only in some cases is JSON returned from the game.
-                    # If not, log this, and ask the user to repeat the command.
-                    try:
-                        game_json = game_response.json()
-                        log_conversation('game json', game_json)
+                game_json = perform(action, session)
+
+                if game_json is not None and not action_was_successful(game_json):
+                    # The strongest parse may not be what the player meant, so close alternative parses are tried
+                    # before telling the player the spy cannot do it.
+                    alternative = perform_alternative(session)
+                    if alternative is not None:
+                        make_speech, game_json = alternative
+                    else:
+                        show_alternatives(session)
+
+                if game_json is not None:
+                    with metrics.timed('speech'):
                         response = make_speech(game_json)
-                    except:
-                        log_conversation('game json', 'no JSON')
-                        response = make_speech({})
 
             except Exception as e:
+                metrics.increment('game_errors')
                 log_conversation('ERROR', e)
                 response = random_from_json('./failure_responses/transcription.json')
 
     # If no action was parsed, let the speech responder generate a response without using the game response.
     else:
-        response = make_speech({})
+        with metrics.timed('speech'):
+            response = make_speech({})
 
 
     return response
 
 
+def perform(action: Action, session: Optional[str]) -> Optional[GameResponse]:
+    """
+    :return: sends the action to the game, and returns the JSON response of the game, which is empty if the game did not
+             send JSON. None if the game responded with an error.
+    """
+    log_conversation('action', action)
+
+    # Actions are sent to different places depending on their type.
+    addr_postfix = 'questions' if isinstance(action, Question) else 'action'
+    log_conversation('sending to', addr_postfix)
+
+    game_response = send_action(addr_postfix, action, session)
+    log_conversation('game response code', game_response.status_code)
+
+    if game_response.status_code != 200:
+        metrics.increment('game_errors')
+        return None
+
+    # Only in some cases is JSON returned from the game.
+    try:
+        game_json = game_response.json()
+        log_conversation('game json', game_json)
+        return game_json
+    except:
+        log_conversation('game json', 'no JSON')
+        return {}
+
+
+def perform_alternative(session: Optional[str]) -> Optional[Tuple[Callable[[GameResponse], str], GameResponse]]:
+    """
+    :return: the speech response and the game's response of the strongest close alternative parse of the session's
+             last transcript which the game could perform, or None if the game could not perform any of them.
+    """
+    while True:
+        alternative = g_speech_responder.alternative(session, ALTERNATIVE_MARGIN)
+        if alternative is None:
+            return None
+
+        make_speech, action = alternative
+        if isinstance(action, Conversation):
+            continue
+
+        metrics.increment('alternative_actions')
+        game_json = perform(action, session)
+        if game_json is not None and action_was_successful(game_json):
+            return make_speech, game_json
+
+
+def show_alternatives(session: Optional[str]):
+    """
+    Sends the alternative actions of the session's last transcript to the player, so they can say the one they meant.
+    """
+    actions = g_speech_responder.alternative_actions(session)
+    if actions and session is not None:
+        socketio.emit('alternatives', [str(action) for action in actions], room=session)
+
+
+def send_action(addr_postfix: str, action: Action, session: Optional[str]) -> Response:
+    """
+    :return: the response of the game to the action. The responses to idempotent questions are reused from the
+             question cache until an action is sent for the session.
+    """
+    send_to_game = post_to_game if GAME_MODE else mock_post_to_game
+
+    if g_question_cache is None:
+        return send_to_game(addr_postfix, action)
+
+    if not isinstance(action, Question):
+        # The action may change the answers, e.g. by moving the spy, even if the game could not respond.
+        g_question_cache.invalidate(session)
+        return send_to_game(addr_postfix, action)
+
+    if not action.idempotent:
+        return send_to_game(addr_postfix, action)
+
+    game_response = g_question_cache.get(session, action)
+    if game_response is not None:
+        metrics.increment('question_cache_hits')
+        return game_response
+
+    metrics.increment('question_cache_misses')
+    game_response = send_to_game(addr_postfix, action)
+    if game_response.status_code == 200:
+        g_question_cache.put(session, action, game_response)
+
+    return game_response
+
+
+def process_request(session: str, request: Union[str, List[Hypothesis]]) -> str:
+    """
+    :param request: the transcript of what the player said, or the hypotheses of what they may have said.
+    :return: the speech response, as given by `process_transcript` or `process_hypotheses`.
+    """
+    if isinstance(request, str):
+        return process_transcript(request, session)
+    return process_hypotheses(request, session)
+
+
+# Only parses stopping, so it is quick enough to check every request before it waits to be responded to.
+g_stop_parser = stop()
+
+
+def is_stop(request: Union[str, List[Hypothesis]]) -> bool:
+    """
+    :return: whether the player told the spy to stop, in which case the request skips the requests waiting.
+    """
+    if not request:
+        return False
+
+    transcript = request if isinstance(request, str) else request[0][0]
+    result = g_stop_parser.parse(pre_process(transcript))
+    return result.is_success() and result.response == 1.0
+
+
+def make_session_queue(session: str) -> SessionQueue:
+    """
+    :return: the queue of the requests of the player, which are responded to one at a time.
+    """
+    # Sleeping in a green thread lets the requests which arrived while parsing join the queue.
+    return SessionQueue(functools.partial(process_request, session), MAX_PENDING_REQUESTS, SUPERSEDE_REQUESTS, is_stop,
+                        pause=socketio.sleep,
+                        prepare=lambda interim_transcript: g_speech_responder.prepare(interim_transcript, session),
+                        prepare_interval=INTERIM_INTERVAL)
+
+
+g_session_queues = SessionQueues(make_session_queue)
+
+
+def submit_request(request: Union[str, List[Hypothesis]]):
+    """
+    Responds to the request of the player of the current socket once their earlier requests are responded to, or
+    tells them to slow down if too many are waiting.
+    """
+    def reply(speech: str):
+        emit('speech', str(speech))
+
+    if not g_session_queues[request_context.sid].submit(request, reply):
+        emit('speech', random_from_json('./failure_responses/busy.json'))
+
+
 def process_not_recognised_speech() -> str:
     """
     Speaks a response indicating that it the player was not understood.
@@ -201,21 +492,151 @@ def process_not_recognised_speech() -> str:
     return random_from_json('./failure_responses/transcription.json')
 
 
-def preload(fill_cache: bool):
+def make_composite_executor(num_workers: int) -> Executor:
+    """
+    :return: a process pool used to parse the parts of composite actions. The workers are forked when the first job is
+             submitted, therefore this should be called after the WordNet dictionary is loaded and the cache filled so
+             the workers start with the same warm state as the server process.
+    """
+    executor = ProcessPoolExecutor(max_workers=num_workers)
+    # Force the workers to be forked now, rather than when the first composite action is parsed.
+    executor.submit(parse_single_action, ['stop']).result()
+    return executor
+
+
+# The stages of preloading, and their progress, reported by the /ready endpoint.
+g_startup = Startup(['wordnet', 'grammar', 'cache', 'workers'])
+
+
+def preload(fill_cache: bool, start_workers: bool = True):
     """
     Pre-loads any data so the user experience is better, i.e. there is less delay during.
-    :param fill_cache: if true, will run all parsing tests to fill the cache for the semantic distance function.
+    :param fill_cache: if true, will parse the transcripts in the warmup corpus to fill the lexical caches, unless they
+                       could be restored from a snapshot.
+    :param start_workers: whether to start the processes used to parse composite actions.
+    """
+    global g_speech_responder
+
+    # WordNet is not needed if word vectors are used to compare the meaning of words.
+    use_wordnet = not WORD_VECTORS
+    subset = None
+
+    with g_startup.stage('wordnet'):
+        subset = load_subset(WORDNET_SUBSET) if WORDNET_SUBSET and use_wordnet else None
+
+        if subset is not None:
+            print('Loading WordNet Subset...')
+            use_subset(subset)
+        elif use_wordnet:
+            # Preload the WordNet dictionary.
+            print('Loading WordNet...')
+            wn.ensure_loaded()
+
+    with g_startup.stage('grammar'):
+        if use_wordnet:
+            # The speech responder's grammar has been created, so all the words it compares meanings to are known.
+            print('Building Synset Index...')
+            build_synset_index()
+
+        if STATEMENT_CLASSIFIER and not os.path.exists(STATEMENT_CLASSIFIER) and os.path.exists(LOG_FILENAME):
+            examples = examples_from_log(LOG_FILENAME)
+            if examples:
+                print('Training Statement Classifier...')
+                train(examples).save(STATEMENT_CLASSIFIER)
+                g_speech_responder = make_speech_responder()
+
+    with g_startup.stage('cache'):
+        if SHARED_SIMILARITY_CACHE and PREFORK_WORKERS:
+            # Opened before the workers are forked, so they share it.
+            print('Opening Shared Similarity Cache...')
+            cache = SharedSimilarityCache(SHARED_SIMILARITY_CACHE, SHARED_SIMILARITY_CACHE_SIZE, snapshot_version())
+            use_shared_cache(cache)
+
+        restored = False
+        if CACHE_SNAPSHOT:
+            print('Restoring Cache...')
+            restored = load_snapshot(CACHE_SNAPSHOT)
+            print('Restored' if restored else 'No snapshot, or snapshot out of date')
+
+        if fill_cache and not restored:
+            print('Filling Cache (Parsing Warmup Corpus)...')
+            progress = functools.partial(g_startup.progress, 'cache')
+            exercised = warm_up(g_speech_responder.parser, read_corpus(WARMUP_CORPUS), progress)
+            print(coverage_report(exercised))
+
+            if CACHE_SNAPSHOT:
+                save_snapshot(CACHE_SNAPSHOT)
+
+        if WORDNET_SUBSET and use_wordnet and subset is None:
+            # The full WordNet has been loaded, so the subset can be extracted for next time.
+            print('Building WordNet Subset...')
+            build_subset(WORDNET_SUBSET, wordnet_subset_words())
+
+    if start_workers:
+        start_composite_workers()
+
+
+def start_composite_workers():
+    """
+    Starts the processes used to parse the parts of composite actions, if there are any.
+    """
+    global g_speech_responder
+
+    with g_startup.stage('workers'):
+        if COMPOSITE_WORKERS:
+            print('Starting Composite Workers...')
+            g_speech_responder = make_speech_responder(make_composite_executor(COMPOSITE_WORKERS))
+
+
+def preload_for_fork(fill_cache: bool):
+    """
+    Runs `preload` in the parent process of the worker processes, before they are forked, so the workers share the
+    loaded WordNet and warmed caches instead of each loading them. The workers should call `after_fork`, which also
+    starts their composite workers.
+    """
+    prefork.before_loading()
+    preload(fill_cache, start_workers=False)
+    prefork.before_fork()
+
+
+def after_fork():
+    """
+    Called in each worker process once it is forked from the process that preloaded.
+    """
+    prefork.after_fork()
+    # The processes are started by each worker, as a worker cannot use the processes of its parent.
+    start_composite_workers()
+
+
+def preload_in_background(fill_cache: bool):
     """
+    Runs `preload` in a separate thread once the server has started, so the server can report its progress at /ready
+    while it warms up. Snapshots of the caches are saved periodically after preloading.
+    """
+    def run():
+        # Preloading is CPU bound, so would stop the server from responding if it ran in a green thread.
+        tpool.execute(preload, fill_cache)
+        start_cache_snapshots()
+
+    socketio.start_background_task(run)
+
+
+def wordnet_subset_words() -> Set[Tuple[str, Optional[str]]]:
+    """
+    :return: the words to extract from WordNet into the subset. These are the grammar's seed words, and the input words
+             they have been compared to, e.g. while filling the cache.
+    """
+    input_words = {(w1, pos) for w1, w2, pos, similarity_measure in semantic_similarity.results}
+    return seed_words | input_words
 
-    # Preload the WordNet dictionary.
-    print('Loading WordNet...')
-    wn.ensure_loaded()
 
-    if fill_cache:
-        print('Filling Cache (Running Tests)...')
-        loader = TestLoader()
-        suite = loader.discover(start_dir='tests/parsing')
-        TextTestRunner(verbosity=1).run(suite)
+def start_cache_snapshots():
+    """
+    Starts a background task which periodically saves the lexical caches, so words seen since the server started are
+    also restored after a restart.
+    """
+    if CACHE_SNAPSHOT:
+        socketio.start_background_task(save_snapshots_periodically, CACHE_SNAPSHOT, CACHE_SNAPSHOT_INTERVAL, socketio.sleep)
 
 
 @app.route('/')
@@ -223,6 +644,19 @@ def index():
     return render_template('index.html')
 
 
+@app.route('/ready')
+def ready():
+    # The server only responds quickly once it is warm, so load balancers should wait for it to be ready.
+    report = g_startup.report()
+    return jsonify(report), 200 if report['ready'] else 503
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    # The latencies of each stage of responding, the outcomes of parsing, and the hit rates of the caches.
+    return Flask.response_class(metrics.exposition(), mimetype='text/plain; version=0.0.4')
+
+
 @socketio.on('connect')
 def handle_client_connect_event():
     print('Client connected')
@@ -231,14 +665,31 @@ def handle_client_connect_event():
 @socketio.on('disconnect')
 def handle_client_disconnected_event():
     print('Client disconnected')
+    if g_question_cache is not None:
+        g_question_cache.invalidate(request_context.sid)
+    g_session_queues.remove(request_context.sid)
+    g_speech_responder.forget(request_context.sid)
 
 
 @socketio.on('recognised')
 def handle_recognised_speech(transcript):
     # Create some response speech based on parsing and the response of the game server,
     # and give it to the client to speak.
-    speech = process_transcript(transcript)
-    emit('speech', str(speech))
+    submit_request(transcript)
+
+
+@socketio.on('interim')
+def handle_interim_speech(transcript):
+    # Parse what the player has said so far while they are still speaking, so most of the work is already done when
+    # the final transcript arrives. This waits for the player's final transcripts, and is throttled.
+    g_session_queues[request_context.sid].prepare(transcript)
+
+
+@socketio.on('recognised_alternatives')
+def handle_recognised_speech_alternatives(alternatives):
+    # The alternatives are the transcripts of what the player may have said, and the confidence of each.
+    hypotheses = [(alternative['transcript'], alternative['confidence']) for alternative in alternatives]
+    submit_request(hypotheses)
 
 
 @socketio.on('not_recognised')
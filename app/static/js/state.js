@@ -9,6 +9,14 @@ var gRecognition = null;
 // This is initialised once the document is loaded.
 var gSocket = null;
 
+// The maximum number of alternative transcripts of what the user said to send to the server.
+// The server parses all of them and uses the one which makes the most sense.
+var gMaxAlternatives = 5;
+
+// The actions the server parsed from the last command, other than the one the spy could not perform, which are shown
+// so the player can say the one they meant.
+var gAlternatives = [];
+
 // Whether to play the intro animation or not.
 // This can be useful when debugging.
 var gShouldPlayIntro = false;
@@ -201,6 +209,10 @@ class RecordWaitingState extends State {
         super.enterState();
 
         this.stateDiv.innerHTML = 'Press any to start recording...<br/>';
+        if (gAlternatives.length > 0) {
+            this.stateDiv.innerHTML += `Did you mean: ${gAlternatives.join(', or ')}?<br/>`;
+            gAlternatives = [];
+        }
         super.addListener('keydown', () => super.segue(RecordingState));
     }
 
@@ -258,18 +270,34 @@ class RecordingState extends State {
      * Callback for the recogniser parsing speech.
      */
     _onRecognitionResult(event) {
+        var result = event.results[0];
+
+        // Send what has been said so far while the user is still speaking, so the server can start parsing it.
+        if (!result.isFinal) {
+            gSocket.emit('interim', result[0].transcript);
+            return;
+        }
+
         this._recognisedSpeech = true;
 
-        var transcript = event.results[0][0].transcript;
+        // The recogniser gives alternative transcripts of the speech, most likely first.
+        var alternatives = Array.from(result).map(function(alternative) {
+            var transcript = alternative.transcript;
 
-        // Enter is not recognised for some reason.
-        if (transcript == '\n') {
-            transcript = 'enter'
-        }
+            // Enter is not recognised for some reason.
+            if (transcript == '\n') {
+                transcript = 'enter'
+            }
+
+            return {
+                transcript: transcript,
+                confidence: alternative.confidence
+            };
+        });
 
-        console.log(`Recognised: ${transcript}`);
+        console.log(`Recognised: ${alternatives.map((alternative) => alternative.transcript).join(' | ')}`);
 
-        var newState = new SendRecvSpeechState(transcript, this.stateDiv);
+        var newState = new SendRecvSpeechState(alternatives, this.stateDiv);
         super.segueToState(newState);
     }
 
@@ -305,11 +333,12 @@ class RecordingState extends State {
  */
 class SendRecvSpeechState extends State {
     /**
-     * @param {Optional[string]} recognisedSpeech - the recognised speech, or null if nothing was recognised.
+     * @param {Optional[Array]} recognisedAlternatives - the alternative transcripts of the recognised speech, each with
+     *                                                   a transcript and confidence, or null if nothing was recognised.
      */
-    constructor(recognisedSpeech, stateDiv) {
+    constructor(recognisedAlternatives, stateDiv) {
         super(stateDiv, 'SendRecvSpeech');
-        this.recognisedSpeech = recognisedSpeech;
+        this.recognisedAlternatives = recognisedAlternatives;
         this._listener = this._onSpeechResponseReceived.bind(this);
     }
 
@@ -319,8 +348,8 @@ class SendRecvSpeechState extends State {
         gSocket.on('speech', this._listener);
 
         // Start sending the recognised speech to the server.
-        if (this.recognisedSpeech) {
-            gSocket.emit('recognised', this.recognisedSpeech);
+        if (this.recognisedAlternatives) {
+            gSocket.emit('recognised_alternatives', this.recognisedAlternatives);
         }
         else {
             gSocket.emit('not_recognised', {});
@@ -360,6 +389,12 @@ function setupSocket(callback) {
         callback();
     });
 
+    // Used to show the player the other actions their command could have meant.
+    gSocket.on('alternatives', function(alternatives) {
+        console.log(`Alternatives: ${alternatives}`);
+        gAlternatives = alternatives;
+    });
+
     // Used to tell the player how many terminals are left to hack.
     gSocket.on('terminals_left', function(speech) {
         console.log(`Terminals left: ${speech}`);
@@ -378,6 +413,8 @@ function start() {
 
     // Setup global variables.
     gRecognition = new webkitSpeechRecognition();
+    gRecognition.maxAlternatives = gMaxAlternatives;
+    gRecognition.interimResults = true;
 
     var stateDiv = document.querySelector('#state');
 
@@ -1,10 +1,53 @@
+from typing import Tuple
+import functools
+
 
 class EquatableMixin:
     """
     Overrides equality defined using references to using the contents of the object.
     """
+    # Allows subclasses to use slots instead of a __dict__.
+    __slots__ = ()
 
     def __eq__(self, other):
         if isinstance(self, other.__class__):
             return self.__dict__ == other.__dict__
-        return False
\ No newline at end of file
+        return False
+
+
+class ValueMixin:
+    """
+    An immutable value, e.g. an action, which is equal to another value if their fields are equal, and is hashable, so
+    can be used as a cache key. The fields are declared in `__slots__`, and each can only be set once, in `__init__`.
+    """
+    __slots__ = ()
+
+    def fields(self) -> tuple:
+        """
+        :return: the values of the fields declared in the slots of the class and its bases.
+        """
+        return tuple(getattr(self, slot, None) for slot in _slots(type(self)))
+
+    def __eq__(self, other):
+        if isinstance(self, other.__class__):
+            return self.fields() == other.fields()
+        return False
+
+    def __hash__(self):
+        return hash(self.fields())
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError("can't set attribute '{}' of immutable {}".format(name, type(self).__name__))
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError("can't delete attribute '{}' of immutable {}".format(name, type(self).__name__))
+
+
+@functools.lru_cache(maxsize=None)
+def _slots(cls: type) -> Tuple[str, ...]:
+    """
+    :return: the slots declared by the class and its bases, base classes first.
+    """
+    return tuple(slot for c in reversed(cls.__mro__) for slot in c.__dict__.get('__slots__', ()))
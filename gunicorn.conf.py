@@ -0,0 +1,40 @@
+# Gunicorn settings, used by boot.sh. If PREFORK_WORKERS is set in app/__init__.py, the server is preloaded in the
+# master process, then that many workers are forked from it, sharing the loaded WordNet and warmed caches.
+#
+# Socket.IO requires each client to always be sent to the same worker, unless only the websocket transport is used.
+import ast
+import os
+
+
+def read_setting(name: str):
+    """
+    :return: the value assigned to the setting in app/__init__.py. The value is read without importing the app, since
+             importing it builds the grammar, which the master process only needs if the workers are forked from it.
+    """
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', '__init__.py')) as file:
+        module = ast.parse(file.read())
+
+    for node in module.body:
+        if isinstance(node, ast.Assign) and any(getattr(target, 'id', None) == name for target in node.targets):
+            return ast.literal_eval(node.value)
+
+    raise KeyError(name)
+
+
+PREFORK_WORKERS = read_setting('PREFORK_WORKERS')
+
+worker_class = 'eventlet'
+workers = PREFORK_WORKERS or 1
+preload_app = PREFORK_WORKERS > 0
+timeout = 36000
+
+if preload_app:
+    # The workers use eventlet, which must patch the standard library before the server is imported by the master.
+    import eventlet
+    eventlet.monkey_patch()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        from app import after_fork
+        after_fork()
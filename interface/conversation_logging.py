@@ -1,6 +1,10 @@
 from typing import Any
 
 
+# The file the conversation is appended to.
+LOG_FILENAME = 'conversation_log.txt'
+
+
 def log_conversation(event: str, status: Any, print_nl_before = False):
     """
     Appends the text to the conversation log in the format 'event: status'. Useful for recovering what was said to
@@ -9,5 +13,5 @@ def log_conversation(event: str, status: Any, print_nl_before = False):
     pre = '\n' if print_nl_before else ''
     text = '{}{}: {}'.format(pre, event, status)
     print(text)
-    with open('conversation_log.txt', 'a') as log_file:
+    with open(LOG_FILENAME, 'a') as log_file:
         log_file.write(text + '\n')
@@ -0,0 +1,101 @@
+from parsing.grammar_profile import PROFILES
+from contextlib import contextmanager
+from threading import Lock
+from typing import Callable, List, Tuple
+
+
+# For each profile after the full profile, the number of transcripts being parsed or waiting to be, and the recent parse
+# latency in seconds, above either of which the profile is used.
+DEFAULT_THRESHOLDS = [(4, 0.5), (8, 1.0)]
+
+
+class LoadController:
+    """
+    Chooses the grammar profile to parse with from the load on the server. When the server is saturated, transcripts
+    are parsed with cheaper profiles, which only match exactly spelled words, so players still get a quick response.
+    The full profile is used again once the load drops.
+    """
+
+    def __init__(self,
+                 thresholds: List[Tuple[int, float]] = DEFAULT_THRESHOLDS,
+                 profiles: List[str] = PROFILES,
+                 recovery: float = 0.5,
+                 smoothing: float = 0.2,
+                 backlog: Callable[[], int] = lambda: 0):
+        """
+        :param thresholds: for each profile after the first, the queue depth and recent latency above either of which
+                           the profile is used.
+        :param profiles: the profiles to choose from, from the most understanding to the cheapest.
+        :param recovery: the fraction of the thresholds of a profile the load must drop below for the previous profile
+                         to be used again. This stops the profile changing back and forth when the load is close to a
+                         threshold, since cheaper profiles lower the latency.
+        :param smoothing: the weight of the latest parse in the recent latency, which is an exponential moving average.
+        :param backlog: the number of transcripts waiting to be responded to, e.g. in the players' session queues.
+                        Under eventlet, transcripts are parsed one at a time, so the transcripts being parsed alone do
+                        not show how saturated the server is.
+        """
+        self.thresholds = thresholds
+        self.profiles = profiles
+        self.recovery = recovery
+        self.smoothing = smoothing
+        self.backlog = backlog
+
+        # The number of transcripts which are being responded to.
+        self.queue_depth = 0
+        # The recent time taken to parse a transcript, in seconds.
+        self.latency = 0.0
+        # The index of the profile in use.
+        self.level = 0
+
+        # The latency and queue depth are changed by the threads parsing, e.g. in the thread pool.
+        self._lock = Lock()
+
+    @contextmanager
+    def request(self):
+        """
+        A context manager around responding to a transcript, which counts it in the queue depth.
+        """
+        with self._lock:
+            self.queue_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.queue_depth -= 1
+
+    def observe(self, seconds: float):
+        """
+        Records that a transcript took the number of seconds to parse.
+        """
+        with self._lock:
+            self.latency += self.smoothing * (seconds - self.latency)
+
+    def profile(self) -> str:
+        """
+        :return: the profile to parse the next transcript with.
+        """
+        backlog = self.backlog()
+
+        with self._lock:
+            depth = self.queue_depth + backlog
+            while self.level < len(self.thresholds) and self._exceeds(self.thresholds[self.level], depth, 1.0):
+                self.level += 1
+
+            while self.level > 0 and not self._exceeds(self.thresholds[self.level - 1], depth, self.recovery):
+                self.level -= 1
+
+            return self.profiles[self.level]
+
+    def degraded(self) -> bool:
+        """
+        :return: whether a profile other than the full profile is in use.
+        """
+        return self.level > 0
+
+    def _exceeds(self, threshold: Tuple[int, float], depth: int, fraction: float) -> bool:
+        """
+        :param depth: the number of transcripts being responded to, or waiting to be.
+        :return: whether the depth or latency is above the fraction of the threshold.
+        """
+        max_queue_depth, max_latency = threshold
+        return depth > max_queue_depth * fraction or self.latency > max_latency * fraction
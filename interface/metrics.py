@@ -0,0 +1,163 @@
+from parsing.lexical_cache import lexical_caches
+from contextlib import contextmanager
+from typing import Dict, List
+import bisect
+import time
+
+try:
+    # When the server runs with eventlet, threading is patched so each green thread appears as a thread. Metrics are
+    # kept for each OS thread instead, since there is a green thread for every request.
+    from eventlet.patcher import original
+    threading = original('threading')
+except ImportError:
+    import threading
+
+
+# The upper bounds, in seconds, of the buckets of the latency histograms.
+LATENCY_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+# The prefix of the names of all the metrics exposed.
+PREFIX = 'command_parsing_'
+
+
+class ThreadMetrics:
+    """
+    The metrics recorded by a single OS thread. The lock is only held while recording or merging them, so it is only
+    contended while the metrics are collected.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # The number of observations in each bucket of each stage's histogram. The last bucket has no upper bound.
+        self.histograms: Dict[str, List[int]] = {}
+        # The total number of seconds observed for each stage.
+        self.sums: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    def merge(self, other: 'ThreadMetrics'):
+        """
+        Adds the metrics of the other thread to these.
+        """
+        for stage, counts in other.histograms.items():
+            totals = self.histograms.setdefault(stage, [0] * len(counts))
+            for i, count in enumerate(counts):
+                totals[i] += count
+
+        for stage, seconds in other.sums.items():
+            self.sums[stage] = self.sums.get(stage, 0.0) + seconds
+
+        for counter, count in other.counters.items():
+            self.counters[counter] = self.counters.get(counter, 0) + count
+
+
+class Metrics:
+    """
+    Records how long each stage of responding to the player takes, and counts events such as the outcome of parsing.
+    Each OS thread records into its own metrics, which are only combined when they are collected, so recording is cheap
+    enough to always be on.
+    """
+
+    def __init__(self, buckets: List[float] = LATENCY_BUCKETS):
+        """
+        :param buckets: the upper bounds, in seconds, of the buckets of the histograms.
+        """
+        self.buckets = buckets
+        # Only held when a thread records for the first time, and when collecting.
+        self._lock = threading.Lock()
+        # The metrics of each OS thread, by its identifier. A thread started after another finished may have the same
+        # identifier, and records into the same metrics, so the metrics of finished threads are kept without growing.
+        self._threads: Dict[int, ThreadMetrics] = {}
+
+    def observe(self, stage: str, seconds: float):
+        """
+        Records that the stage took the number of seconds.
+        """
+        metrics = self._own()
+        with metrics.lock:
+            counts = metrics.histograms.get(stage)
+            if counts is None:
+                counts = metrics.histograms[stage] = [0] * (len(self.buckets) + 1)
+
+            counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            metrics.sums[stage] = metrics.sums.get(stage, 0.0) + seconds
+
+    def increment(self, counter: str, amount: int = 1):
+        metrics = self._own()
+        with metrics.lock:
+            metrics.counters[counter] = metrics.counters.get(counter, 0) + amount
+
+    @contextmanager
+    def timed(self, stage: str):
+        """
+        A context manager which records how long its body takes as the stage.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def collect(self) -> ThreadMetrics:
+        """
+        :return: the metrics recorded by all threads.
+        """
+        with self._lock:
+            threads = list(self._threads.values())
+
+        total = ThreadMetrics()
+        for metrics in threads:
+            # The thread may be recording new stages or counters, which would change the dictionaries being merged.
+            with metrics.lock:
+                total.merge(metrics)
+
+        return total
+
+    def exposition(self) -> str:
+        """
+        :return: the metrics, and the hit rates of the lexical caches, in the Prometheus text format.
+        """
+        total = self.collect()
+        lines = []
+
+        lines.append('# TYPE {}stage_seconds histogram'.format(PREFIX))
+        for stage in sorted(total.histograms):
+            cumulative = 0
+            for bound, count in zip(self.buckets + [float('inf')], total.histograms[stage]):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append('{}stage_seconds_bucket{{stage="{}",le="{}"}} {}'.format(PREFIX, stage, le, cumulative))
+            lines.append('{}stage_seconds_sum{{stage="{}"}} {}'.format(PREFIX, stage, total.sums[stage]))
+            lines.append('{}stage_seconds_count{{stage="{}"}} {}'.format(PREFIX, stage, cumulative))
+
+        for counter in sorted(total.counters):
+            lines.append('# TYPE {}{}_total counter'.format(PREFIX, counter))
+            lines.append('{}{}_total {}'.format(PREFIX, counter, total.counters[counter]))
+
+        for kind in ['hits', 'misses']:
+            lines.append('# TYPE {}cache_{}_total counter'.format(PREFIX, kind))
+            for name in sorted(lexical_caches):
+                count = getattr(lexical_caches[name], kind)
+                lines.append('{}cache_{}_total{{cache="{}"}} {}'.format(PREFIX, kind, name, count))
+
+        lines.append('# TYPE {}cache_hit_rate gauge'.format(PREFIX))
+        for name in sorted(lexical_caches):
+            cache = lexical_caches[name]
+            calls = cache.hits + cache.misses
+            lines.append('{}cache_hit_rate{{cache="{}"}} {}'.format(PREFIX, name, cache.hits / calls if calls else 0.0))
+
+        return '\n'.join(lines) + '\n'
+
+    def _own(self) -> ThreadMetrics:
+        """
+        :return: the metrics of the current OS thread.
+        """
+        ident = threading.get_ident()
+        metrics = self._threads.get(ident)
+        if metrics is None:
+            with self._lock:
+                metrics = self._threads.setdefault(ident, ThreadMetrics())
+        return metrics
+
+
+# The metrics of the server.
+metrics = Metrics()
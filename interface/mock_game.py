@@ -0,0 +1,19 @@
+from actions.action import ActionErrorCode, GameResponse
+from random import randrange
+
+
+def mock_game_response(success: bool = True) -> GameResponse:
+    """
+    :param success: whether the action could be performed in the game.
+    :return: a response in the format the game sends, used when the game is not running.
+    """
+    return {
+        'type': 'success' if success else 'failure',  # Indicates whether the action could be performed in the game.
+        'inventory_item': 'rock',  # For if the user asks what the spy is carrying.
+        'location': 'the computer lab',  # For if the user asks where the spy is.
+        'num_guards': randrange(0, 10),  # For if the user asks about guards
+        'surroundings': ['server', 'camera', 'camera'],  # For if the user asks about the spy's surroundings
+        'mins_remaining': randrange(1, 5),
+        'error_code': ActionErrorCode.CANNOT_SEE,
+        'subject': 'rock'
+    }
@@ -0,0 +1,29 @@
+import gc
+
+
+def before_loading():
+    """
+    Called in the parent process before loading the data shared with the forked workers. Objects are not collected
+    while loading, so collections do not leave free gaps in the pages holding the loaded data, which would be filled
+    and copied by the workers.
+    """
+    gc.disable()
+
+
+def before_fork():
+    """
+    Called in the parent process after loading, just before the workers are forked. Moves all objects to a permanent
+    generation the garbage collector ignores, so collections in the workers do not write to the objects (and copy the
+    pages holding them). Collection is then enabled again, since the parent keeps running to manage the workers.
+    """
+    # Only available from Python 3.7.
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
+    gc.enable()
+
+
+def after_fork():
+    """
+    Called in each worker once it is forked. Objects created by the worker are collected as normal.
+    """
+    gc.enable()
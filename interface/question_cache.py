@@ -0,0 +1,48 @@
+from actions.question import Question
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import time
+
+
+class QuestionCache:
+    """
+    Remembers the game's responses to the questions asked by each player (session), so a player asking the same
+    question again does not need to wait for the game server. Only idempotent questions are cached, and a session's
+    responses are forgotten when an action is sent for it, since the action may change the answers, e.g. by moving the
+    spy. Responses also expire after a short time in case the game changes by itself.
+    """
+
+    def __init__(self, ttl: float = 2.0, clock: Callable[[], float] = time.monotonic):
+        """
+        :param ttl: the number of seconds a response is reused for.
+        :param clock: gives the current time in seconds.
+        """
+        self.ttl = ttl
+        self.clock = clock
+        # The responses, and the times they expire, to the questions asked in each session.
+        self._sessions: Dict[Hashable, Dict[Question, Tuple[float, Any]]] = {}
+
+    def get(self, session: Hashable, question: Question) -> Optional[Any]:
+        """
+        :return: the response of the game to the question asked in the session, or None if it has not been asked since
+                 the last action, or the response expired.
+        """
+        entry = self._sessions.get(session, {}).get(question)
+        if entry is None:
+            return None
+
+        expires, response = entry
+        if self.clock() >= expires:
+            del self._sessions[session][question]
+            return None
+
+        return response
+
+    def put(self, session: Hashable, question: Question, response: Any):
+        if question.idempotent:
+            self._sessions.setdefault(session, {})[question] = (self.clock() + self.ttl, response)
+
+    def invalidate(self, session: Hashable):
+        """
+        Forgets the responses of the session, e.g. because an action was sent for it or the player disconnected.
+        """
+        self._sessions.pop(session, None)
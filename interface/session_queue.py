@@ -0,0 +1,168 @@
+from interface.metrics import metrics
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Tuple
+import time
+
+
+# Sends the speech response of a request to the player.
+Reply = Callable[[Any], None]
+
+
+class SessionQueue:
+    """
+    The requests of one player (session) waiting to be responded to, which are responded to one at a time, in the order
+    they arrived. If the player speaks several commands quickly, older commands which have not been started can be
+    dropped, since the newest is what the player wants the spy to do now. The number of requests waiting is bounded,
+    so the time to reply to a player who floods the server is also bounded.
+
+    Work which can be done ahead of a request, e.g. parsing an interim transcript while the player is still speaking, is
+    only done while no requests are waiting. Only the newest is kept, and it is started at most once an interval.
+    """
+
+    def __init__(self,
+                 process: Callable[[Any], Any],
+                 max_pending: int = 4,
+                 supersede: bool = True,
+                 is_urgent: Callable[[Any], bool] = lambda request: False,
+                 pause: Callable[[float], None] = time.sleep,
+                 prepare: Callable[[Any], None] = lambda request: None,
+                 prepare_interval: float = 0.0):
+        """
+        :param process: responds to a request, e.g. parses a transcript and sends the action to the game, returning the
+                        speech response.
+        :param max_pending: the maximum number of requests waiting. Once reached, new requests are rejected.
+        :param supersede: whether a new request replaces the requests waiting, rather than being responded to after.
+        :param is_urgent: whether a request should be responded to before the requests waiting, which are dropped, e.g.
+                          telling the spy to stop.
+        :param pause: called with a number of seconds, which may be 0, before responding to each request, to let new
+                      requests arrive. E.g. this sleeps in a green thread, so the requests received while responding to
+                      the last one can supersede each other.
+        :param prepare: does the work ahead of a request, e.g. parses an interim transcript.
+        :param prepare_interval: the minimum number of seconds between starting to prepare.
+        """
+        self.process = process
+        self.max_pending = max_pending
+        self.supersede = supersede
+        self.is_urgent = is_urgent
+        self.pause = pause
+        self.prepare_work = prepare
+        self.prepare_interval = prepare_interval
+
+        # The requests waiting, how to reply to them, and when they arrived.
+        self._pending: Deque[Tuple[Any, Reply, float]] = deque()
+        # The newest work waiting to be prepared, and when the last work was started.
+        self._preparing: Optional[Any] = None
+        self._last_prepared = float('-inf')
+        self._draining = False
+
+    def submit(self, request: Any, reply: Reply) -> bool:
+        """
+        Responds to the request, along with any other requests waiting, unless they are already being responded to.
+        :param reply: called with the response to the request, unless the request is dropped.
+        :return: False if the request was rejected because too many requests are waiting, in which case the player
+                 should be told to slow down.
+        """
+        entry = (request, reply, time.perf_counter())
+        # The request makes the work being prepared for it moot.
+        self._preparing = None
+
+        if self.is_urgent(request):
+            metrics.increment('urgent_requests')
+            self._drop_pending()
+            self._pending.append(entry)
+
+        elif self.supersede:
+            self._drop_pending()
+            self._pending.append(entry)
+
+        elif len(self._pending) >= self.max_pending:
+            metrics.increment('rejected_requests')
+            return False
+
+        else:
+            self._pending.append(entry)
+
+        if not self._draining:
+            self._drain()
+
+        return True
+
+    def prepare(self, request: Any):
+        """
+        Prepares the request once no requests are waiting, unless newer work is given first.
+        """
+        if self._preparing is not None:
+            metrics.increment('superseded_preparations')
+        self._preparing = request
+
+        if not self._draining:
+            self._drain()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _drop_pending(self):
+        metrics.increment('superseded_requests', len(self._pending))
+        self._pending.clear()
+
+    def _drain(self):
+        """
+        Responds to the requests waiting, and prepares the work waiting, until there are none left. New requests may
+        arrive while responding.
+        """
+        self._draining = True
+        try:
+            while True:
+                self.pause(0)
+
+                if self._pending:
+                    request, reply, arrived = self._pending.popleft()
+                    metrics.observe('queue', time.perf_counter() - arrived)
+                    reply(self.process(request))
+
+                elif self._preparing is not None:
+                    wait = self._last_prepared + self.prepare_interval - time.perf_counter()
+                    if wait > 0:
+                        # Newer work or requests may arrive while waiting.
+                        self.pause(wait)
+                        continue
+
+                    request, self._preparing = self._preparing, None
+                    self._last_prepared = time.perf_counter()
+                    self.prepare_work(request)
+
+                else:
+                    break
+        finally:
+            self._draining = False
+
+
+class SessionQueues:
+    """
+    The queue of requests of each session.
+    """
+
+    def __init__(self, make_queue: Callable[[Hashable], SessionQueue]):
+        """
+        :param make_queue: creates the queue of a session the first time it makes a request.
+        """
+        self.make_queue = make_queue
+        self._queues: Dict[Hashable, SessionQueue] = {}
+
+    def __getitem__(self, session: Hashable) -> SessionQueue:
+        queue = self._queues.get(session)
+        if queue is None:
+            queue = self._queues[session] = self.make_queue(session)
+        return queue
+
+    def pending(self) -> int:
+        """
+        :return: the number of requests of all the sessions waiting to be responded to.
+        """
+        return sum(len(queue) for queue in list(self._queues.values()))
+
+    def remove(self, session: Hashable):
+        """
+        Forgets the queue of the session, e.g. because the player disconnected.
+        """
+        self._queues.pop(session, None)
@@ -1,8 +1,35 @@
-from parsing.parser import Parser, strongest
+from parsing.parser import Parser, strongest, mix
 from parsing.pre_processing import pre_process
-from parsing.parse_result import SuccessParse, PartialParse, FailureParse
+from parsing.vocabulary import vocabulary
+from parsing.annotation import Annotation, annotated
+from parsing.parse_result import SuccessParse, PartialParse, FailureParse, ParseResult, Response
 from actions.action import Action, GameResponse, PostProcessed
-from typing import Optional, Callable, Any
+from interface.metrics import metrics
+from interface.load_controller import LoadController
+from contextlib import contextmanager
+from typing import Optional, Callable, Any, List, Tuple, Dict, Hashable
+import time
+
+
+# A transcript of the user's speech, and the confidence (0-1) of the speech recognition in the transcript.
+Hypothesis = Tuple[str, float]
+
+
+class Prepared:
+    """
+    The work done on the interim transcripts of one player (session) while they are speaking.
+    """
+
+    def __init__(self):
+        # The results of parsing the interim transcripts, keyed by the words of the transcript. These are used if the
+        # final transcript is the same as an interim transcript.
+        self.results: Dict[Tuple[str, ...], ParseResult] = {}
+        # The partial parser of the responder when the results were parsed. The results cannot be used once it changes.
+        self.partial: Optional[Parser] = None
+        # The responses of the primitives to the words said so far. Each interim transcript only adds the new words, and
+        # the final transcript is parsed with it, so the words of the stable prefix are only tagged, spelled and
+        # compared once.
+        self.annotation: Optional[Annotation] = None
 
 
 class SpeechResponder:
@@ -15,10 +42,23 @@ class SpeechResponder:
     # Is a parser if the last transcript gave a partial parse. The parser will be tried on the next parse.
     _partial: Optional[Parser]
 
+    # The strongest parse of each session's last transcript, and its alternative successful parses that have not been
+    # used yet, strongest first.
+    _alternatives: Dict[Hashable, Tuple[SuccessParse, List[SuccessParse]]]
+
+    # The work done on the interim transcripts of each session since its last response.
+    _prepared: Dict[Hashable, Prepared]
+
+    # The maximum number of interim results to keep for each session.
+    max_prepared = 16
+
     def __init__(self, parser: Parser,
                  parsed_response: Callable[[GameResponse, Action], str],
                  partial_response: Callable[[Any], str],
-                 no_parsed_response: Callable[[str], str]):
+                 no_parsed_response: Callable[[str], str],
+                 confidence_weight: float = 0.3,
+                 profiles: Optional[Dict[str, Parser]] = None,
+                 load_controller: Optional[LoadController] = None):
         """
         :param parser: the parser to be used when parsing the transcript.
         :param parsed_response: function used to create a response when an action was parsed from the transcript. Also
@@ -26,41 +66,246 @@ class SpeechResponder:
         :param partial_response: function used to create a response when a partial was parsed from the transcript.
                                  The marker given to the function is the marker supplied to the partial parser that failed.
         :param no_parsed_response: function used to create a response when nothing could be parsed from the transcript.
+        :param confidence_weight: the proportion of the speech recognition confidence mixed with the parse response when
+                                  choosing between multiple hypotheses of what the user said.
+        :param profiles: the parsers of the same grammar created with cheaper grammar profiles, keyed by profile, see
+                         `grammar_profile`. These are used instead of `parser` when the load controller chooses them.
+        :param load_controller: chooses the profile to parse with from the load on the server. If None, `parser` is
+                                always used.
         """
         self.parser = parser
         self.parsed_response = parsed_response
         self.partial_response = partial_response
         self.no_parsed_response = no_parsed_response
+        self.confidence_weight = confidence_weight
+        self.profiles = profiles or {}
+        self.load_controller = load_controller
         self._partial = None
+        self._alternatives = {}
+        self._prepared = {}
 
-    def parse(self, transcript: str) -> (Callable[[GameResponse], str], Optional[Action]):
+    def parse(self, transcript: str, session: Hashable = None) -> (Callable[[GameResponse], str], Optional[Action]):
         """
         :param transcript: the transcript of the user's speech.
+        :param session: identifies the player, whose interim transcripts may have been prepared.
         :return: a speech response to be sent to the client to speak. An action for the spy to perform may optionally
                  be returned if one was parsed from the transcript.
         """
+        with self._request():
+            with metrics.timed('pre_process'):
+                words = pre_process(transcript)
+
+            result = self._parse_words(self._current_parser(), words, session)
+            return self._respond(result, transcript, session)
+
+    def prepare(self, interim_transcript: str, session: Hashable = None):
+        """
+        Parses an interim transcript while the user is still speaking, without changing the state of the responder.
+        Only the words not in the session's earlier interim transcripts are annotated (tagged, spelled, compared), and
+        the parts of composite actions which are complete are only parsed once. If the final transcript is the same,
+        its result is reused.
+        :param interim_transcript: the speech recogniser's current guess at what the user has said so far.
+        :param session: identifies the player who is speaking.
+        """
+        if self.load_controller and self.load_controller.degraded():
+            # Under load, only final transcripts are parsed.
+            return
+
+        words = pre_process(interim_transcript)
+        key = vocabulary.key(words)
+        prepared = self._prepared.setdefault(session, Prepared())
+
+        if prepared.partial is not self._partial:
+            prepared.results.clear()
+            prepared.partial = self._partial
 
-        # Create a parser containing the partial parser if there was a partial result last time.
-        parser = strongest([self._partial, self.parser]) if self._partial else self.parser
+        if key in prepared.results:
+            return
 
-        words = pre_process(transcript)
-        result = parser.parse(words)
+        if len(prepared.results) >= self.max_prepared:
+            # Discard the oldest interim result.
+            del prepared.results[next(iter(prepared.results))]
+
+        with annotated(words, prepared.annotation) as annotation:
+            prepared.annotation = annotation
+            prepared.results[key] = self._current_parser(count=False).parse(words)
+
+    def forget(self, session: Hashable):
+        """
+        Discards the interim work and alternative parses of the session, e.g. because the player disconnected.
+        """
+        self._prepared.pop(session, None)
+        self._alternatives.pop(session, None)
+
+    def parse_hypotheses(self, hypotheses: List[Hypothesis],
+                         session: Hashable = None) -> (Callable[[GameResponse], str], Optional[Action], str):
+        """
+        :param hypotheses: the transcripts of what the speech recogniser thinks the user said, with their confidences,
+                           most likely first.
+        :param session: identifies the player, whose interim transcripts may have been prepared.
+        :return: the speech response and optional action, as given by `parse`, of the hypothesis with the best
+                 parse, and the transcript of that hypothesis. Successful parses are preferred to partial parses, which
+                 are preferred to failures. Otherwise, the parse responses are mixed with the confidences. If two
+                 hypotheses are worth the same, the first is used. If there are no hypotheses, the response is that
+                 nothing was understood.
+        """
+        if not hypotheses:
+            make_speech, action = self._respond(FailureParse(), '', session)
+            return make_speech, action, ''
+
+        with self._request():
+            parser = self._current_parser()
+
+            # Hypotheses which only differ in case are only parsed once. The words that the other hypotheses share are
+            # only tagged, spelled, compared, etc once since those are cached.
+            scored: List[Tuple[Tuple[int, Response], ParseResult, str]] = []
+            parsed_words: List[List[str]] = []
+
+            for transcript, confidence in hypotheses:
+                with metrics.timed('pre_process'):
+                    words = pre_process(transcript)
+                if words in parsed_words:
+                    continue
+
+                parsed_words.append(words)
+                result = self._parse_words(parser, words, session)
+                scored.append((self._score(result, confidence), result, transcript))
+
+            _, result, transcript = max(scored, key=lambda s: s[0])
+            make_speech, action = self._respond(result, transcript, session)
+            return make_speech, action, transcript
+
+    @contextmanager
+    def _request(self):
+        """
+        A context manager around responding to a transcript, which is counted in the load of the server.
+        """
+        if self.load_controller is None:
+            yield
+            return
+
+        with self.load_controller.request():
+            yield
+
+    def _current_parser(self, count: bool = True) -> Parser:
+        """
+        :param count: whether to count the profile of the parser in the metrics, i.e. whether a request is served.
+        :return: the parser to parse the next transcript with, which uses the profile chosen by the load controller.
+                 This contains the partial parser if there was a partial result last time.
+        """
+        parser = self.parser
+        if self.load_controller:
+            profile = self.load_controller.profile()
+            parser = self.profiles.get(profile, self.parser)
+            if count:
+                metrics.increment('{}_profile_parses'.format(profile))
+
+        return strongest([self._partial, parser]) if self._partial else parser
+
+    def _parse_words(self, parser: Parser, words: List[str], session: Hashable) -> ParseResult:
+        """
+        :return: the result of parsing the words, reusing the result of an interim transcript of the session with the
+                 same words. The words are annotated before parsing, so the primitive parsers only compute their
+                 responses once, and the annotation of the session's interim transcripts is reused.
+        """
+        prepared = self._prepared.get(session)
+        result = prepared.results.get(vocabulary.key(words)) if prepared and prepared.partial is self._partial else None
+        if result is not None:
+            metrics.increment('prepared_hits')
+            return result
+
+        metrics.increment('prepared_misses')
+        start = time.perf_counter()
+        with metrics.timed('parse'), annotated(words, prepared.annotation if prepared else None):
+            result = parser.parse(words)
+
+        if self.load_controller:
+            self.load_controller.observe(time.perf_counter() - start)
+
+        return result
+
+    def _score(self, result: ParseResult, confidence: float) -> Tuple[int, Response]:
+        """
+        :return: used to compare the results of parsing different hypotheses. Successes are ranked highest, then
+                 partials, then failures. Results of the same type are compared using their response mixed with the
+                 confidence of the speech recogniser.
+        """
+        rank = result.either(lambda _: 2, lambda _: 1, lambda _: 0)
+        response = result.either(lambda s: s.response, lambda p: p.response, lambda f: 0.0)
+        return rank, mix(response, confidence, self.confidence_weight)
+
+    def _respond(self, result: ParseResult, transcript: str,
+                 session: Hashable) -> (Callable[[GameResponse], str], Optional[Action]):
+        """
+        :return: the speech response and optional action for the result of parsing the transcript. Also updates the
+                 state used to parse the next transcript.
+        """
+        # The player has finished speaking, so their next interim transcripts start a new utterance.
+        self._prepared.pop(session, None)
 
         if isinstance(result, SuccessParse):
+            metrics.increment('success_parses')
             self._partial = None
-            if isinstance(result.parsed, PostProcessed):
-                action = result.parsed.post_processed()
+            if result.alternatives:
+                self._alternatives[session] = (result, list(result.alternatives))
             else:
-                action = result.parsed
-            return (lambda game_response: self.parsed_response(game_response, action), action)
+                self._alternatives.pop(session, None)
+            return self._success_response(result)
 
-        elif isinstance(result, PartialParse):
+        self._alternatives.pop(session, None)
+
+        if isinstance(result, PartialParse):
+            metrics.increment('partial_parses')
             self._partial = result.failed_parser
             # We assume the marker is the class that failed to parse.
             return (lambda game_response: self.partial_response(result.marker), None)
 
         elif isinstance(result, FailureParse):
+            metrics.increment('failure_parses')
             self._partial = None
             return (lambda game_response: self.no_parsed_response(transcript), None)
 
         raise RuntimeError('unexpected ParseResult type')
+
+    def alternative(self, session: Hashable = None,
+                    margin: Optional[Response] = None) -> Optional[Tuple[Callable[[GameResponse], str], Action]]:
+        """
+        :param session: identifies the player whose last transcript the alternative is of.
+        :param margin: if given, only alternatives whose action has the same type as the strongest parse's, and whose
+                       response is at most this much below it, are returned, e.g. picking up another object. The others
+                       are often different actions the player did not say, so are left for `alternative_actions`.
+        :return: the speech response and action of the next strongest alternative parse of the last transcript, e.g.
+                 to use if the game could not perform the parsed action. None if there are no alternatives left. The
+                 parser is only run once for each transcript, so alternatives are only available if the parser was
+                 created with a beam width, see `strongest`.
+        """
+        best, alternatives = self._alternatives.get(session, (None, []))
+
+        for i, result in enumerate(alternatives):
+            if margin is None or self._is_close(result, best, margin):
+                del alternatives[i]
+                return self._success_response(result)
+
+        return None
+
+    def alternative_actions(self, session: Hashable = None) -> List[Action]:
+        """
+        :return: the actions of the alternative parses of the session's last transcript that have not been used yet,
+                 strongest first, e.g. to ask the player which they meant.
+        """
+        _, alternatives = self._alternatives.get(session, (None, []))
+        return [self._success_response(result)[1] for result in alternatives]
+
+    def _is_close(self, result: SuccessParse, best: SuccessParse, margin: Response) -> bool:
+        return type(self._success_response(result)[1]) is type(self._success_response(best)[1]) \
+            and result.response >= best.response - margin
+
+    def _success_response(self, result: SuccessParse) -> Tuple[Callable[[GameResponse], str], Action]:
+        """
+        :return: the speech response and the action for a successful parse.
+        """
+        if isinstance(result.parsed, PostProcessed):
+            action = result.parsed.post_processed()
+        else:
+            action = result.parsed
+        return (lambda game_response: self.parsed_response(game_response, action), action)
@@ -0,0 +1,59 @@
+from contextlib import contextmanager
+from typing import Any, Dict, List
+import time
+
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class Startup:
+    """
+    Tracks the stages the server goes through before it is ready to respond quickly, e.g. loading WordNet and warming
+    the caches, so readiness can be reported while the stages run in the background.
+    """
+
+    def __init__(self, stages: List[str]):
+        """
+        :param stages: the names of the stages, in the order they run.
+        """
+        self.stages: Dict[str, Dict[str, Any]] = {name: {'status': PENDING} for name in stages}
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        A context manager which marks the stage as running during its body, and done afterwards, or failed if the body
+        raises an exception.
+        """
+        info = self.stages[name]
+        info['status'] = RUNNING
+        start = time.time()
+
+        try:
+            yield
+        except Exception as e:
+            info['status'] = FAILED
+            info['error'] = repr(e)
+            raise
+        else:
+            info['status'] = DONE
+        finally:
+            info['seconds'] = round(time.time() - start, 3)
+
+    def progress(self, name: str, fraction: float):
+        """
+        Records how much of a running stage is complete, between 0 and 1.
+        """
+        self.stages[name]['progress'] = round(fraction, 3)
+
+    @property
+    def ready(self) -> bool:
+        return all(info['status'] == DONE for info in self.stages.values())
+
+    def report(self) -> Dict[str, Any]:
+        """
+        :return: whether the server is ready, and the status of each stage.
+        """
+        return {'ready': self.ready, 'stages': {name: dict(info) for name, info in self.stages.items()}}
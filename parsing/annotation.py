@@ -0,0 +1,98 @@
+from parsing.parse_result import Word, Response
+from parsing.vectorized import Vectorized, as_vectorized
+from typing import Callable, Dict, Hashable, List, Optional, Union
+from contextlib import contextmanager
+from threading import Lock, local
+
+
+# The conditions of the primitive parsers (e.g. `word_match`, `word_meaning`) in the grammar, by column. Primitives
+# with the same key, e.g. two parsers matching the same word, share a column.
+conditions: List[Vectorized] = []
+columns: Dict[Hashable, int] = {}
+_lock = Lock()
+
+
+def register_primitive(key: Hashable, condition: Union[Vectorized, Callable[[Word], Response]]) -> int:
+    """
+    :param key: identifies the condition, e.g. the word it matches and the options used to match it.
+    :return: the column of the condition's responses in each annotation.
+    """
+    with _lock:
+        if key not in columns:
+            columns[key] = len(conditions)
+            conditions.append(as_vectorized(condition))
+        return columns[key]
+
+
+class Annotation:
+    """
+    The responses of the primitives in the grammar to each word in a transcript. A response is computed the first time a
+    primitive parser reads it, and is then reused by every other parser with the same primitive. Responses which are
+    never read, e.g. because `strongest` exited early or the primitive only looks at the first word, are not computed.
+    Each word has its own row of responses, so reading the response of a word is a dictionary lookup, which is cheaper
+    than the cached call to the condition it replaces.
+    """
+
+    def __init__(self, words: List[Word]):
+        # The responses of each primitive read so far to each distinct word in the transcript, by column.
+        self.rows: Dict[Word, Dict[int, Response]] = {}
+        self.extend(words)
+
+    def extend(self, words: List[Word]):
+        """
+        Adds rows for the words which are not in the transcript yet, e.g. the new words of an interim transcript as the
+        player keeps speaking. The responses already computed are kept.
+        """
+        for word in words:
+            if word not in self.rows:
+                self.rows[word] = {}
+
+    def responses(self, column: int, words: List[Word]) -> Optional[List[Response]]:
+        """
+        :return: the responses of the primitive in the column to the words, or None if any of the words are not in the
+                 transcript.
+        """
+        try:
+            rows = [self.rows[word] for word in words]
+        except KeyError:
+            return None
+
+        missing = [word for word, row in zip(words, rows) if column not in row]
+        if missing:
+            missing = list(dict.fromkeys(missing))
+            for word, response in zip(missing, conditions[column].responses(missing)):
+                self.rows[word][column] = float(response)
+
+        return [row[column] for row in rows]
+
+
+# The annotation of the transcript being parsed by the current thread.
+_current = local()
+
+
+def current_annotation() -> Optional[Annotation]:
+    """
+    :return: the annotation of the transcript being parsed, or None if the transcript was not annotated.
+    """
+    return getattr(_current, 'annotation', None)
+
+
+@contextmanager
+def annotated(words: List[Word], annotation: Optional[Annotation] = None):
+    """
+    Annotates the words of a transcript, which are used by the primitive parsers while the transcript is parsed in the
+    `with` block.
+    :param annotation: if given, the words are added to this annotation, e.g. of an earlier interim transcript, so
+                       only the responses of the new words are computed.
+    """
+    if annotation is None:
+        annotation = Annotation(words)
+    else:
+        annotation.extend(words)
+
+    previous = current_annotation()
+    _current.annotation = annotation
+    try:
+        yield _current.annotation
+    finally:
+        _current.annotation = previous
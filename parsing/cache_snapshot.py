@@ -0,0 +1,97 @@
+from parsing.lexical_cache import lexical_caches
+from typing import Callable, List
+import hashlib
+import glob
+import os
+import pickle
+import time
+import nltk
+
+
+# The grammar. If any of these files change, the cached results may be different, e.g. if a parser uses a new
+# similarity measure.
+GRAMMAR_FILES = os.path.join(os.path.dirname(__file__), '*.py')
+
+# The NLTK data the cached results are computed from.
+NLTK_RESOURCES = ['corpora/wordnet', 'taggers/averaged_perceptron_tagger']
+
+
+def snapshot_version() -> str:
+    """
+    :return: identifies the grammar and NLTK data used to compute the cached results. A snapshot can only be restored
+             if it has the same version, otherwise the cached results may be out of date.
+    """
+    version = hashlib.sha1()
+
+    for filename in sorted(glob.glob(GRAMMAR_FILES)):
+        with open(filename, 'rb') as file:
+            version.update(file.read())
+
+    update_nltk_version(version, NLTK_RESOURCES)
+    return version.hexdigest()
+
+
+def update_nltk_version(version, resources: List[str]):
+    """
+    Adds the version of NLTK, and the size and modification time of each of the NLTK resources, to the hash.
+    """
+    version.update(nltk.__version__.encode())
+
+    for resource in resources:
+        try:
+            pointer = nltk.data.find(resource)
+            # The resource may be a directory, or inside a zip file.
+            path = pointer.zipfile.filename if hasattr(pointer, 'zipfile') else pointer.path
+            stat = os.stat(path)
+            version.update('{}:{}:{}'.format(resource, stat.st_size, stat.st_mtime).encode())
+        except LookupError:
+            version.update('{}:missing'.format(resource).encode())
+
+
+def save_snapshot(filename: str):
+    """
+    Saves the results of all lexical caches to the file. The file is replaced atomically, so a snapshot being
+    written is never read.
+    """
+    snapshot = {
+        'version': snapshot_version(),
+        'caches': {name: dict(cache.results) for name, cache in lexical_caches.items()}
+    }
+
+    temp_filename = filename + '.tmp'
+    with open(temp_filename, 'wb') as file:
+        pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_filename, filename)
+
+
+def load_snapshot(filename: str) -> bool:
+    """
+    Restores the results of the lexical caches saved to the file, adding them to any results already cached.
+    :return: whether the snapshot was restored. Snapshots of a different version, or that cannot be read, are ignored.
+    """
+    try:
+        with open(filename, 'rb') as file:
+            snapshot = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return False
+
+    if snapshot.get('version') != snapshot_version():
+        return False
+
+    for name, results in snapshot['caches'].items():
+        # Caches may have been removed since the snapshot was saved.
+        if name in lexical_caches:
+            lexical_caches[name].update(results)
+
+    return True
+
+
+def save_snapshots_periodically(filename: str, interval: float, sleep: Callable[[float], None] = time.sleep):
+    """
+    Saves a snapshot of the lexical caches every `interval` seconds, forever. This is intended to be run in a
+    background task.
+    :param sleep: used to wait between snapshots, e.g. `socketio.sleep` when running with eventlet.
+    """
+    while True:
+        sleep(interval)
+        save_snapshot(filename)
@@ -0,0 +1,54 @@
+from contextlib import contextmanager
+from threading import local
+
+
+# Parsers compare the meaning of words using WordNet, and their spelling using the edit distance.
+FULL = 'full'
+
+# Parsers only match words with exactly the same spelling as the words they look for, or similar spelling. Meanings
+# are not compared.
+SPELLING = 'spelling'
+
+# Parsers only match the words they look for, or their plurals.
+EXACT = 'exact'
+
+# The profiles, from the most understanding to the cheapest to parse with.
+PROFILES = [FULL, SPELLING, EXACT]
+
+
+# The profile of the parsers created from now on, unless the current thread is using another, see `using_profile`. Like
+# the similarity backend, this must be set before a grammar is created, since each parser keeps how it compares words.
+default_profile = FULL
+
+# The profile used by the current thread, e.g. while parsing with a cheaper grammar.
+_current = local()
+
+
+def use_profile(new_profile: str):
+    global default_profile
+    default_profile = new_profile
+
+
+def current_profile() -> str:
+    """
+    :return: the profile of the parsers created by the current thread.
+    """
+    return getattr(_current, 'profile', default_profile)
+
+
+@contextmanager
+def using_profile(new_profile: str):
+    """
+    A context manager in which the parsers created by the current thread have the profile, e.g. to create a cheaper
+    grammar to use under load. Grammars create some parsers while parsing, so the grammar must also be parsed with in
+    its profile, see `parse_action.statement`.
+    """
+    previous = getattr(_current, 'profile', None)
+    _current.profile = new_profile
+    try:
+        yield
+    finally:
+        if previous is None:
+            del _current.profile
+        else:
+            _current.profile = previous
@@ -0,0 +1,86 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple, Any
+import functools
+
+
+class LexicalCache:
+    """
+    Caches the results of a function of words, e.g. the semantic similarity of two words. Unlike `functools.lru_cache`
+    the results can be read and restored, which allows them to be saved to disk and loaded when the server restarts.
+    """
+
+    results: Dict[Tuple, Any]
+
+    # The number of calls whose result was, and was not, already cached. Used to monitor the hit rate of the cache.
+    hits: int
+    misses: int
+
+    def __init__(self, function: Callable, max_size: Optional[int] = None):
+        """
+        :param function: the function to cache. All its arguments must be hashable.
+        :param max_size: the maximum number of results to keep. The least recently used result is discarded first. If
+                         None the cache is not bounded, which should only be used for functions of the grammar's words,
+                         since the words players say are not bounded.
+        """
+        self.function = function
+        self.max_size = max_size
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        functools.update_wrapper(self, function)
+
+    def __call__(self, *args):
+        try:
+            result = self.results[args]
+        except KeyError:
+            self.misses += 1
+            result = self.function(*args)
+            self.results[args] = result
+            self._evict()
+            return result
+
+        self.hits += 1
+        if self.max_size is not None:
+            try:
+                self.results.move_to_end(args)
+            except KeyError:
+                # Discarded by another thread.
+                pass
+        return result
+
+    def update(self, results: Dict[Tuple, Any]):
+        """
+        Adds the results, e.g. restored from a snapshot.
+        """
+        self.results.update(results)
+        self._evict()
+
+    def cache_clear(self):
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _evict(self):
+        while self.max_size is not None and len(self.results) > self.max_size:
+            try:
+                self.results.popitem(last=False)
+            except KeyError:
+                # Emptied by another thread.
+                break
+
+
+# All lexical caches, by the qualified name of the function they cache.
+lexical_caches: Dict[str, LexicalCache] = {}
+
+
+def lexical_cache(function: Optional[Callable] = None, max_size: Optional[int] = None):
+    """
+    A decorator which caches the results of the function, and registers the cache so it can be saved and restored.
+    Results must be picklable. May be given a maximum size, e.g. `@lexical_cache(max_size=1024)`, see `LexicalCache`.
+    """
+    if function is None:
+        return functools.partial(lexical_cache, max_size=max_size)
+
+    cache = LexicalCache(function, max_size)
+    lexical_caches['{}.{}'.format(function.__module__, function.__qualname__)] = cache
+    return cache
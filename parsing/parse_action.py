@@ -1,9 +1,14 @@
-from actions.action import Stop, Composite
+from actions.action import Action, Stop, Composite
 from parsing.parse_move import move, change_stance, change_speed, turn, hide, through_door, leave_room, move_into
 from parsing.parse_interaction import *
 from parsing.parse_question import *
 from parsing.parse_conversation import *
+from parsing.statement_classifier import StatementClassifier, FAMILIES, ACTION, QUESTION, CONVERSATION
+from parsing import grammar_profile
 from utils import split_list
+from concurrent.futures import Executor
+from typing import Dict, FrozenSet
+import functools
 
 
 def ignored_words() -> List[str]:
@@ -24,8 +29,9 @@ def stop() -> Parser:
     return parser.ignore_parsed(Stop())
 
 
-def single_action() -> Parser:
+def single_action(beam_width: int = 1) -> Parser:
     """
+    :param beam_width: the number of distinct actions to keep, see `strongest`.
     :return: a parser which parses single actions, i.e. not composite actions.
     """
     # The order these appear in here determine their precedence.
@@ -33,8 +39,8 @@ def single_action() -> Parser:
         stop(),
         throw_at_guard(),
         throw(),
-        change_stance().map_response(lambda r: r * 0.7),  # Because move also looks for stances, and this matches on less.
-        change_speed().map_response(lambda r: r * 0.72),  # Because move also looks for speeds, and this matches on less.
+        change_stance().scale_response(0.7),  # Because move also looks for stances, and this matches on less.
+        change_speed().scale_response(0.72),  # Because move also looks for speeds, and this matches on less.
         turn(),
         auto_take_out_guard(),
         strangle_guard(),
@@ -54,15 +60,41 @@ def single_action() -> Parser:
     min_response = 0.24
     thresholds = [threshold_success(p, min_response) for p in parsers]
 
-    return strongest(thresholds)
+    return strongest(thresholds, beam_width=beam_width, adaptive=None)
 
 
-def composite() -> Parser:
+@functools.lru_cache(maxsize=None)
+def memoised_single_action(profile: str = grammar_profile.FULL) -> Parser:
     """
+    :param profile: the grammar profile of the parser, see `grammar_profile`.
+    :return: a single action parser shared by all composite parsers, which remembers the results of recently parsed
+             parts of composite actions. While the user is speaking, the parts before the last separator do not change,
+             therefore these are only parsed once.
+    """
+    with grammar_profile.using_profile(profile):
+        return memoised(with_profile(single_action(), profile))
+
+
+def parse_single_action(words: List[Word], profile: str = grammar_profile.FULL) -> Optional[Action]:
+    """
+    :return: the single action parsed from the words, or None if no action was successfully parsed (partials are
+             ignored). This is a module level function so that it can be sent to the workers of a process pool.
+    """
+    result = memoised_single_action(profile).parse(words)
+    return result.parsed if result.is_success() else None
+
+
+def composite(executor: Optional[Executor] = None) -> Parser:
+    """
+    :param executor: if supplied, the actions between the separators are parsed concurrently using the executor, e.g. a
+                     ProcessPoolExecutor forked after `preload`, or a ThreadPoolExecutor. Otherwise they are parsed one
+                     after the other.
     :return: a parser which parses composite actions, e.g. actions connected with the word 'then' or 'and'. The
              response is the mean of all parsed actions.
     """
     separators = ['then', 'and']
+    # The parts are parsed with the profile this parser was created with.
+    parse_part = functools.partial(parse_single_action, profile=grammar_profile.current_profile())
 
     def parse(full_input: List[Word]) -> Optional[ParseResult]:
         inputs = split_list(full_input, separators)
@@ -71,32 +103,74 @@ def composite() -> Parser:
             # There were no occurrences of the separators.
             return FailureParse()
 
-        results = [single_action().parse(words) for words in inputs]
-        filtered = [result for result in results if result.is_success()] # Ignore partials
-        actions = [r.parsed for r in filtered]
+        # The chunks do not depend on each other, so can be parsed in any order. Executor.map, like map, gives the
+        # results in the order of the inputs.
+        map_inputs = executor.map if executor else map
+        parsed = map_inputs(parse_part, inputs)
+        actions = [act for act in parsed if act is not None] # Ignore partials
 
         return SuccessParse(Composite(actions), 1.0, [])
 
     return Parser(parse)
 
 
-def action() -> Parser:
+def action(executor: Optional[Executor] = None, beam_width: int = 1) -> Parser:
     """
+    :param executor: used to parse the parts of composite actions concurrently. See `composite`.
+    :param beam_width: the number of distinct actions to keep, see `strongest`.
     :return: a parser for single or composite actions. Nothing will be parsed if the text contains "not" or "don't".
     """
-    act = strongest([composite(), single_action()])
+    act = strongest([composite(executor), single_action(beam_width)], beam_width=beam_width)
     return ignore_words(ignored_words()) \
           .ignore_then(act)
 
 
-def statement() -> Parser:
+def statement(executor: Optional[Executor] = None, beam_width: int = 1,
+              classifier: Optional[StatementClassifier] = None, margin: float = 0.05,
+              profile: Optional[str] = None) -> Parser:
     """
+    :param executor: used to parse the parts of composite actions concurrently. See `composite`.
+    :param beam_width: the number of distinct statements to keep. The alternatives to the strongest statement can be
+                       used if the game cannot perform the strongest, without parsing again. See `strongest`.
+    :param classifier: if given, used to skip the families of grammar (actions, questions, or conversation) which the
+                       transcript is very unlikely to be.
+    :param margin: the minimum probability given by the classifier for a family to be parsed.
+    :param profile: the grammar profile to create and parse with, e.g. a cheaper profile to use under load. If None,
+                    the current profile is used to create the grammar, see `grammar_profile`.
     :return: a parser which understands what the user is saying.
     """
+    if profile is not None:
+        with grammar_profile.using_profile(profile):
+            return with_profile(statement(executor, beam_width, classifier, margin), profile)
+
     inhibiting = none(non_consuming(question()), max_parser_response=0.9)
-    parsers = [
-        inhibiting.ignore_then(action()),
-        question(),
-        conversation()
-    ]
-    return strongest(parsers)
+    families = {
+        ACTION: inhibiting.ignore_then(action(executor, beam_width)),
+        QUESTION: question(),
+        CONVERSATION: conversation()
+    }
+
+    if classifier is None:
+        return strongest(list(families.values()), beam_width=beam_width)
+
+    return classified(classifier, families, margin, beam_width)
+
+
+def classified(classifier: StatementClassifier, families: Dict[str, Parser], margin: float, beam_width: int) -> Parser:
+    """
+    :param families: the parser of each family of statement.
+    :return: a parser which gives the strongest parse of the families the classifier does not rule out.
+    """
+    # The strongest parser of each set of families, created the first time the set is used.
+    parsers: Dict[FrozenSet[str], Parser] = {}
+
+    def parse(input: List[Word]) -> ParseResult:
+        kept = frozenset(classifier.families(input, margin))
+
+        if kept not in parsers:
+            # Keep the order of the families so ties are broken in the same way as without the classifier.
+            parsers[kept] = strongest([families[f] for f in FAMILIES if f in kept], beam_width=beam_width)
+
+        return parsers[kept].parse(input)
+
+    return Parser(parse)
@@ -89,4 +89,4 @@ def question() -> Parser:
         guards_question(),
         surroundings_question()
     ]
-    return strongest(parsers)
+    return strongest(parsers, adaptive=None)
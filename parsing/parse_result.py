@@ -1,5 +1,5 @@
 from equatable import EquatableMixin
-from typing import List, Any, Callable, Type
+from typing import List, Any, Callable, Type, Tuple
 
 # A word in the user's text.
 Word = str
@@ -9,10 +9,21 @@ Word = str
 Response = float
 
 
+# The alternatives of results without any. This is shared, rather than creating an empty list for every result, so it
+# must never be modified.
+NO_ALTERNATIVES: List['SuccessParse'] = []
+
+
 class ParseResult(EquatableMixin):
     """
-    The result of performing parsing.
+    The result of performing parsing. Results are compared millions of times while parsing, so they use slots, and
+    are compared using a key which is computed when they are created.
     """
+    __slots__ = ('key',)
+
+    # Used to compare results, see `__lt__`. Successes have a rank of 2, partials 1, and failures 0.
+    key: Tuple[int, Response]
+
     def either(self,
                success: Callable[['SuccessParse'], Any] = lambda _: None,
                partial: Callable[['PartialParse'], Any] = lambda _: None,
@@ -40,41 +51,36 @@ class ParseResult(EquatableMixin):
                  Partials are ranked below success, if two are compared the response is used.
                  Failures are ranked lowest, and two are worth the same.
         """
-        # Used for inter-class comparison.
-        def rank(result: ParseResult) -> int:
-            return result.either(lambda _: 2, lambda _: 1, lambda _: 0)
-
-        # Used for intra-class comparison.
-        def response(result: ParseResult) -> int:
-            success = lambda s: s.response
-            partial = lambda p: p.response
-            failure = lambda f: 0.0
-
-            return result.either(success, partial, failure)
-
-        if rank(self) > rank(other):
-            return False
+        return self.key < other.key
 
-        if rank(self) == rank(other):
-            return response(self) < response(other)
+    def __eq__(self, other):
+        # Results do not have a __dict__, so are compared using their slots.
+        if isinstance(self, other.__class__):
+            return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+        return False
 
-        # Only case left is rank(self) < rank(other)
-        return True
+    __hash__ = None
 
 
 class SuccessParse(ParseResult):
     """
     Represents a successful parse.
     """
-    def __init__(self, parsed: Any, response: Response, remaining: List[Word]):
+    __slots__ = ('parsed', 'response', 'remaining', 'alternatives')
+
+    def __init__(self, parsed: Any, response: Response, remaining: List[Word], alternatives: List['SuccessParse'] = None):
         """
         :param parsed: the object the was parsed.
         :param response: how strongly the parser matched on the transcript.
         :param remaining: any words that were remaining un-parsed.
+        :param alternatives: the next strongest distinct parses of the same input, strongest first. These are only
+                             created by parsers in beam mode, see `strongest`.
         """
         self.parsed = parsed
         self.response = response
         self.remaining = remaining
+        self.alternatives = alternatives or NO_ALTERNATIVES
+        self.key = (2, response)
 
     def __repr__(self):
         return "<SuccessParse: {}, {}, {}>".format(self.parsed, self.response, self.remaining)
@@ -85,6 +91,8 @@ class PartialParse(ParseResult):
     Represents a parse that was partially matched, but the player
     needs to be asked questions for the rest of the information.
     """
+    __slots__ = ('failed_parser', 'response', 'marker')
+
     def __init__(self, failed_parser, response: Response, marker: Any):
         """
         :param failed_parser: the parser that failed, but that can be reapplied once were have more  information.
@@ -94,6 +102,7 @@ class PartialParse(ParseResult):
         self.failed_parser = failed_parser
         self.response = response
         self.marker = marker
+        self.key = (1, response)
 
     def __repr__(self):
         return "<PartialParse: {}, {}>".format( self.response, self.marker)
@@ -101,7 +110,22 @@ class PartialParse(ParseResult):
 
 class FailureParse(ParseResult):
     """
-    Represents a failed parse.
+    Represents a failed parse. All failures are the same, so `FailureParse()` always gives the same instance rather
+    than creating a new one.
     """
+    __slots__ = ()
+
+    _instance: 'FailureParse' = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.key = (0, 0.0)
+        return cls._instance
+
+    def __reduce__(self):
+        # Unpickled failures are also the shared instance.
+        return FailureParse, ()
+
     def __repr__(self):
         return "<FailureParse>"
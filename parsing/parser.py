@@ -1,6 +1,16 @@
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Hashable, Union
+from collections import OrderedDict
+from threading import Lock
 from parsing.parse_result import *
 from parsing.pre_processing import pre_process
+from parsing.vocabulary import vocabulary
+from parsing.annotation import register_primitive, current_annotation
+from parsing.vectorized import Vectorized, vectorized, as_vectorized
+from parsing.lexical_cache import lexical_cache
+from parsing.synset_index import synsets, register_seed_word
+from parsing.path_similarity import path_similarity
+from parsing import similarity_backend, shared_cache, grammar_profile
+from parsing.similarity_backend import SimilarityBackend
 import nltk
 from nltk.corpus import wordnet as wn
 from nltk.corpus.reader.wordnet import Synset
@@ -40,36 +50,94 @@ def mix(r1: Response, r2: Response, proportion: float = 0.5) -> Response:
     return r1 * (1 - proportion) + r2 * proportion
 
 
-@functools.lru_cache(maxsize=None)
+# The maximum number of results kept by each cache of a function of input words. The words players say, e.g. their
+# misspellings, are not bounded, so the least recently used results are discarded.
+LEXICAL_CACHE_SIZE = 1 << 18
+
+
+@lexical_cache(max_size=LEXICAL_CACHE_SIZE)
 def semantic_similarity(w1: Word, w2: Word, pos: str, similarity_measure: Callable[[Synset, Synset], Response]) -> Response:
     """
-    :param similarity_measure: a word net function which give the semantic distance between two synsets.
+    :param similarity_measure: a word net function which give the semantic distance between two synsets, or a
+                               `SimilarityBackend` which compares the words. If the measure has a `max_similarity`
+                               method, e.g. `path_similarity`, all pairs of synsets are compared at once using it.
     :return: the semantic similarity between the words using a `similarity` distance function defined by WordNet.
+             If a shared cache is used, the similarity may have been computed by another process.
     """
+    if shared_cache.cache is None:
+        return _semantic_similarity(w1, w2, pos, similarity_measure)
+
+    key = (w1, w2, pos, similarity_measure)
+    similarity = shared_cache.cache.get(key)
+    if similarity is None:
+        similarity = _semantic_similarity(w1, w2, pos, similarity_measure)
+        shared_cache.cache.put(key, similarity)
 
-    # If a category of words (POS) was supplied, fill that in.
-    make_synsets = partial(wn.synsets, pos=pos) if pos else wn.synsets
+    # Similarities read from the cache have float32 precision, which only changes responses in the 7th digit.
+    return similarity
 
+
+def _semantic_similarity(w1: Word, w2: Word, pos: str, similarity_measure: Callable[[Synset, Synset], Response]) -> Response:
     # Each synset contains different meanings of the word, e.g. fly is a noun and verb.
     # We'll find the maximum semantic similarity between any pairing of words from both synsets.
-    w1_synsets: List[Synset] = make_synsets(w1)
-    w2_synsets: List[Synset] = make_synsets(w2)
+    # If a category of words (POS) was supplied, only synsets in that category are used.
+    if isinstance(similarity_measure, SimilarityBackend):
+        # E.g. words in the WordNet subset can be compared without loading the full WordNet.
+        similarity = similarity_measure.word_similarity(w1, w2, pos)
+        if similarity is not None:
+            return similarity
+
+    w1_synsets = synsets(w1, pos)
+    w2_synsets = synsets(w2, pos)
 
     if len(w1_synsets) == 0 or len(w2_synsets) == 0:
         return 0.0
 
-    similarities = [similarity_measure(s1, s2) or 0.0 for s1 in w1_synsets for s2 in w2_synsets]
-    return np.max(similarities)
+    if hasattr(similarity_measure, 'max_similarity'):
+        return similarity_measure.max_similarity(w1_synsets, w2_synsets)
+
+    return max(similarity_measure(s1, s2) or 0.0 for s1 in w1_synsets for s2 in w2_synsets)
+
+
+@lexical_cache(max_size=LEXICAL_CACHE_SIZE)
+def pos_tag(word: Word) -> str:
+    """
+    :return: the part of speech tag of the word, e.g. 'NN'. Cached since the same words are tagged by many parsers, and
+             in each speech recognition hypothesis.
+    """
+    _, tag = nltk.pos_tag([word])[0]
+    return tag
+
+
+@lexical_cache(max_size=LEXICAL_CACHE_SIZE)
+def spelling_similarity(input_word: Word, match_word: Word, match_first_letter: bool, min_word_length: int) -> Response:
+    """
+    :param match_first_letter: whether the similarity is 0 if the first letters of the words do not match.
+    :param min_word_length: the minimum word length, below, or equal, to which the words must exactly match.
+    :return: the similarity of the spelling of the words, i.e. 1 minus the normalised edit distance.
+    """
+    if len(input_word) <= min_word_length:
+        return input_word == match_word
+
+    if match_first_letter and input_word[0] != match_word[0]:
+        return 0
+
+    max_word_len = max(len(input_word), len(match_word))
+    edit_dist = editdistance.eval(match_word, input_word)
+    return ((max_word_len - edit_dist) / max_word_len)
 
 
 class Parser:
     num_created = 0
 
-    def __init__(self, parse: Callable[[List[Word]], ParseResult]):
+    def __init__(self, parse: Callable[[List[Word]], ParseResult], max_response: Response = 1.0):
         """
         :param parse: the function that takes a list of words and produces a parse result.
+        :param max_response: the maximum response of a successful parse, which is used by `strongest` to avoid running
+                             parsers which cannot give the strongest response.
         """
         self.parse = parse
+        self.max_response = max_response
 
         Parser.num_created += 1
 
@@ -86,7 +154,16 @@ class Parser:
                 return result
 
             new_parser = operation(result.parsed, result.response)
-            return new_parser.parse(result.remaining)
+            new_result = new_parser.parse(result.remaining)
+
+            if not result.alternatives or not isinstance(new_result, SuccessParse):
+                return new_result
+
+            # Continue parsing from each alternative so the alternatives are carried through to the final result.
+            # This re-uses the alternatives' results rather than parsing the input again.
+            alternatives = [operation(alt.parsed, alt.response).parse(alt.remaining) for alt in result.alternatives]
+            beam_width = 1 + max(len(result.alternatives), len(new_result.alternatives))
+            return best_distinct(new_result, new_result.alternatives + alternatives, beam_width)
 
         return Parser(new_parse)
 
@@ -157,6 +234,15 @@ class Parser:
 
         return self.map(t)
 
+    def scale_response(self, factor: Response) -> 'Parser':
+        """
+        :return: a parser whose response is the response of this parser multiplied by the factor. Unlike
+                 `map_response`, the maximum response of the parser is known.
+        """
+        parser = self.map_response(lambda r: r * factor)
+        parser.max_response = self.max_response * factor
+        return parser
+
     def map_parsed(self, transformation: Callable[[Any], Any]) -> 'Parser':
         """
         :return: maps the parsed object of this parser to the value returned by the transformation.
@@ -166,7 +252,9 @@ class Parser:
             new_parsed = transformation(parsed)
             return (new_parsed, response)
 
-        return self.map(t)
+        parser = self.map(t)
+        parser.max_response = self.max_response
+        return parser
 
     def ignore_parsed(self, new_parsed: Any) -> 'Parser':
         """
@@ -239,7 +327,7 @@ def produce(parsed: Any, response: Response) -> Parser:
     def parse(input: List[Word]) -> ParseResult:
         return SuccessParse(parsed, response, input)
 
-    return Parser(parse)
+    return Parser(parse, max_response=response)
 
 
 def failure() -> Parser:
@@ -249,24 +337,52 @@ def failure() -> Parser:
     return Parser(lambda input: FailureParse())
 
 
-def predicate(condition: Callable[[Word], Response], first_only = False, consume = Consume.UP_TO_WORD) -> Parser:
+def predicate(condition: Union[Vectorized, Callable[[Word], Response]],
+              first_only = False,
+              consume = Consume.UP_TO_WORD,
+              key: Optional[Hashable] = None) -> Parser:
     """
+    :param condition: gives the response of a word. May be `Vectorized`, to give the responses of all the input words
+                      at once.
     :param first_only: whether to only match the predicate on the first word in the remaining list of words.
     :param consume_to_word: whether to consume all the words on the input up and including to the parsed word, or
                             whether to just consume the parsed word and leave the rest of the input untouched.
+    :param key: identifies the condition, e.g. ('word_match', word). If given, the condition is registered as a
+                primitive, and its responses are taken from the annotation of the transcript being parsed, if there is
+                one, rather than being computed each time the parser is run. Conditions with the same key must give
+                the same responses.
     :return: a parser which matches on the word which gives the highest response to the condition.
     """
+    column = register_primitive(key, condition) if key is not None else None
+
+    # Scalar conditions are called in a loop, which is quicker than converting the responses of a short transcript to
+    # an array.
+    if isinstance(condition, Vectorized):
+        compute = condition.responses
+    else:
+        compute = lambda words: [condition(word) for word in words]
+
+    # Returns the responses of the words, from the annotation if there is one.
+    def responses(words: List[Word]) -> Union[np.ndarray, List[Response]]:
+        annotation = current_annotation() if column is not None else None
+        annotated_responses = annotation.responses(column, words) if annotation else None
+        return annotated_responses if annotated_responses is not None else compute(words)
 
     # Returns the index of the word with the maximum response, that word, and its response.
     def generate_responses(input: List[Word]) -> (int, Word, Response):
-        responses = [(i, word, condition(word)) for i, word in enumerate(input)]
-        return max(responses, key=lambda r: r[2])
+        input_responses = responses(input)
+        # The first word is used if more than one have the maximum response.
+        if isinstance(input_responses, np.ndarray):
+            i = int(np.argmax(input_responses))
+        else:
+            i = max(range(len(input_responses)), key=input_responses.__getitem__)
+        return i, input[i], float(input_responses[i])
 
     # Returns the index of the first word, the first word, and its response to the predicate.
     def generate_response_first(input: List[Word]) -> (int, Word, Response):
         index = 0
         word = input[index]
-        return index, word, condition(word)
+        return index, word, float(responses([word])[0])
 
     # Returns: the words to be in the remaining of this parser.
     def output_words(input: List[Word], word_match_idx: int) -> List[Word]:
@@ -301,31 +417,27 @@ def word_spelling(word: Word,
     :param min_word_length: the minimum word length, below, or equal, to which word spelling must exactly match.
     :param first_only: whether to only match the predicate on the first word in the remaining list of words.
     :return: a parser which matches words where the difference in spelling of the word and an input word determines the
-             response. If matches then `word` is the parsed string, not the word from the input text.
+             response. If matches then `word` is the parsed string, not the word from the input text. With the exact
+             grammar profile only the word itself is matched, see `grammar_profile`.
     """
-    def condition(match_word: Word) -> Callable[[Word], Response]:
-        def _c(input_word: Word) -> Response:
-            if len(input_word) <= min_word_length:
-                return input_word == match_word
+    if grammar_profile.current_profile() == grammar_profile.EXACT:
+        return word_match(word, match_plural, first_only, consume)
 
-            if match_first_letter and input_word[0] != match_word[0]:
-                return 0
+    def spelling_predicate(match_word: Word) -> Parser:
+        def condition(input_word: Word) -> Response:
+            return spelling_similarity(input_word, match_word, match_first_letter, min_word_length)
 
-            max_word_len = max(len(input_word), len(match_word))
-            edit_dist = editdistance.eval(match_word, input_word)
-            return ((max_word_len - edit_dist) / max_word_len)
+        key = ('word_spelling', match_word, match_first_letter, min_word_length)
+        return predicate(condition, first_only, consume, key).ignore_parsed(match_word)
 
-        return _c
+    word = vocabulary.add(word)
 
     if match_plural:
-        plural = inflect.engine().plural(word)
-        p_plural = predicate(condition(plural), first_only, consume).ignore_parsed(plural)
-        p = predicate(condition(word), first_only, consume).ignore_parsed(word)
-        return strongest([p, p_plural])
+        plural = vocabulary.add(inflect.engine().plural(word))
+        return strongest([spelling_predicate(word), spelling_predicate(plural)])
 
     else:
-        p = predicate(condition(word), first_only, consume).ignore_parsed(word)
-        return threshold_success(p, dist_threshold)
+        return threshold_success(spelling_predicate(word), dist_threshold)
 
 
 def word_spelling_threshold(dist_threshold: Response,
@@ -354,48 +466,58 @@ def word_match(word: Word, match_plural = True, first_only = False, consume = Co
     :param first_only: whether to only match the predicate on the first word in the remaining list of words.
     :return: a parser which matches on the first occurrence of the supplied word anywhere in the remaining words.
     """
-    if match_plural:
-        plural = inflect.engine().plural(word)
+    word = vocabulary.add(word)
+    plural = vocabulary.add(inflect.engine().plural(word)) if match_plural else word
 
-        def condition(input_word: Word) -> Response:
-            return float(input_word == word or input_word == plural)
-
-    else:
-        def condition(input_word: Word) -> Response:
-            return float(input_word == word)
+    # Input words are interned by `pre_process`, so comparing a matching word finds the same string object without
+    # comparing characters. Most other words differ in length.
+    def condition(input_word: Word) -> Response:
+        return 1.0 if input_word == word or input_word == plural else 0.0
 
-    return predicate(condition, first_only, consume).map_parsed(lambda _: word)
+    key = ('word_match', word, plural)
+    return predicate(condition, first_only, consume, key).map_parsed(lambda _: word)
 
 
 def word_meaning(word: Word,
                  pos: Optional[str] = None,
                  semantic_similarity_threshold: Response = 0.5,
-                 similarity_measure: Callable[[Synset, Synset], Response] = Synset.path_similarity,
+                 similarity_measure: Optional[Callable[[Synset, Synset], Response]] = None,
                  first_only = False,
                  consume = Consume.UP_TO_WORD) -> Parser:
     """
     :param word: the word to find similar words to.
     :param pos: defines the category of words to compare (e.g. verbs). Words not in this category will have a similarity of 0.
     :param semantic_similarity_threshold: the minimum semantic distance for an input word to be from the supplied word.
-    :param similarity_measure: used to compare the semantic similarity of two words.
+    :param similarity_measure: used to compare the semantic similarity of two words. If None, the default backend is
+                               used, see `similarity_backend.use_backend`.
     :param first_only: whether to only match the predicate on the first word in the remaining list of words.
-    :return: a parser which matches on words which have a similar meaning to the supplied word.
+    :return: a parser which matches on words which have a similar meaning to the supplied word. Unless the grammar
+             profile is the full profile, only the word itself, or its plural, is matched, see `grammar_profile`.
     """
+    if grammar_profile.current_profile() != grammar_profile.FULL:
+        return word_match(word, first_only=first_only, consume=consume)
+
+    word = vocabulary.add(word)
+    register_seed_word(word, pos)
+    similarity_measure = similarity_measure or similarity_backend.default_backend or path_similarity
+
     def condition(input_word: Word) -> Response:
         return semantic_similarity(input_word, word, pos, similarity_measure)
 
-    return threshold_success(predicate(condition, first_only, consume), semantic_similarity_threshold)
+    key = ('word_meaning', word, pos, similarity_measure)
+    return threshold_success(predicate(condition, first_only, consume, key), semantic_similarity_threshold)
 
 
 def word_meaning_pos(pos: POS,
                      semantic_similarity_threshold: Response = 0.5,
-                     similarity_measure: Callable[[Synset, Synset], Response] = Synset.path_similarity,
+                     similarity_measure: Optional[Callable[[Synset, Synset], Response]] = None,
                      first_only = False,
                      consume = Consume.UP_TO_WORD) -> Callable[[Word], Parser]:
     """
     :param pos: defines the category of words to compare (e.g. verbs). Words not in this category will have a similarity of 0.
     :param semantic_similarity_threshold: the minimum semantic distance for an input word to be from the supplied word.
-    :param similarity_measure: used to compare the semantic similarity of two words.
+    :param similarity_measure: used to compare the semantic similarity of two words. If None, the default backend is
+                               used, see `similarity_backend.use_backend`.
     :param first_only: whether to only match the predicate on the first word in the remaining list of words.
     :return: a function which takes a word and returns a parser which matches on words which have a similar meaning to
              that word.
@@ -414,10 +536,9 @@ def word_tagged(tags: List[str], first_only = False, consume = Consume.UP_TO_WOR
     :return: a parser which matches on words with the given tags.
     """
     def condition(input_word: Word) -> Response:
-        word, tag = nltk.pos_tag([input_word])[0]
-        return float(tag in tags)
+        return float(pos_tag(input_word) in tags)
 
-    return predicate(condition, first_only, consume)
+    return predicate(condition, first_only, consume, key=('word_tagged', tuple(tags)))
 
 
 def phrase(words_phrase: str) -> Parser:
@@ -483,11 +604,87 @@ def number_str() -> Parser:
     return number().map_parsed(lambda num: str(num))
 
 
-def strongest(parsers: List[Parser], debug = False) -> Parser:
+def best_distinct(best: SuccessParse, others: List[ParseResult], beam_width: int) -> SuccessParse:
+    """
+    :param best: the strongest result, which will be the first result in the beam.
+    :param others: other results of parsing the same input, which may include failures, partials, and results with the
+                   same parsed object as another.
+    :param beam_width: the maximum number of results, including `best`, to keep.
+    :return: `best` with its alternatives set to the strongest successful results with different parsed objects. If two
+             alternatives have the same response the one to occur first in `others` is kept first.
+    """
+    successes = [result for result in others if isinstance(result, SuccessParse)]
+    ranked = sorted(successes, key=lambda result: result.response, reverse=True)
+
+    beam = [best]
+    for result in ranked:
+        if len(beam) == beam_width:
+            break
+        if all(result.parsed != kept.parsed for kept in beam):
+            beam.append(SuccessParse(result.parsed, result.response, result.remaining))
+
+    return SuccessParse(best.parsed, best.response, best.remaining, alternatives=beam[1:])
+
+
+# Whether the parsers given to `strongest` with `adaptive=None` are run in order of how often they have given the
+# strongest response, see `strongest`. This must be set before the grammar is created.
+adaptive_order = False
+
+# The number of parses between reordering adaptive parsers.
+REORDER_INTERVAL = 64
+
+# Once a parser has given the strongest response this many times, the counts of all the parsers are halved, so the order follows
+# changes in what players say.
+MAX_WINS = 1024
+
+
+def use_adaptive_order(enabled: bool):
+    global adaptive_order
+    adaptive_order = enabled
+
+
+def strongest(parsers: List[Parser], debug = False, beam_width: int = 1, adaptive: Optional[bool] = False) -> Parser:
     """
+    :param beam_width: if greater than 1, the result also contains the alternatives of up to `beam_width - 1` of the
+                       next strongest distinct successful parses. To find these every parser is run, i.e. there is no
+                       early exit. The alternatives of the results of the parsers are also considered.
+    :param adaptive: if true, the parsers which most often give the strongest response are run first. The search stops
+                     once none of the parsers left to run could give a stronger response, or an equal response while
+                     being earlier in the list, using their `max_response`. The result is the same as running them in
+                     order. If None, `adaptive_order` is used.
     :return: the parser that gives the strongest response on the input text. If multiple parsers have the same maximum,
              then the parser to occur first in the list is returned.
     """
+    if adaptive is None:
+        adaptive = adaptive_order
+
+    def parse_beam(input: List[Word]) -> ParseResult:
+        results = [parser.parse(input) for parser in parsers]
+
+        if debug:
+            for result in results:
+                print(result)
+
+        best_result: Optional[ParseResult] = None
+        for result in results:
+            if not best_result or isinstance(best_result, FailureParse):
+                best_result = result
+            elif best_result < result:
+                best_result = result
+
+        if not isinstance(best_result, SuccessParse):
+            return best_result
+
+        # Flatten the results and their alternatives, keeping the order of the parsers for equal responses.
+        others = []
+        for result in results:
+            if result is not best_result:
+                others.append(result)
+            if isinstance(result, SuccessParse):
+                others.extend(result.alternatives)
+
+        return best_distinct(best_result, others, beam_width)
+
     def parse(input: List[Word]) -> ParseResult:
         best_result: Optional[ParseResult] = None
 
@@ -512,7 +709,77 @@ def strongest(parsers: List[Parser], debug = False) -> Parser:
 
         return best_result
 
-    return Parser(parse)
+    # The number of times each parser has given the strongest response, and the order to run the parsers in.
+    max_responses = [parser.max_response for parser in parsers]
+    wins = [0] * len(parsers)
+    order = list(range(len(parsers)))
+    num_parsed = 0
+    # The parser may be shared between threads, e.g. when parsing composite actions concurrently, so the counts and
+    # order are only changed while this is held.
+    lock = Lock()
+
+    def parse_adaptive(input: List[Word]) -> ParseResult:
+        nonlocal order, num_parsed
+
+        with lock:
+            num_parsed += 1
+            if num_parsed % REORDER_INTERVAL == 0:
+                if max(wins) > MAX_WINS:
+                    for i in range(len(wins)):
+                        wins[i] //= 2
+                # The sort is stable, so parsers with the same number of wins stay in the order they were given.
+                order = sorted(range(len(parsers)), key=lambda i: -wins[i])
+            current_order = order
+
+        results: List[Optional[ParseResult]] = [None] * len(parsers)
+        best_index = -1
+
+        for i in current_order:
+            result = parsers[i].parse(input)
+            results[i] = result
+
+            if debug:
+                print(result)
+
+            if best_index == -1 or isinstance(results[best_index], FailureParse) or results[best_index] < result \
+                    or (i < best_index and not result < results[best_index]):
+                best_index = i
+
+            best = results[best_index]
+            if isinstance(best, SuccessParse) and all(results[j] is not None or
+                                                      max_responses[j] < best.response or
+                                                      (j > best_index and max_responses[j] <= best.response)
+                                                      for j in range(len(parsers))):
+                # None of the parsers which have not been run can give a stronger response, or an equal response
+                # while being earlier in the list.
+                break
+
+        if best_index == -1:
+            return None
+
+        if isinstance(results[best_index], SuccessParse):
+            with lock:
+                wins[best_index] += 1
+
+        return results[best_index]
+
+    max_response = max(max_responses, default=0.0)
+
+    if beam_width > 1:
+        return Parser(parse_beam, max_response)
+    return Parser(parse_adaptive if adaptive else parse, max_response)
+
+
+def with_profile(parser: Parser, profile: str) -> Parser:
+    """
+    :return: a parser which parses using the grammar profile, so the parsers which `parser` creates while parsing have
+             the same profile as it, see `grammar_profile`.
+    """
+    def parse(input: List[Word]) -> ParseResult:
+        with grammar_profile.using_profile(profile):
+            return parser.parse(input)
+
+    return Parser(parse, parser.max_response)
 
 
 def strongest_word(words: List[Word], make_word_parsers: [Callable[[Word], Parser]] = None, debug = False) -> Parser:
@@ -538,7 +805,38 @@ def non_consuming(parser: Parser) -> Parser:
     def parse(input: List[Word]) -> ParseResult:
         result = parser.parse(input)
         if isinstance(result, SuccessParse):
-            return SuccessParse(result.parsed, result.response, input)
+            alternatives = [SuccessParse(alt.parsed, alt.response, input) for alt in result.alternatives]
+            return SuccessParse(result.parsed, result.response, input, alternatives)
+        return result
+
+    return Parser(parse)
+
+
+def memoised(parser: Parser, max_size: int = 128) -> Parser:
+    """
+    :param max_size: the maximum number of results to keep. The least recently used result is discarded first.
+    :return: a parser which gives the same results as `parser`, but only parses each input once. Useful where the same
+             input is parsed repeatedly, e.g. the parts of a transcript which do not change while the user is speaking.
+    """
+    results: OrderedDict = OrderedDict()
+    # The parser may be shared between threads, e.g. when parsing composite actions concurrently.
+    lock = Lock()
+
+    def parse(input: List[Word]) -> ParseResult:
+        key = vocabulary.key(input)
+
+        with lock:
+            if key in results:
+                results.move_to_end(key)
+                return results[key]
+
+        result = parser.parse(input)
+
+        with lock:
+            results[key] = result
+            if len(results) > max_size:
+                results.popitem(last=False)
+
         return result
 
     return Parser(parse)
@@ -571,7 +869,9 @@ def threshold_success(parser: Parser, response_threshold: Response) -> Parser:
 
         return produce(parsed, response)
 
-    return parser.then(check_threshold)
+    thresholded = parser.then(check_threshold)
+    thresholded.max_response = parser.max_response
+    return thresholded
 
 
 def none(parser: Parser, response: Response = 1.0, max_parser_response: Response = 0.0) -> Parser:
@@ -0,0 +1,241 @@
+from parsing.similarity_backend import SimilarityBackend
+from nltk.corpus.reader.wordnet import Synset
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from collections import deque
+import inspect
+import numpy as np
+
+
+# Used as the distance between synsets which have no common hypernym.
+NO_PATH = np.iinfo(np.int32).max // 4
+
+# Older versions of NLTK only simulate a root for the verb taxonomies if the first synset being compared needs one,
+# newer versions simulate a root if either synset does.
+try:
+    SYMMETRIC_ROOT = 'other._needs_root()' in inspect.getsource(Synset.path_similarity)
+except (OSError, TypeError):
+    SYMMETRIC_ROOT = True
+
+
+class Closure:
+    """
+    The hypernyms of a synset, including the synset itself, and the length of the shortest path to each.
+    """
+
+    # The ids of the synsets in the closure, in ascending order.
+    node_ids: np.ndarray
+    # The length of the shortest path from the synset to each node in the closure.
+    distances: np.ndarray
+    # The length of the path to the simulated root, which is one more than the longest shortest path to a hypernym.
+    root_distance: int
+    # Whether the synset is in a taxonomy which needs a simulated root, e.g. verbs.
+    needs_root: bool
+
+    def __init__(self, node_ids: np.ndarray, distances: np.ndarray, root_distance: int, needs_root: bool):
+        order = np.argsort(node_ids)
+        self.node_ids = node_ids[order]
+        self.distances = distances[order]
+        self.root_distance = root_distance
+        self.needs_root = needs_root
+
+
+class SeedMatrix:
+    """
+    The closures of a group of synsets, e.g. the synsets of a seed word, as a dense matrix of path lengths from each
+    synset to every node in any of the closures. The last column is for nodes not in any closure.
+    """
+
+    def __init__(self, closures: List[Closure]):
+        self.node_ids = np.unique(np.concatenate([c.node_ids for c in closures]))
+        self.distances = np.full((len(closures), len(self.node_ids) + 1), NO_PATH, dtype=np.int32)
+
+        for row, closure in enumerate(closures):
+            columns = np.searchsorted(self.node_ids, closure.node_ids)
+            self.distances[row, columns] = closure.distances
+
+        self.root_distances = np.array([c.root_distance for c in closures], dtype=np.int32)
+        self.needs_root = np.array([c.needs_root for c in closures], dtype=bool)
+
+    def columns(self, node_ids: np.ndarray) -> np.ndarray:
+        """
+        :return: the column of each node, or the last column if the node is not in any closure.
+        """
+        columns = np.minimum(np.searchsorted(self.node_ids, node_ids), len(self.node_ids) - 1)
+        found = self.node_ids[columns] == node_ids
+        return np.where(found, columns, len(self.node_ids))
+
+
+class PathSimilarity(SimilarityBackend):
+    """
+    Computes the same similarities as `Synset.path_similarity`, but from hypernym closures which are found once for each
+    synset and stored as integer arrays. The similarities of all pairs of synsets from two groups are computed at once.
+
+    Can be used as the `similarity_measure` of `semantic_similarity` and `word_meaning`. Only the shared instance,
+    `path_similarity`, should be used so cached results are shared and can be saved in cache snapshots.
+    """
+
+    def __init__(self):
+        # Integer ids of the synsets, by synset name.
+        self._ids: Dict[str, int] = {}
+        self._closures: Dict[str, Closure] = {}
+        self._seed_matrices: Dict[Tuple[str, ...], SeedMatrix] = {}
+        # The subset of WordNet words are looked up in before the full WordNet, see `word_similarity`.
+        self.subset = None
+
+    def use_subset(self, subset):
+        """
+        Uses the closures in the WordNet subset, instead of finding them from the full WordNet. Synsets are given the
+        same ids as in the subset, so closures from the subset and the full WordNet can be compared.
+        :param subset: a `WordNetSubset`.
+        """
+        self.subset = subset
+        self._ids = {str(name): i for i, name in enumerate(subset.names)}
+        self._closures = {}
+        self._seed_matrices = {}
+
+    def word_similarity(self, input_word: str, seed_word: str, pos: Optional[str]) -> Optional[float]:
+        """
+        :return: the maximum path similarity between the synsets of the words, or 0 if either word has no synsets, using
+                 only the WordNet subset. None if there is no subset or either word is not in it, in which case the
+                 synsets are looked up in the full WordNet.
+        """
+        if self.subset is None:
+            return None
+
+        ids1 = self.subset.synset_ids(input_word, pos)
+        ids2 = self.subset.synset_ids(seed_word, pos)
+
+        if ids1 is None or ids2 is None:
+            return None
+        if len(ids1) == 0 or len(ids2) == 0:
+            return 0.0
+
+        names2 = [str(self.subset.names[i]) for i in ids2]
+        seeds = self._seed_matrix(names2, lambda: [self._subset_closure(name, i) for name, i in zip(names2, ids2)])
+        closures = [self._subset_closure(str(self.subset.names[i]), i) for i in ids1]
+        return float(np.max(self._similarities(closures, seeds)))
+
+    def __call__(self, s1: Synset, s2: Synset) -> Optional[float]:
+        """
+        :return: the same as `s1.path_similarity(s2)`.
+        """
+        similarity = self.similarities([s1], [s2])[0, 0]
+        return float(similarity) if similarity > 0 else None
+
+    def __reduce__(self):
+        # Pickle by reference to the shared instance, rather than by the contents of the closures.
+        return 'path_similarity'
+
+    def max_similarity(self, synsets1: Sequence[Synset], synsets2: Sequence[Synset]) -> float:
+        """
+        :return: the maximum path similarity between any pair of synsets, or 0 if there are no pairs.
+        """
+        if len(synsets1) == 0 or len(synsets2) == 0:
+            return 0.0
+
+        return float(np.max(self.similarities(synsets1, synsets2)))
+
+    def similarities(self, synsets1: Sequence[Synset], synsets2: Sequence[Synset]) -> np.ndarray:
+        """
+        :return: a matrix of the path similarities of each synset in `synsets1` (rows) to each synset in `synsets2`
+                 (columns). Pairs with no path have a similarity of 0, rather than None.
+        """
+        seeds = self.seed_matrix(synsets2)
+        return self._similarities([self.closure(s) for s in synsets1], seeds)
+
+    def _similarities(self, closures: List[Closure], seeds: SeedMatrix) -> np.ndarray:
+        """
+        :return: the path similarities of each closure (rows) to each closure in the seed matrix (columns).
+        """
+        # Each closure starts with the column for nodes not in the seed closures, so that no segment is empty.
+        lengths = [len(c.node_ids) + 1 for c in closures]
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        node_ids = np.concatenate([np.concatenate([[-1], c.node_ids]) for c in closures])
+        distances = np.concatenate([np.concatenate([[0], c.distances]) for c in closures])
+
+        # The length of the paths through each common hypernym, and the shortest of these for each pair.
+        paths = seeds.distances[:, seeds.columns(node_ids)] + distances
+        shortest = np.minimum.reduceat(paths, starts, axis=1).T
+
+        root_distances = np.array([c.root_distance for c in closures], dtype=np.int32)
+        needs_root = np.array([c.needs_root for c in closures], dtype=bool)
+
+        if SYMMETRIC_ROOT:
+            use_root = needs_root[:, None] | seeds.needs_root[None, :]
+        else:
+            use_root = np.repeat(needs_root[:, None], len(seeds.root_distances), axis=1)
+
+        through_root = root_distances[:, None] + seeds.root_distances[None, :]
+        shortest = np.where(use_root, np.minimum(shortest, through_root), shortest)
+
+        return np.where(shortest >= NO_PATH, 0.0, 1.0 / (shortest + 1.0))
+
+    def seed_matrix(self, synsets: Sequence[Synset]) -> SeedMatrix:
+        """
+        :return: the closures of the synsets as a matrix. These are cached since the same seed words are compared to
+                 every input word.
+        """
+        return self._seed_matrix([s.name() for s in synsets], lambda: [self.closure(s) for s in synsets])
+
+    def _seed_matrix(self, names: List[str], closures: Callable[[], List[Closure]]) -> SeedMatrix:
+        """
+        :param closures: finds the closures of the synsets if the matrix is not cached.
+        :return: the matrix of the synsets with the names.
+        """
+        key = tuple(names)
+        matrix = self._seed_matrices.get(key)
+
+        if matrix is None:
+            matrix = SeedMatrix(closures())
+            self._seed_matrices[key] = matrix
+
+        return matrix
+
+    def closure(self, synset: Synset) -> Closure:
+        """
+        :return: the hypernym closure of the synset, found using a breadth first search of the hypernyms and instance
+                 hypernyms, as in `Synset.path_similarity`.
+        """
+        closure = self._closures.get(synset.name())
+        if closure is not None:
+            return closure
+
+        queue = deque([(synset, 0)])
+        path: Dict[str, int] = {}
+
+        while queue:
+            s, depth = queue.popleft()
+            if s.name() in path:
+                continue
+            path[s.name()] = depth
+
+            queue.extend((hyp, depth + 1) for hyp in s.hypernyms())
+            queue.extend((hyp, depth + 1) for hyp in s.instance_hypernyms())
+
+        node_ids = np.array([self._id(name) for name in path], dtype=np.int32)
+        distances = np.array(list(path.values()), dtype=np.int32)
+        # _needs_root depends on the POS and the version of WordNet.
+        closure = Closure(node_ids, distances, max(path.values()) + 1, synset._needs_root())
+
+        self._closures[synset.name()] = closure
+        return closure
+
+    def _subset_closure(self, synset_name: str, synset_id: int) -> Closure:
+        """
+        :return: the closure of the synset, read from the WordNet subset.
+        """
+        closure = self._closures.get(synset_name)
+        if closure is None:
+            closure = self.subset.closure(synset_id)
+            self._closures[synset_name] = closure
+        return closure
+
+    def _id(self, synset_name: str) -> int:
+        """
+        :return: the integer id of the synset.
+        """
+        return self._ids.setdefault(synset_name, len(self._ids))
+
+
+# The shared instance.
+path_similarity = PathSimilarity()
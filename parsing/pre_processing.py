@@ -1,8 +1,10 @@
+from parsing.vocabulary import vocabulary
 from typing import List
 
 
 def pre_process(text: str) -> List[str]:
     """
-    :return: takes the transcript of what the user said and turns it into a form that can be recognised by parsers.
+    :return: takes the transcript of what the user said and turns it into a form that can be recognised by parsers. Each
+             word is the vocabulary's string object for the word, so it is quick to compare to words in the grammar.
     """
-    return text.lower().split(' ')
\ No newline at end of file
+    return [vocabulary.intern(word) for word in text.lower().split(' ')]
@@ -0,0 +1,192 @@
+from typing import Any, Hashable, Optional
+import functools
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import numpy as np
+
+
+# Identifies a file as a shared cache, and the layout of its slots.
+MAGIC = 0x32434143484d4953  # 'SIMCHAC2'
+
+# The number of 64-bit words before the slots: the magic number, the capacity, and the version of the results.
+HEADER_WORDS = 4
+
+# The number of 64-bit words in each slot.
+SLOT_WORDS = 2
+
+
+class SharedSimilarityCache:
+    """
+    A fixed size hash table of similarities in a memory-mapped file, which is shared by all processes which open the
+    file, or are forked after it is opened. For example, every worker process can use the similarities computed by any
+    other worker.
+
+    Each slot is two 64-bit words. The first is a 64-bit fingerprint of the key, and the second holds another 32 bits
+    of the key's hash with the float32 similarity. A similarity is only returned if all 96 bits match, so the chance of
+    returning the similarity of another key is about `max_probes` in 2^96 for each lookup. The words are read and
+    written with aligned 8-byte memory accesses, without locks. A reader which sees a slot while another process is
+    writing it sees the fingerprint of one key and the rest of another, which do not match, so it only misses. If two
+    processes write to the same empty slot at once one entry is lost, which also only causes a cache miss.
+    """
+
+    def __init__(self, filename: str, capacity: int = 1 << 20, version: str = '', max_probes: int = 8):
+        """
+        :param capacity: the number of similarities the cache can hold. Rounded up to a power of 2. Each uses 16 bytes.
+        :param version: identifies the data the similarities were computed from, e.g. `snapshot_version()`. If the
+                        file was created with a different version or capacity it is replaced by an empty file.
+        :param max_probes: the number of slots after the slot of a key which are searched for the key. If they are all
+                           used by other keys, the entry in the key's slot is replaced.
+        """
+        self.capacity = 1 << max(0, capacity - 1).bit_length()
+        self.mask = self.capacity - 1
+        self.max_probes = min(max_probes, self.capacity)
+        self.version = int.from_bytes(hashlib.blake2b(version.encode(), digest_size=8).digest(), 'little')
+
+        self._mmap = self._open(filename)
+        if self._mmap is None:
+            self._mmap = self._replace(filename)
+
+        words = np.frombuffer(self._mmap, dtype=np.uint64)
+        self.header = words[:HEADER_WORDS]
+        self.slots = words[HEADER_WORDS:].reshape(self.capacity, SLOT_WORDS)
+
+    def _header(self) -> np.ndarray:
+        return np.array([MAGIC, self.capacity, self.version, 0], dtype=np.uint64)
+
+    def _size(self) -> int:
+        return (HEADER_WORDS + self.capacity * SLOT_WORDS) * 8
+
+    def _open(self, filename: str) -> Optional[mmap.mmap]:
+        """
+        :return: the mapping of the existing file, or None if there is no file, or it has a different layout, capacity,
+                 or version.
+        """
+        try:
+            fd = os.open(filename, os.O_RDWR)
+        except FileNotFoundError:
+            return None
+
+        try:
+            if os.fstat(fd).st_size != self._size():
+                return None
+            mapping = mmap.mmap(fd, self._size(), mmap.MAP_SHARED)
+        finally:
+            os.close(fd)
+
+        if not np.array_equal(np.frombuffer(mapping, dtype=np.uint64, count=HEADER_WORDS), self._header()):
+            mapping.close()
+            return None
+
+        return mapping
+
+    def _replace(self, filename: str) -> mmap.mmap:
+        """
+        :return: the mapping of a new empty file, which replaces the file. The file is created under another name and
+                 renamed, since other processes may still have the old file mapped, and shrinking a mapped file makes
+                 them crash when they read it. They keep using the old file until they open it again.
+        """
+        temporary = '{}.{}.tmp'.format(filename, os.getpid())
+        fd = os.open(temporary, os.O_RDWR | os.O_CREAT | os.O_TRUNC)
+        try:
+            os.ftruncate(fd, self._size())
+            mapping = mmap.mmap(fd, self._size(), mmap.MAP_SHARED)
+        finally:
+            os.close(fd)
+
+        np.frombuffer(mapping, dtype=np.uint64, count=HEADER_WORDS)[:] = self._header()
+        os.replace(temporary, filename)
+        return mapping
+
+    def get(self, key: Hashable) -> Optional[float]:
+        """
+        :return: the similarity of the key, or None if it is not in the cache.
+        """
+        index, fingerprint, check = self._hash(key)
+
+        for probe in range(self.max_probes):
+            slot = self.slots[(index + probe) & self.mask]
+            entry_fingerprint = int(slot[0])
+            if entry_fingerprint == 0:
+                return None
+            if entry_fingerprint == fingerprint:
+                entry = int(slot[1])
+                return _unpack_float(entry & 0xffffffff) if entry >> 32 == check else None
+
+        return None
+
+    def put(self, key: Hashable, similarity: float):
+        index, fingerprint, check = self._hash(key)
+        entry = np.uint64((check << 32) | _pack_float(similarity))
+
+        for probe in range(self.max_probes):
+            slot = self.slots[(index + probe) & self.mask]
+            existing = int(slot[0])
+            if existing == 0 or existing == fingerprint:
+                self._write(slot, fingerprint, entry)
+                return
+
+        # The memory used is bounded, so the entry in the key's slot is evicted.
+        self._write(self.slots[index], fingerprint, entry)
+
+    @staticmethod
+    def _write(slot: np.ndarray, fingerprint: int, entry: np.uint64):
+        # The fingerprint is written first, so a reader never sees an empty fingerprint with a similarity.
+        slot[0] = fingerprint
+        slot[1] = entry
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.slots[:, 0]))
+
+    def _hash(self, key: Hashable) -> (int, int, int):
+        """
+        :return: the slot of the key, its 64-bit fingerprint, which is never 0 as 0 marks an empty slot, and another
+                 32 bits of its hash. The hash is the same in every process, unlike `hash`.
+        """
+        digest = hashlib.blake2b(_key_bytes(key), digest_size=12).digest()
+        fingerprint = int.from_bytes(digest[:8], 'little') or 1
+        check = int.from_bytes(digest[8:], 'little')
+        return fingerprint & self.mask, fingerprint, check
+
+
+def _key_bytes(key: Hashable) -> bytes:
+    """
+    :return: the key as bytes, which are the same in every process.
+    """
+    return b'\0'.join(part.encode() if isinstance(part, str) else _object_bytes(part) for part in key)
+
+
+@functools.lru_cache(maxsize=None)
+def _object_bytes(part: Any) -> bytes:
+    """
+    :return: the pickled part of a key, e.g. a similarity measure, which is pickled by its name.
+    """
+    return pickle.dumps(part)
+
+
+def _pack_float(value: float) -> int:
+    return struct.unpack('<I', struct.pack('<f', value))[0]
+
+
+def _unpack_float(bits: int) -> float:
+    return struct.unpack('<f', struct.pack('<I', bits))[0]
+
+
+def float32(value: float) -> float:
+    """
+    :return: the value with the precision it has in the cache, so that results are the same whether they are computed
+             or read from the cache.
+    """
+    return _unpack_float(_pack_float(value))
+
+
+# The cache of semantic similarities shared with other processes, or None if the similarities are only cached by each
+# process.
+cache: Optional[SharedSimilarityCache] = None
+
+
+def use_shared_cache(shared_cache: Optional[SharedSimilarityCache]):
+    global cache
+    cache = shared_cache
@@ -0,0 +1,33 @@
+from parsing.parse_result import Word, Response
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class SimilarityBackend(ABC):
+    """
+    Compares the meaning of input words to the words in the grammar (seed words), e.g. using WordNet or word vectors.
+    Backends can be used as the `similarity_measure` of `semantic_similarity` and `word_meaning`.
+    """
+
+    @abstractmethod
+    def word_similarity(self, input_word: Word, seed_word: Word, pos: Optional[str]) -> Optional[Response]:
+        """
+        :param pos: the category of words (e.g. verbs) to compare the words as. Backends may ignore this.
+        :return: the semantic similarity of the words, or None if the backend cannot compare them. In which case
+                 `semantic_similarity` compares the WordNet synsets of the words using the backend's `max_similarity`,
+                 or by calling it with each pair of synsets, so only backends which compare synsets, e.g.
+                 `PathSimilarity`, may return None.
+        """
+
+
+# The backend used by `word_meaning` if a similarity measure is not given. If None, WordNet path similarity is used.
+# This must be set before the grammar is created, since each parser keeps the measure it was created with.
+default_backend: Optional[SimilarityBackend] = None
+
+
+def use_backend(backend: SimilarityBackend):
+    """
+    Sets the backend used to compare words by parsers created from now on.
+    """
+    global default_backend
+    default_backend = backend
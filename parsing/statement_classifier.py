@@ -0,0 +1,137 @@
+from parsing.parse_result import Word
+from parsing.pre_processing import pre_process
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+
+
+# The families of grammars `statement` chooses between.
+ACTION = 'action'
+QUESTION = 'question'
+CONVERSATION = 'conversation'
+FAMILIES = [ACTION, QUESTION, CONVERSATION]
+
+# A transcript, and the family of the statement it was parsed as.
+Example = Tuple[List[Word], str]
+
+
+def features(words: List[Word]) -> List[str]:
+    """
+    :return: the features of the transcript. These are the words (bag-of-words), the pairs of consecutive words, and the
+             first word, which is often a trigger for a question, e.g. 'where' or 'can'.
+    """
+    unigrams = ['w:' + word for word in words]
+    bigrams = ['b:{} {}'.format(w1, w2) for w1, w2 in zip(words, words[1:])]
+    first = ['first:' + words[0]] if words else []
+    return unigrams + bigrams + first
+
+
+class StatementClassifier:
+    """
+    A linear model which scores how likely a transcript is to be an action, question, or conversation, so `statement`
+    can skip parsing with the grammars of families which are very unlikely.
+    """
+
+    def __init__(self, feature_names: List[str], weights: np.ndarray, bias: np.ndarray):
+        """
+        :param weights: the weight of each feature (rows) for each family (columns), in the order of `FAMILIES`.
+        :param bias: the bias of each family.
+        """
+        self.feature_names = list(feature_names)
+        self.feature_ids: Dict[str, int] = {name: i for i, name in enumerate(self.feature_names)}
+        self.weights = weights
+        self.bias = bias
+
+    def scores(self, words: List[Word]) -> Optional[np.ndarray]:
+        """
+        :return: the probability of the transcript being each family, in the order of `FAMILIES`. None if the
+                 transcript has none of the features the classifier was trained with, so it cannot be classified.
+        """
+        ids = [self.feature_ids[f] for f in features(words) if f in self.feature_ids]
+        if not ids:
+            return None
+
+        return softmax(self.weights[ids].sum(axis=0) + self.bias)
+
+    def families(self, words: List[Word], margin: float) -> Set[str]:
+        """
+        :param margin: the minimum probability of a family for it to be parsed. The most likely family is always
+                       parsed.
+        :return: the families the transcript should be parsed with. All families if the transcript cannot be
+                 classified.
+        """
+        scores = self.scores(words)
+        if scores is None:
+            return set(FAMILIES)
+
+        return {family for family, score in zip(FAMILIES, scores) if score >= margin or score == scores.max()}
+
+    def save(self, filename: str):
+        np.savez(filename, feature_names=np.array(self.feature_names, dtype=str), weights=self.weights, bias=self.bias)
+
+    @staticmethod
+    def load(filename: str) -> 'StatementClassifier':
+        data = np.load(filename)
+        return StatementClassifier(list(data['feature_names']), data['weights'], data['bias'])
+
+
+def softmax(x: np.ndarray) -> np.ndarray:
+    e = np.exp(x - np.max(x, axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+def train(examples: List[Example], iterations: int = 300, learning_rate: float = 0.5,
+          regularisation: float = 1e-3) -> StatementClassifier:
+    """
+    Trains a multinomial logistic regression on the bag-of-words and trigger features of the examples, using gradient
+    descent.
+    :param regularisation: the L2 penalty on the weights, which stops single rare words deciding the family.
+    """
+    feature_names = sorted({f for words, _ in examples for f in features(words)})
+    feature_ids = {name: i for i, name in enumerate(feature_names)}
+
+    x = np.zeros((len(examples), len(feature_names)))
+    y = np.zeros((len(examples), len(FAMILIES)))
+
+    for i, (words, family) in enumerate(examples):
+        for f in features(words):
+            x[i, feature_ids[f]] += 1
+        y[i, FAMILIES.index(family)] = 1
+
+    weights = np.zeros((len(feature_names), len(FAMILIES)))
+    bias = np.zeros(len(FAMILIES))
+
+    for _ in range(iterations):
+        error = (softmax(x @ weights + bias) - y) / len(examples)
+        weights -= learning_rate * (x.T @ error + regularisation * weights)
+        bias -= learning_rate * error.sum(axis=0)
+
+    return StatementClassifier(feature_names, weights, bias)
+
+
+def examples_from_log(log_filename: str) -> List[Example]:
+    """
+    :return: the transcripts in the conversation log, labelled with the family they were parsed as. Transcripts that
+             could not be parsed are not included.
+    """
+    examples: List[Example] = []
+    transcript = None
+
+    with open(log_filename) as file:
+        for line in file:
+            event, _, status = line.strip().partition(': ')
+
+            if event == 'transcript':
+                transcript = status
+            elif transcript is None:
+                continue
+            elif event == 'conversation':
+                examples.append((pre_process(transcript), CONVERSATION))
+                transcript = None
+            elif event == 'sending to':
+                # Questions are sent to a different address to the other actions.
+                examples.append((pre_process(transcript), QUESTION if status == 'questions' else ACTION))
+                transcript = None
+            elif event in ('failure reply', 'partial reply'):
+                transcript = None
+
+    return examples
@@ -0,0 +1,53 @@
+from parsing.parse_result import Word
+from parsing.path_similarity import path_similarity
+from parsing.wordnet_subset import WordNetSubset
+from nltk.corpus import wordnet as wn
+from nltk.corpus.reader.wordnet import Synset
+from typing import Tuple, Optional, Set
+import functools
+
+
+# The words the grammar compares the meaning of input words to, and the category (POS) of words they are compared as.
+# These are registered when the parsers are created.
+seed_words: Set[Tuple[Word, Optional[str]]] = set()
+
+# The subset of WordNet extracted for the seed words and previously seen input words, if one has been loaded.
+subset: Optional[WordNetSubset] = None
+
+
+def register_seed_word(word: Word, pos: Optional[str]):
+    """
+    Adds the word to the seed words, so its synsets are looked up when the index is built rather than when the first
+    transcript is parsed.
+    """
+    seed_words.add((word, pos))
+
+
+@functools.lru_cache(maxsize=None)
+def synsets(word: Word, pos: Optional[str]) -> Tuple[Synset, ...]:
+    """
+    :param pos: the category of words (e.g. verbs) to find synsets in. If None, all categories are used.
+    :return: the synsets of the word, i.e. the different meanings of the word. These are looked up once for each word
+             and POS. Synsets are not saved in cache snapshots, since they reference the WordNet corpus reader.
+    """
+    return tuple(wn.synsets(word, pos=pos) if pos else wn.synsets(word))
+
+
+def use_subset(wordnet_subset: WordNetSubset):
+    """
+    Compares the meanings of words in the subset using the subset, so the full WordNet is only loaded if a word outside
+    the subset is parsed.
+    """
+    global subset
+    subset = wordnet_subset
+    path_similarity.use_subset(wordnet_subset)
+
+
+def build_synset_index():
+    """
+    Looks up the synsets of all the registered seed words, so they are not looked up while parsing. Seed words in the
+    WordNet subset are skipped, since looking them up would load the full WordNet.
+    """
+    for word, pos in seed_words:
+        if subset is None or subset.synset_ids(word, pos) is None:
+            synsets(word, pos)
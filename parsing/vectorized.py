@@ -0,0 +1,42 @@
+from parsing.parse_result import Word, Response
+from typing import Callable, List, Union
+import numpy as np
+
+
+class Vectorized:
+    """
+    A condition which gives the responses of a list of words at once, as an array, rather than one word at a time.
+    """
+
+    def __init__(self, responses: Callable[[List[Word]], np.ndarray]):
+        """
+        :param responses: gives the response to each word in the list.
+        """
+        self.responses = responses
+
+    def __call__(self, word: Word) -> Response:
+        """
+        :return: the response to a single word, so the condition can also be used as a scalar condition.
+        """
+        return float(self.responses([word])[0])
+
+
+def vectorized(responses: Callable[[List[Word]], np.ndarray]) -> Vectorized:
+    """
+    A decorator which marks a function of a list of words as a vectorized condition.
+    """
+    return Vectorized(responses)
+
+
+def as_vectorized(condition: Union[Vectorized, Callable[[Word], Response]]) -> Vectorized:
+    """
+    :return: the condition if it is vectorized, otherwise a vectorized condition which calls the scalar condition on
+             each word.
+    """
+    if isinstance(condition, Vectorized):
+        return condition
+
+    def responses(words: List[Word]) -> np.ndarray:
+        return np.fromiter((condition(word) for word in words), dtype=float, count=len(words))
+
+    return Vectorized(responses)
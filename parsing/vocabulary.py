@@ -0,0 +1,52 @@
+from parsing.parse_result import Word
+from typing import Dict, List, Tuple
+from threading import Lock
+import sys
+
+
+class Vocabulary:
+    """
+    Gives each word a single (interned) string object. Words in the grammar, e.g. the words matched by `word_match`, are
+    added when the parsers are created. Input words are replaced by the vocabulary's string object for the word, so
+    comparing an input word to a grammar word with `==` finds they are the same object without comparing their
+    characters, and the hash of each word is only computed once.
+
+    Words which are not in the grammar are interned with `sys.intern`, which only keeps a word while it is used, so the
+    words heard do not grow the vocabulary.
+    """
+
+    def __init__(self):
+        # The string object of each word in the grammar.
+        self.words: Dict[Word, Word] = {}
+        # Grammars are created while other transcripts are being parsed, e.g. in the thread pool.
+        self._lock = Lock()
+
+    def add(self, word: Word) -> Word:
+        """
+        Adds the word to the grammar's vocabulary.
+        :return: the vocabulary's string object for the word.
+        """
+        existing = self.words.get(word)
+        if existing is not None:
+            return existing
+
+        with self._lock:
+            return self.words.setdefault(word, sys.intern(word))
+
+    def intern(self, word: Word) -> Word:
+        """
+        :return: the vocabulary's string object for the word, or the interned word if it is not in the grammar.
+        """
+        existing = self.words.get(word)
+        return existing if existing is not None else sys.intern(word)
+
+    def key(self, words: List[Word]) -> Tuple[Word, ...]:
+        """
+        :return: identifies the sequence of words, e.g. to cache the results of parsing them. The hashes of the words
+                 are cached by the strings, so hashing the key only combines them.
+        """
+        return tuple(words)
+
+
+# The vocabulary of the grammar.
+vocabulary = Vocabulary()
@@ -0,0 +1,131 @@
+from parsing.parser import Parser
+from parsing.pre_processing import pre_process
+from parsing.annotation import annotated, columns
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+import ast
+import collections
+import glob
+import os
+import sys
+
+
+# The tests of the grammar, whose transcripts are the corpus. They are what players say to the spy, so they warm the
+# cache entries that real transcripts use.
+GRAMMAR_TESTS = os.path.join('tests', 'parsing', 'test_parse_*.py')
+
+
+def primitive_words(key: Hashable) -> List[Tuple[str, Optional[str]]]:
+    """
+    :param key: the key a primitive parser is registered with, see `predicate`.
+    :return: the words the primitive responds to most strongly, and the part of speech their meaning is compared with.
+             Empty for primitives which do not respond to specific words, e.g. `word_tagged`.
+    """
+    kind = key[0]
+
+    if kind in ('word_match', 'word_spelling'):
+        return [(key[1], None)]
+    if kind == 'word_meaning':
+        return [(key[1], key[2])]
+
+    return []
+
+
+def generate_corpus(pattern: str = GRAMMAR_TESTS) -> List[str]:
+    """
+    :param pattern: the files of the tests to take the transcripts from.
+    :return: the transcripts given to `pre_process` in the tests, in order, without duplicates.
+    """
+    corpus: Dict[str, None] = {}
+
+    for filename in sorted(glob.glob(pattern)):
+        with open(filename) as file:
+            tree = ast.parse(file.read(), filename)
+
+        calls = sorted((node for node in ast.walk(tree) if isinstance(node, ast.Call)),
+                       key=lambda node: (node.lineno, node.col_offset))
+        for node in calls:
+            if isinstance(node.func, ast.Name) and node.func.id == 'pre_process' and node.args:
+                transcript = _literal(node.args[0])
+                if isinstance(transcript, str) and transcript.strip():
+                    corpus[transcript] = None
+
+    return list(corpus)
+
+
+def _literal(node: ast.AST) -> Optional[object]:
+    """
+    :return: the value of the node if it is a literal, e.g. a string, otherwise None.
+    """
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        return None
+
+
+def read_corpus(filename: str) -> List[str]:
+    """
+    :return: the transcripts in the file, one per line.
+    """
+    with open(filename) as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def write_corpus(filename: str, corpus: List[str]):
+    with open(filename, 'w') as file:
+        file.writelines(transcript + '\n' for transcript in corpus)
+
+
+def warm_up(parser: Parser, transcripts: List[str], progress: Callable[[float], None] = None,
+            min_response: float = 0.9) -> Set[Hashable]:
+    """
+    Parses each transcript, filling the lexical caches.
+    :param progress: called with the fraction of the transcripts parsed so far.
+    :param min_response: the minimum response of a primitive to a word for the primitive to have been exercised.
+    :return: the keys of the primitives which were exercised by the transcripts.
+    """
+    exercised_columns: Set[int] = set()
+
+    for i, transcript in enumerate(transcripts):
+        words = pre_process(transcript)
+        with annotated(words) as annotation:
+            parser.parse(words)
+
+        # Only the responses read by the parser are computed.
+        exercised_columns.update(column for row in annotation.rows.values()
+                                 for column, response in row.items() if response >= min_response)
+
+        if progress:
+            progress((i + 1) / len(transcripts))
+
+    return {key for key, column in columns.items() if column in exercised_columns}
+
+
+def coverage_report(exercised: Set[Hashable]) -> str:
+    """
+    :return: the number of primitives of each kind which were exercised, and the words of those which were not.
+    """
+    total = collections.Counter(key[0] for key in columns)
+    covered = collections.Counter(key[0] for key in exercised)
+    lines = []
+
+    for kind in sorted(total):
+        missed = sorted({word for key in columns if key[0] == kind and key not in exercised
+                         for word, _ in primitive_words(key)})
+        lines.append('{}: {}/{} exercised'.format(kind, covered[kind], total[kind]))
+        if missed:
+            lines.append('    not exercised: ' + ', '.join(missed))
+
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    filenames = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    filename = filenames[0] if filenames else 'warmup_corpus.txt'
+    corpus = generate_corpus()
+    write_corpus(filename, corpus)
+    print('Wrote {} transcripts to {}'.format(len(corpus), filename))
+
+    if '--coverage' in sys.argv:
+        # Creating the grammar registers all of its primitives.
+        from parsing.parse_action import statement
+        print(coverage_report(warm_up(statement(), corpus)))
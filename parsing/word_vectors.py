@@ -0,0 +1,131 @@
+from parsing.parse_result import Word, Response
+from parsing.similarity_backend import SimilarityBackend
+from parsing.synset_index import seed_words
+from typing import Dict, Iterable, List, Optional
+import os
+import numpy as np
+
+
+# The files word vectors are saved to in their directory. The vectors are a matrix with a row for each word, saved so
+# it can be memory mapped. The words are saved one per line, in the same order as the rows.
+VECTORS_FILE = 'vectors.npy'
+WORDS_FILE = 'words.txt'
+
+
+def save_word_vectors(directory: str, words: List[Word], vectors: np.ndarray):
+    """
+    Saves the vectors of the words to the directory, so they can be loaded by `VectorSimilarity`.
+    """
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, VECTORS_FILE), vectors.astype(np.float32))
+
+    with open(os.path.join(directory, WORDS_FILE), 'w') as file:
+        file.write('\n'.join(words))
+
+
+def convert_text_vectors(text_filename: str, directory: str):
+    """
+    Converts word vectors in the text format used by GloVe and word2vec (a word followed by its vector on each line) to
+    the format loaded by `VectorSimilarity`.
+    """
+    words: List[Word] = []
+    vectors: List[List[float]] = []
+
+    with open(text_filename, encoding='utf8') as file:
+        for line in file:
+            values = line.rstrip().split(' ')
+            # word2vec files start with the number of words and the dimension of the vectors.
+            if len(values) <= 2:
+                continue
+            words.append(values[0])
+            vectors.append([float(v) for v in values[1:]])
+
+    save_word_vectors(directory, words, np.array(vectors))
+
+
+class VectorSimilarity(SimilarityBackend):
+    """
+    Compares the meaning of words using the cosine similarity of their word vectors, instead of WordNet. The vectors are
+    memory mapped, so only the vectors of the seed words and input words are read. Each input word is compared to
+    all the seed words at once, using one matrix-vector product.
+
+    The category (POS) of words is ignored, since words only have one vector. Words without a vector have a similarity
+    of 0 to every word.
+    """
+
+    def __init__(self, directory: str):
+        """
+        :param directory: the directory the vectors were saved to by `save_word_vectors`.
+        """
+        self.directory = directory
+        self.vectors = np.load(os.path.join(directory, VECTORS_FILE), mmap_mode='r')
+
+        with open(os.path.join(directory, WORDS_FILE)) as file:
+            self.rows: Dict[Word, int] = {word: row for row, word in enumerate(file.read().split('\n'))}
+
+        # The column of each seed word in the results of comparing an input word.
+        self._seed_columns: Dict[Word, int] = {}
+        # The normalised vectors of the seed words, with a row of zeros for seed words without a vector.
+        self._seed_matrix = np.zeros((0, self.vectors.shape[1]), dtype=np.float32)
+        # The similarity of input words to all the seed words.
+        self._input_similarities: Dict[Word, np.ndarray] = {}
+
+    def __reduce__(self):
+        # Lexical caches contain the backend, so it is pickled by the directory rather than the vectors.
+        return VectorSimilarity, (self.directory,)
+
+    def __eq__(self, other):
+        return isinstance(other, VectorSimilarity) and self.directory == other.directory
+
+    def __hash__(self):
+        return hash(self.directory)
+
+    def word_similarity(self, input_word: Word, seed_word: Word, pos: Optional[str]) -> Response:
+        """
+        :return: the cosine similarity of the words' vectors. Words with opposite meanings have a similarity of 0
+                 rather than being negative.
+        """
+        if seed_word not in self._seed_columns:
+            self.update_seed_words([seed_word])
+
+        similarity = self.similarities(input_word)[self._seed_columns[seed_word]]
+        return max(float(similarity), 0.0)
+
+    def similarities(self, input_word: Word) -> np.ndarray:
+        """
+        :return: the cosine similarity of the input word to each of the seed words.
+        """
+        similarities = self._input_similarities.get(input_word)
+
+        if similarities is None:
+            vector = self.vector(input_word)
+            similarities = self._seed_matrix @ vector
+            self._input_similarities[input_word] = similarities
+
+        return similarities
+
+    def update_seed_words(self, extra_words: Iterable[Word] = ()):
+        """
+        Adds the seed words registered by the grammar, and any extra words, to the matrix the input words are compared
+        to. The similarities of the input words are found again when they are next compared.
+        """
+        words = {word for word, _ in seed_words} | set(extra_words)
+        new_words = sorted(words - set(self._seed_columns))
+
+        for word in new_words:
+            self._seed_columns[word] = len(self._seed_columns)
+
+        self._seed_matrix = np.concatenate([self._seed_matrix] + [self.vector(word)[None, :] for word in new_words])
+        self._input_similarities = {}
+
+    def vector(self, word: Word) -> np.ndarray:
+        """
+        :return: the normalised vector of the word, or zeros if the word has no vector.
+        """
+        row = self.rows.get(word)
+        if row is None:
+            return np.zeros(self.vectors.shape[1], dtype=np.float32)
+
+        vector = np.array(self.vectors[row], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
@@ -0,0 +1,131 @@
+from parsing.parse_result import Word
+from parsing.path_similarity import Closure, PathSimilarity
+from parsing.cache_snapshot import update_nltk_version
+from nltk.corpus import wordnet as wn
+from typing import Iterable, List, Optional, Tuple
+import hashlib
+import os
+import shutil
+import numpy as np
+
+
+# The arrays a subset is made from. Each is saved as a .npy file in the subset's directory, so it can be memory mapped.
+ARRAYS = ['version', 'names', 'words', 'word_offsets', 'word_synsets',
+          'closure_offsets', 'closure_nodes', 'closure_distances', 'root_distances', 'needs_root']
+
+
+def subset_version() -> str:
+    """
+    :return: identifies the WordNet data a subset is extracted from. Unlike cache snapshots, subsets do not depend on
+             the grammar, since words not in the subset are looked up in the full WordNet.
+    """
+    version = hashlib.sha1()
+    update_nltk_version(version, ['corpora/wordnet'])
+    return version.hexdigest()
+
+
+def word_key(word: Word, pos: Optional[str]) -> str:
+    """
+    :return: the key the synsets of the word in the category (POS) are stored under.
+    """
+    return '{}\t{}'.format(word, pos or '')
+
+
+class WordNetSubset:
+    """
+    The synsets of a set of words, and the hypernym closures of the synsets, extracted from WordNet and stored as
+    memory mapped arrays. This is much faster to load than the full WordNet corpus.
+
+    Synsets are identified by their index in `names`. The synsets of word i are `word_synsets[word_offsets[i]:
+    word_offsets[i+1]]`, and the closure of synset j is stored the same way using `closure_offsets`.
+    """
+
+    def __init__(self, directory: str):
+        """
+        :param directory: the directory the subset was saved to by `build_subset`.
+        """
+        for name in ARRAYS:
+            setattr(self, name, np.load(os.path.join(directory, name + '.npy'), mmap_mode='r'))
+
+    def synset_ids(self, word: Word, pos: Optional[str]) -> Optional[np.ndarray]:
+        """
+        :return: the ids of the synsets of the word, in the same order as `wn.synsets`, or None if the word is not in
+                 the subset.
+        """
+        key = word_key(word, pos)
+        index = np.searchsorted(self.words, key)
+
+        if index == len(self.words) or self.words[index] != key:
+            return None
+
+        return self.word_synsets[self.word_offsets[index]:self.word_offsets[index + 1]]
+
+    def closure(self, synset_id: int) -> Closure:
+        """
+        :return: the hypernym closure of the synset, where the nodes are the ids of synsets in the subset.
+        """
+        start, end = self.closure_offsets[synset_id], self.closure_offsets[synset_id + 1]
+        return Closure(np.array(self.closure_nodes[start:end]),
+                       np.array(self.closure_distances[start:end]),
+                       int(self.root_distances[synset_id]),
+                       bool(self.needs_root[synset_id]))
+
+
+def build_subset(directory: str, words: Iterable[Tuple[Word, Optional[str]]]):
+    """
+    Extracts the synsets of the words, and the synsets in their hypernym closures, from the full WordNet and saves
+    them to the directory. The directory is replaced once the subset has been written, so a subset being built is
+    never loaded.
+    :param words: the words, and the categories (POS) their synsets are looked up in, e.g. the grammar's seed words and
+                  the input words seen while filling the cache.
+    """
+    # Used to find the closures, and give each synset in any closure an id.
+    closures = PathSimilarity()
+    word_synsets: List[Tuple[str, List[int]]] = []
+
+    for word, pos in set(words):
+        synsets = wn.synsets(word, pos=pos) if pos else wn.synsets(word)
+        for synset in synsets:
+            closures.closure(synset)
+        word_synsets.append((word_key(word, pos), [closures._id(s.name()) for s in synsets]))
+
+    word_synsets.sort()
+    names = sorted(closures._ids, key=closures._ids.get)
+    closures_by_id = [closures._closures.get(name) for name in names]
+
+    arrays = {
+        'version': np.array(subset_version()),
+        'names': np.array(names, dtype=str),
+        'words': np.array([key for key, _ in word_synsets], dtype=str),
+        'word_offsets': np.cumsum([0] + [len(ids) for _, ids in word_synsets]).astype(np.int32),
+        'word_synsets': np.array([i for _, ids in word_synsets for i in ids], dtype=np.int32),
+        # Only the synsets of the words have closures, the other synsets are only hypernyms.
+        'closure_offsets': np.cumsum([0] + [len(c.node_ids) if c else 0 for c in closures_by_id]).astype(np.int32),
+        'closure_nodes': np.array([i for c in closures_by_id if c for i in c.node_ids], dtype=np.int32),
+        'closure_distances': np.array([d for c in closures_by_id if c for d in c.distances], dtype=np.int32),
+        'root_distances': np.array([c.root_distance if c else 0 for c in closures_by_id], dtype=np.int32),
+        'needs_root': np.array([c.needs_root if c else False for c in closures_by_id], dtype=bool)
+    }
+
+    temp_directory = directory + '.tmp'
+    shutil.rmtree(temp_directory, ignore_errors=True)
+    os.makedirs(temp_directory)
+
+    for name, array in arrays.items():
+        np.save(os.path.join(temp_directory, name + '.npy'), array)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(temp_directory, directory)
+
+
+def load_subset(directory: str) -> Optional[WordNetSubset]:
+    """
+    :return: the subset saved to the directory, or None if there is no subset or it was extracted from different
+             WordNet data.
+    """
+    try:
+        subset = WordNetSubset(directory)
+    except (OSError, ValueError):
+        return None
+
+    return subset if str(subset.version[()]) == subset_version() else None
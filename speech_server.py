@@ -1,12 +1,16 @@
-from app import app, socketio, GAME_MODE, FILL_CACHE, preload
+from app import app, socketio, GAME_MODE, FILL_CACHE, PREFORK_WORKERS, preload_in_background, preload_for_fork
 
 
 print('GAME MODE:', GAME_MODE)
 print('FILL_CACHE:', FILL_CACHE)
 
-# Filling the cache takes a long time as all the tests have to run.
-preload(fill_cache=FILL_CACHE)
-print("Done Cache")
+# Filling the cache takes a long time as the warmup corpus has to be parsed, unless the cache is restored from a
+# snapshot. With several workers this happens once before they are forked (see gunicorn.conf.py). Otherwise it happens
+# in the background so the server can report its progress at /ready.
+if PREFORK_WORKERS:
+    preload_for_fork(fill_cache=FILL_CACHE)
+else:
+    preload_in_background(fill_cache=FILL_CACHE)
 
 
 if __name__ == '__main__':
@@ -14,4 +18,4 @@ if __name__ == '__main__':
     socketio.run(app, host='0.0.0.0', port=8080, debug=True)
 
 
-# sudo gunicorn --certfile=cert.pem --keyfile=key.pem --worker-class=eventlet -w 1 -b 0.0.0.0:443 -t 36000 speech_server:app
+# sudo gunicorn -c gunicorn.conf.py --certfile=cert.pem --keyfile=key.pem -b 0.0.0.0:443 speech_server:app
@@ -1,5 +1,7 @@
 import unittest
-from actions.location import Absolute, Directional, MoveDirection, Distance
+import pickle
+from functools import partial
+from actions.location import Absolute, Directional, MoveDirection, Distance, Positional
 from actions.move import Move, Speed, ThroughDoor, ObjectRelativeDirection
 from actions.action import Composite
 
@@ -28,4 +30,42 @@ class TestMovePostProcessing(unittest.TestCase):
         move = Move(Speed.NORMAL, loc, None)
 
         expected = Composite([move, ThroughDoor(ObjectRelativeDirection.VICINITY)])
-        self.assertEqual(move.post_processed(), expected)
\ No newline at end of file
+        self.assertEqual(move.post_processed(), expected)
+
+
+class TestValues(unittest.TestCase):
+    def test_equal_hashes(self):
+        move1 = Move(Speed.NORMAL, Directional(MoveDirection.FORWARDS, Distance.MEDIUM), None)
+        move2 = Move(Speed.NORMAL, Directional(MoveDirection.FORWARDS, Distance.MEDIUM), None)
+
+        self.assertEqual(move1, move2)
+        self.assertEqual(hash(move1), hash(move2))
+        self.assertEqual(len({move1, move2}), 1)
+
+    def test_not_equal(self):
+        self.assertNotEqual(Absolute('room'), Absolute('lab'))
+        self.assertNotEqual(ThroughDoor(MoveDirection.LEFT), ThroughDoor(MoveDirection.RIGHT))
+
+    def test_composite_hashable(self):
+        composite = Composite([ThroughDoor(MoveDirection.LEFT), ThroughDoor(MoveDirection.RIGHT)])
+        self.assertEqual(hash(composite), hash(Composite([ThroughDoor(MoveDirection.LEFT), ThroughDoor(MoveDirection.RIGHT)])))
+
+    def test_immutable(self):
+        loc = Absolute('room')
+
+        with self.assertRaises(AttributeError):
+            loc.place_name = 'lab'
+
+        with self.assertRaises(AttributeError):
+            loc.other = 'lab'
+
+    def test_slotted(self):
+        self.assertFalse(hasattr(Move(Speed.NORMAL, Absolute('room'), None), '__dict__'))
+
+    def test_pickle(self):
+        move = Move(Speed.NORMAL, Absolute('room'), None)
+        self.assertEqual(pickle.loads(pickle.dumps(move)), move)
+
+    def test_partial_init(self):
+        make_positional = partial(Positional.partial_init(), 'door')
+        self.assertEqual(make_positional(2, MoveDirection.LEFT), Positional('door', 2, MoveDirection.LEFT))
@@ -0,0 +1,60 @@
+import unittest
+from interface.load_controller import LoadController
+from parsing.grammar_profile import FULL, SPELLING, EXACT
+
+
+class LoadControllerTestCase(unittest.TestCase):
+    def controller(self) -> LoadController:
+        return LoadController(thresholds=[(2, 0.5), (4, 1.0)], recovery=0.5, smoothing=1.0)
+
+    def test_full_without_load(self):
+        assert self.controller().profile() == FULL
+
+    def test_degrades_with_queue_depth(self):
+        controller = self.controller()
+        controller.queue_depth = 3
+        assert controller.profile() == SPELLING
+        controller.queue_depth = 5
+        assert controller.profile() == EXACT
+
+    def test_degrades_with_latency(self):
+        controller = self.controller()
+        controller.observe(0.6)
+        assert controller.profile() == SPELLING
+        controller.observe(1.5)
+        assert controller.profile() == EXACT
+
+    def test_recovers_when_load_drops(self):
+        controller = self.controller()
+        controller.queue_depth = 5
+        controller.profile()
+
+        # Still above half the threshold of the exact profile.
+        controller.queue_depth = 3
+        assert controller.profile() == EXACT
+
+        controller.queue_depth = 0
+        assert controller.profile() == FULL
+
+    def test_counts_requests(self):
+        controller = self.controller()
+        with controller.request():
+            with controller.request():
+                assert controller.queue_depth == 2
+        assert controller.queue_depth == 0
+
+    def test_degrades_with_backlog(self):
+        backlog = 0
+        controller = LoadController(thresholds=[(2, 0.5), (4, 1.0)], backlog=lambda: backlog)
+
+        with controller.request():
+            backlog = 2
+            assert controller.profile() == SPELLING
+            backlog = 4
+            assert controller.profile() == EXACT
+
+    def test_smooths_latency(self):
+        controller = LoadController(smoothing=0.5)
+        controller.observe(1.0)
+        controller.observe(1.0)
+        assert controller.latency == 0.75
@@ -0,0 +1,101 @@
+import unittest
+from threading import Thread
+from interface.metrics import Metrics, metrics
+from interface.speech_responder import SpeechResponder
+from parsing.parser import word_match
+
+
+class MetricsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics(buckets=[0.1, 1.0])
+
+    def test_observe_buckets(self):
+        self.metrics.observe('parse', 0.05)
+        self.metrics.observe('parse', 0.5)
+        self.metrics.observe('parse', 5.0)
+
+        total = self.metrics.collect()
+        assert total.histograms['parse'] == [1, 1, 1]
+        self.assertAlmostEqual(total.sums['parse'], 5.55)
+
+    def test_increment(self):
+        self.metrics.increment('success_parses')
+        self.metrics.increment('success_parses', 2)
+
+        assert self.metrics.collect().counters == {'success_parses': 3}
+
+    def test_timed(self):
+        with self.metrics.timed('speech'):
+            pass
+
+        assert sum(self.metrics.collect().histograms['speech']) == 1
+
+    def test_collects_threads(self):
+        def record():
+            self.metrics.increment('success_parses')
+            self.metrics.observe('parse', 0.5)
+
+        threads = [Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.metrics.increment('success_parses')
+
+        total = self.metrics.collect()
+        assert total.counters['success_parses'] == 5
+        assert total.histograms['parse'] == [0, 4, 0]
+        # The metrics of the finished threads are kept after they are collected once.
+        assert self.metrics.collect().counters['success_parses'] == 5
+
+    def test_collects_while_recording(self):
+        recording = True
+
+        def record():
+            i = 0
+            while recording:
+                self.metrics.increment('counter{}'.format(i % 1000))
+                self.metrics.observe('stage{}'.format(i % 1000), 0.5)
+                i += 1
+
+        thread = Thread(target=record)
+        thread.start()
+        try:
+            for _ in range(200):
+                self.metrics.collect()
+        finally:
+            recording = False
+            thread.join()
+
+    def test_one_entry_per_thread(self):
+        for _ in range(10):
+            self.metrics.increment('success_parses')
+
+        assert len(self.metrics._threads) == 1
+
+    def test_exposition(self):
+        self.metrics.observe('parse', 0.5)
+        self.metrics.increment('failure_parses')
+
+        text = self.metrics.exposition()
+        assert 'command_parsing_stage_seconds_bucket{stage="parse",le="0.1"} 0' in text
+        assert 'command_parsing_stage_seconds_bucket{stage="parse",le="1.0"} 1' in text
+        assert 'command_parsing_stage_seconds_bucket{stage="parse",le="+Inf"} 1' in text
+        assert 'command_parsing_stage_seconds_count{stage="parse"} 1' in text
+        assert 'command_parsing_failure_parses_total 1' in text
+        assert '# TYPE command_parsing_cache_hit_rate gauge' in text
+
+
+class SpeechResponderMetricsTestCase(unittest.TestCase):
+    def test_records_parse(self):
+        before = metrics.collect()
+        responder = SpeechResponder(word_match('hello'), lambda game_resp, action: 'success', lambda t: 'partial',
+                                    lambda _: 'failure')
+        responder.parse('hello')
+        responder.parse('world')
+        after = metrics.collect()
+
+        assert after.counters['success_parses'] - before.counters.get('success_parses', 0) == 1
+        assert after.counters['failure_parses'] - before.counters.get('failure_parses', 0) == 1
+        assert sum(after.histograms['parse']) - sum(before.histograms.get('parse', [])) == 2
@@ -0,0 +1,31 @@
+import unittest
+import gc
+from interface.prefork import before_loading, before_fork, after_fork
+
+
+class PreforkTestCase(unittest.TestCase):
+    def tearDown(self):
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+        gc.enable()
+
+    def test_collection_disabled_while_loading(self):
+        before_loading()
+        assert not gc.isenabled()
+
+    @unittest.skipUnless(hasattr(gc, 'freeze'), 'gc.freeze requires Python 3.7')
+    def test_frozen_before_fork(self):
+        before_loading()
+        before_fork()
+        assert gc.get_freeze_count() > 0
+
+    def test_collection_enabled_in_parent_after_freezing(self):
+        before_loading()
+        before_fork()
+        assert gc.isenabled()
+
+    def test_collection_enabled_after_fork(self):
+        before_loading()
+        before_fork()
+        after_fork()
+        assert gc.isenabled()
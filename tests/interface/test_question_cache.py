@@ -0,0 +1,38 @@
+import unittest
+from interface.question_cache import QuestionCache
+from actions.question import LocationQuestion, InventoryContentsQuestion, GuardsQuestion
+
+
+class QuestionCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.time = 0.0
+        self.cache = QuestionCache(ttl=2.0, clock=lambda: self.time)
+
+    def test_reuses_response(self):
+        self.cache.put('player', LocationQuestion(), {'location': 'lab'})
+        assert self.cache.get('player', LocationQuestion()) == {'location': 'lab'}
+
+    def test_responses_expire(self):
+        self.cache.put('player', LocationQuestion(), {'location': 'lab'})
+        self.time = 2.0
+        assert self.cache.get('player', LocationQuestion()) is None
+
+    def test_responses_kept_per_session(self):
+        self.cache.put('player', LocationQuestion(), {'location': 'lab'})
+        assert self.cache.get('other', LocationQuestion()) is None
+
+    def test_responses_kept_per_question(self):
+        self.cache.put('player', LocationQuestion(), {'location': 'lab'})
+        assert self.cache.get('player', InventoryContentsQuestion()) is None
+
+    def test_does_not_cache_changing_answers(self):
+        self.cache.put('player', GuardsQuestion(), {'num_guards': 1})
+        assert self.cache.get('player', GuardsQuestion()) is None
+
+    def test_invalidates_session(self):
+        self.cache.put('player', LocationQuestion(), {'location': 'lab'})
+        self.cache.put('other', LocationQuestion(), {'location': 'kitchen'})
+        self.cache.invalidate('player')
+
+        assert self.cache.get('player', LocationQuestion()) is None
+        assert self.cache.get('other', LocationQuestion()) == {'location': 'kitchen'}
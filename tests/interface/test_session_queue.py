@@ -0,0 +1,117 @@
+import unittest
+from interface.session_queue import SessionQueue, SessionQueues
+from typing import List
+import time
+
+
+class SessionQueueTestCase(unittest.TestCase):
+    def queue(self, arriving: List[str], **kwargs) -> SessionQueue:
+        """
+        :param arriving: the requests which arrive while the first request is waiting to be responded to. Those starting
+                         with 'interim ' are prepared.
+        :return: a queue which responds to a request with the request in upper case, and records the replies in
+                 `self.replies`.
+        """
+        self.replies = []
+        self.rejected = []
+        self.prepared = []
+
+        def pause(seconds: float):
+            while arriving:
+                request = arriving.pop(0)
+                if request.startswith('interim '):
+                    queue.prepare(request[len('interim '):])
+                elif not queue.submit(request, self.replies.append):
+                    self.rejected.append(request)
+
+        queue = SessionQueue(lambda request: request.upper(), pause=pause, prepare=self.prepared.append, **kwargs)
+        return queue
+
+    def test_responds_to_request(self):
+        queue = self.queue([])
+        assert queue.submit('go', self.replies.append)
+        assert self.replies == ['GO']
+
+    def test_supersedes_waiting_requests(self):
+        queue = self.queue(['turn', 'hide'])
+        queue.submit('go', self.replies.append)
+        assert self.replies == ['HIDE']
+
+    def test_responds_in_order_without_superseding(self):
+        queue = self.queue(['turn', 'hide'], supersede=False)
+        queue.submit('go', self.replies.append)
+        assert self.replies == ['GO', 'TURN', 'HIDE']
+
+    def test_rejects_when_full(self):
+        queue = self.queue(['turn', 'hide', 'run'], supersede=False, max_pending=2)
+        queue.submit('go', self.replies.append)
+
+        assert self.rejected == ['hide', 'run']
+        assert self.replies == ['GO', 'TURN']
+
+    def test_urgent_request_skips_waiting(self):
+        queue = self.queue(['turn', 'stop'], supersede=False, is_urgent=lambda request: request == 'stop')
+        queue.submit('go', self.replies.append)
+        assert self.replies == ['STOP']
+
+    def test_responds_to_requests_after_urgent(self):
+        queue = self.queue(['stop', 'turn'], supersede=False, is_urgent=lambda request: request == 'stop')
+        queue.submit('go', self.replies.append)
+        assert self.replies == ['STOP', 'TURN']
+
+
+    def test_prepares_newest(self):
+        queue = self.queue(['interim go to', 'interim go to the'])
+        queue.prepare('go')
+
+        assert self.prepared == ['go to the']
+
+    def test_responds_before_preparing(self):
+        queue = self.queue(['go left', 'interim turn'])
+        queue.prepare('go')
+
+        assert self.replies == ['GO LEFT']
+        assert self.prepared == ['turn']
+
+    def test_request_drops_preparation(self):
+        queue = self.queue([])
+        queue._preparing = 'go to'
+        queue.submit('go to the door', self.replies.append)
+
+        assert self.prepared == []
+
+    def test_waits_between_preparing(self):
+        queue = SessionQueue(lambda request: request, prepare=lambda request: None, prepare_interval=0.05)
+        start = time.perf_counter()
+        queue.prepare('go')
+        queue.prepare('go to')
+
+        assert time.perf_counter() - start >= 0.05
+
+
+class SessionQueuesTestCase(unittest.TestCase):
+    def test_queue_per_session(self):
+        queues = SessionQueues(lambda session: SessionQueue(lambda request: request))
+        assert queues['a'] is queues['a']
+        assert queues['a'] is not queues['b']
+
+    def test_removes_queue(self):
+        queues = SessionQueues(lambda session: SessionQueue(lambda request: request))
+        queue = queues['a']
+        queues.remove('a')
+        assert queues['a'] is not queue
+
+    def test_pending(self):
+        pending = []
+
+        def process(request):
+            if request == 'first':
+                queues['a'].submit('second', lambda response: None)
+                pending.append(queues.pending())
+            return request
+
+        queues = SessionQueues(lambda session: SessionQueue(process, supersede=False))
+        queues['a'].submit('first', lambda response: None)
+
+        assert pending == [1]
+        assert queues.pending() == 0
@@ -1,5 +1,8 @@
 import unittest
 from interface.speech_responder import SpeechResponder
+from interface.load_controller import LoadController
+from interface.metrics import metrics
+from parsing.grammar_profile import EXACT
 from parsing.parser import *
 
 
@@ -73,3 +76,197 @@ class SpeechResponderTestCase(unittest.TestCase):
 
         speech, parsed = responder.parse('nothing here')
         assert parsed is None
+
+    def test_no_alternative(self):
+        responder = self.responder()
+        _ = responder.parse('hello world')
+
+        assert responder.alternative() is None
+
+    def test_alternatives(self):
+        parser = strongest([word_match('a'), word_match('b'), word_match('c')], beam_width=3)
+        responder = SpeechResponder(parser, lambda game_resp, action: action, lambda t: 'partial', lambda _: 'failure')
+
+        make_speech, parsed = responder.parse('c b')
+        assert parsed == 'b'
+        assert [responder.alternative()[1], responder.alternative()] == ['c', None]
+
+    def test_alternatives_reset_on_failure(self):
+        parser = strongest([word_match('a'), word_match('b')], beam_width=2)
+        responder = SpeechResponder(parser, lambda game_resp, action: action, lambda t: 'partial', lambda _: 'failure')
+
+        _ = responder.parse('a b')
+        _ = responder.parse('nothing')
+        assert responder.alternative() is None
+
+    def test_alternatives_per_session(self):
+        parser = strongest([word_match('a'), word_match('b')], beam_width=2)
+        responder = SpeechResponder(parser, lambda game_resp, action: action, lambda t: 'partial', lambda _: 'failure')
+
+        _ = responder.parse('a b', 'player1')
+        _ = responder.parse('nothing', 'player2')
+        assert responder.alternative('player2') is None
+        assert responder.alternative('player1')[1] == 'b'
+
+    def test_no_hypotheses(self):
+        responder = self.responder()
+
+        make_speech, parsed, transcript = responder.parse_hypotheses([])
+        assert (make_speech({}), parsed, transcript) == ('failure', None, '')
+
+    def test_close_alternatives(self):
+        parser = strongest([word_match('a'), word_match('b').scale_response(0.95), word_match('c').scale_response(0.5),
+                            word_match('d').map_parsed(len)], beam_width=4)
+        responder = SpeechResponder(parser, lambda game_resp, action: action, lambda t: 'partial', lambda _: 'failure')
+
+        _ = responder.parse('a b c d')
+        # 'c' is not close enough to the strongest parse, and 1 is a different type.
+        assert responder.alternative(margin=0.1)[1] == 'b'
+        assert responder.alternative(margin=0.1) is None
+        assert responder.alternative_actions() == [1, 'c']
+
+    def test_hypotheses_prefers_success(self):
+        responder = self.responder()
+
+        make_speech, parsed, transcript = responder.parse_hypotheses([('hello', 0.9), ('hello world', 0.1)])
+        assert (parsed, transcript) == ('helloworld', 'hello world')
+
+    def test_hypotheses_prefers_partial_to_failure(self):
+        responder = self.responder()
+
+        make_speech, parsed, transcript = responder.parse_hypotheses([('nothing', 0.9), ('hello', 0.1)])
+        assert make_speech({}) == 'partialType'
+        assert transcript == 'hello'
+
+    def test_hypotheses_uses_confidence(self):
+        parser = strongest([word_match('a').map_response(lambda _: 0.5), word_match('b').map_response(lambda _: 0.6)])
+        responder = SpeechResponder(parser, lambda game_resp, action: action, lambda t: 'partial', lambda _: 'failure')
+
+        # b has the higher parse response, but a was much more likely to have been said.
+        make_speech, parsed, transcript = responder.parse_hypotheses([('a', 0.9), ('b', 0.1)])
+        assert parsed == 'a'
+
+    def test_hypotheses_chooses_first_if_equal(self):
+        responder = self.responder()
+
+        make_speech, parsed, transcript = responder.parse_hypotheses([('Hello world', 0.5), ('hello world', 0.5)])
+        assert transcript == 'Hello world'
+
+    def test_hypotheses_keeps_partial_state(self):
+        responder = self.responder()
+        _ = responder.parse_hypotheses([('hello', 0.5)])
+        make_speech, parsed, transcript = responder.parse_hypotheses([('world', 0.5)])
+
+        assert parsed == 'helloworld'
+
+    def test_reuses_prepared_result(self):
+        num_parses = 0
+
+        def parse(words: List[Word]) -> ParseResult:
+            nonlocal num_parses
+            num_parses += 1
+            return word_match('a').parse(words)
+
+        responder = SpeechResponder(Parser(parse), lambda game_resp, action: action, lambda t: 'partial', lambda _: 'failure')
+        responder.prepare('b')
+        responder.prepare('b a')
+        responder.prepare('b a')
+        make_speech, parsed = responder.parse('b a')
+
+        assert parsed == 'a'
+        assert num_parses == 2
+
+    def counting_responder(self) -> SpeechResponder:
+        """
+        :return: a responder which parses the longest word, and counts the words whose length it computes in
+                 `self.num_lengths`, and the number of parses in `self.num_parses`.
+        """
+        self.num_lengths = 0
+        self.num_parses = 0
+
+        def length(word: str) -> float:
+            self.num_lengths += 1
+            return float(len(word))
+
+        longest = predicate(length, key=('test_length', id(self)))
+
+        def parse(words: List[Word]) -> ParseResult:
+            self.num_parses += 1
+            return longest.parse(words)
+
+        return SpeechResponder(Parser(parse), lambda game_resp, action: action, lambda t: 'partial', lambda _: 'failure')
+
+    def test_prepared_per_session(self):
+        responder = self.counting_responder()
+        responder.prepare('go left', session='a')
+        make_speech, parsed = responder.parse('go left', session='b')
+
+        assert self.num_parses == 2
+
+    def test_other_session_response_keeps_prepared(self):
+        responder = self.counting_responder()
+        responder.prepare('go left', session='a')
+        responder.parse('stop', session='b')
+        make_speech, parsed = responder.parse('go left', session='a')
+
+        assert parsed == 'left'
+        assert self.num_parses == 2
+
+    def test_only_annotates_new_words(self):
+        responder = self.counting_responder()
+        responder.prepare('go', session='a')
+        responder.prepare('go to', session='a')
+        make_speech, parsed = responder.parse('go to the doorway', session='a')
+
+        assert parsed == 'doorway'
+        assert self.num_lengths == 4
+
+    def test_forgets_session(self):
+        responder = self.counting_responder()
+        responder.prepare('go left', session='a')
+        responder.forget('a')
+        responder.parse('go left', session='a')
+
+        assert self.num_parses == 2
+
+    def test_prepared_results_discarded_after_parse(self):
+        responder = self.responder()
+        responder.prepare('world')
+
+        # The partial parse changes how 'world' is parsed.
+        _ = responder.parse('hello')
+        make_speech, parsed = responder.parse('world')
+
+        assert parsed == 'helloworld'
+
+    def degrading_responder(self) -> SpeechResponder:
+        """
+        :return: a speech responder whose full parser parses 'full', and whose exact parser parses 'exact', which is
+                 used whenever a transcript is being parsed.
+        """
+        parser = word_match('a').ignore_parsed('full')
+        profiles = {EXACT: word_match('a').ignore_parsed('exact')}
+        controller = LoadController(thresholds=[(0, 10.0), (0, 10.0)])
+        return SpeechResponder(parser, lambda game_resp, action: action, lambda t: 'partial', lambda _: 'failure',
+                               profiles=profiles, load_controller=controller)
+
+    def test_parses_with_profile_under_load(self):
+        responder = self.degrading_responder()
+        make_speech, parsed = responder.parse('a')
+
+        assert parsed == 'exact'
+        assert responder.load_controller.queue_depth == 0
+
+    def test_counts_profile_of_each_request(self):
+        responder = self.degrading_responder()
+        before = metrics.collect().counters.get('exact_profile_parses', 0)
+        responder.parse_hypotheses([('a', 0.5), ('b', 0.5)])
+
+        assert metrics.collect().counters['exact_profile_parses'] == before + 1
+
+    def test_does_not_prepare_under_load(self):
+        responder = self.degrading_responder()
+        responder.parse('a')
+        responder.prepare('a')
+
+        assert len(responder._prepared) == 0
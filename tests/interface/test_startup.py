@@ -0,0 +1,37 @@
+import unittest
+from interface.startup import Startup, PENDING, RUNNING, DONE, FAILED
+
+
+class StartupTestCase(unittest.TestCase):
+    def setUp(self):
+        self.startup = Startup(['wordnet', 'cache'])
+
+    def test_pending(self):
+        assert not self.startup.ready
+        assert self.startup.report()['stages']['wordnet']['status'] == PENDING
+
+    def test_running(self):
+        with self.startup.stage('wordnet'):
+            assert self.startup.stages['wordnet']['status'] == RUNNING
+
+        assert self.startup.stages['wordnet']['status'] == DONE
+        assert not self.startup.ready
+
+    def test_ready(self):
+        with self.startup.stage('wordnet'):
+            pass
+        with self.startup.stage('cache'):
+            self.startup.progress('cache', 0.5)
+
+        report = self.startup.report()
+        assert report['ready']
+        assert report['stages']['cache']['progress'] == 0.5
+        assert 'seconds' in report['stages']['cache']
+
+    def test_failed(self):
+        with self.assertRaises(ValueError):
+            with self.startup.stage('wordnet'):
+                raise ValueError('no data')
+
+        assert self.startup.stages['wordnet']['status'] == FAILED
+        assert self.startup.stages['wordnet']['error'] == "ValueError('no data')"
@@ -0,0 +1,127 @@
+import unittest
+from parsing.annotation import Annotation, annotated, current_annotation, register_primitive
+from parsing.parser import predicate, word_match, word_spelling, Consume
+from parsing.parse_result import SuccessParse, FailureParse
+
+
+class AnnotationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.num_calls = 0
+
+    def length(self, word: str) -> float:
+        self.num_calls += 1
+        return float(len(word))
+
+    def test_computes_primitives_when_read(self):
+        column = register_primitive(('test_length', id(self)), self.length)
+        annotation = Annotation(['a', 'abc', 'a'])
+        assert self.num_calls == 0
+
+        # The repeated word is only computed once.
+        assert list(annotation.responses(column, ['abc', 'a', 'a'])) == [3.0, 1.0, 1.0]
+        assert list(annotation.responses(column, ['abc', 'a'])) == [3.0, 1.0]
+        assert self.num_calls == 2
+
+    def test_only_computes_words_read(self):
+        column = register_primitive(('test_length', id(self)), self.length)
+        annotation = Annotation(['a', 'abc'])
+
+        assert list(annotation.responses(column, ['a'])) == [1.0]
+        assert self.num_calls == 1
+        assert list(annotation.responses(column, ['a', 'abc'])) == [1.0, 3.0]
+        assert self.num_calls == 2
+
+    def test_computes_new_primitives_when_used(self):
+        annotation = Annotation(['a', 'abc'])
+        column = register_primitive(('test_length', id(self)), self.length)
+
+        assert list(annotation.responses(column, ['abc'])) == [3.0]
+        annotation.responses(column, ['a'])
+        assert self.num_calls == 2
+
+    def test_word_not_in_transcript(self):
+        column = register_primitive(('test_length', id(self)), self.length)
+        annotation = Annotation(['a'])
+
+        assert annotation.responses(column, ['b']) is None
+
+    def test_same_key_same_column(self):
+        assert register_primitive(('test_key', id(self)), self.length) == register_primitive(('test_key', id(self)), len)
+
+    def test_annotated(self):
+        assert current_annotation() is None
+
+        with annotated(['a']) as annotation:
+            assert current_annotation() is annotation
+
+        assert current_annotation() is None
+
+
+class AnnotatedPredicateTestCase(unittest.TestCase):
+    def setUp(self):
+        self.num_calls = 0
+
+    def length(self, word: str) -> float:
+        self.num_calls += 1
+        return float(len(word))
+
+    def test_uses_annotation(self):
+        parser = predicate(self.length, key=('test_length', id(self)))
+        words = ['a', 'abc', 'ab']
+
+        with annotated(words):
+            parser.parse(words)
+            parser.parse(words[1:])
+            result = parser.parse(words)
+
+        assert result == SuccessParse('abc', 3.0, ['ab'])
+        assert self.num_calls == 3
+
+    def test_first_maximum(self):
+        parser = predicate(self.length, consume=Consume.WORD_ONLY, key=('test_length', id(self)))
+        words = ['ab', 'cd', 'e']
+
+        with annotated(words):
+            assert parser.parse(words) == SuccessParse('ab', 2.0, ['cd', 'e'])
+
+    def test_same_results(self):
+        parsers = [word_match('door'), word_match('key', first_only=True), word_spelling('terminal')]
+        words = ['go', 'to', 'the', 'doors', 'and', 'use', 'the', 'termnal']
+
+        for parser in parsers:
+            expected = parser.parse(words)
+            with annotated(words):
+                assert parser.parse(words) == expected
+
+    def test_failure(self):
+        parser = word_match('door')
+
+        with annotated(['go', 'left']):
+            assert parser.parse(['go', 'left']) == FailureParse()
+
+
+class ExtendAnnotationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.num_calls = 0
+
+    def length(self, word: str) -> float:
+        self.num_calls += 1
+        return float(len(word))
+
+    def test_only_computes_new_words(self):
+        column = register_primitive(('test_length', id(self)), self.length)
+        annotation = Annotation(['go', 'to'])
+        annotation.responses(column, ['go', 'to'])
+
+        with annotated(['go', 'to', 'the', 'door'], annotation) as extended:
+            assert extended is annotation
+            assert list(annotation.responses(column, ['go', 'door'])) == [2.0, 4.0]
+
+        assert self.num_calls == 3
+
+    def test_extends_unread_columns(self):
+        column = register_primitive(('test_length', id(self)), self.length)
+        annotation = Annotation(['go'])
+        annotation.extend(['go', 'left'])
+
+        assert list(annotation.responses(column, ['left', 'go'])) == [4.0, 2.0]
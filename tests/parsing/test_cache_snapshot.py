@@ -0,0 +1,83 @@
+import unittest
+import os
+import pickle
+import tempfile
+from parsing.lexical_cache import LexicalCache, lexical_cache, lexical_caches
+from parsing.cache_snapshot import save_snapshot, load_snapshot
+
+
+@lexical_cache
+def word_length(word: str) -> int:
+    word_length.num_calls += 1
+    return len(word)
+
+
+class LexicalCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        word_length.cache_clear()
+        word_length.num_calls = 0
+
+    def test_caches_results(self):
+        assert word_length('abc') == 3
+        assert word_length('abc') == 3
+        assert word_length.num_calls == 1
+
+    def test_counts_hits(self):
+        word_length('abc')
+        word_length('abc')
+        word_length('de')
+
+        assert word_length.hits == 1
+        assert word_length.misses == 2
+
+    def test_registered(self):
+        assert lexical_caches[__name__ + '.word_length'] is word_length
+
+    def test_bounded(self):
+        cache = LexicalCache(len, max_size=2)
+        cache('a')
+        cache('bb')
+        cache('a')
+        cache('ccc')
+
+        # The least recently used result is discarded.
+        assert list(cache.results) == [('a',), ('ccc',)]
+
+    def test_restored_results_bounded(self):
+        cache = LexicalCache(len, max_size=2)
+        cache.update({('a',): 1, ('bb',): 2, ('ccc',): 3})
+
+        assert list(cache.results) == [('bb',), ('ccc',)]
+
+
+class SnapshotTestCase(unittest.TestCase):
+    def setUp(self):
+        word_length.cache_clear()
+        word_length.num_calls = 0
+        self.filename = os.path.join(tempfile.mkdtemp(), 'lexical_cache.snapshot')
+
+    def test_restores_results(self):
+        word_length('abc')
+        save_snapshot(self.filename)
+        word_length.cache_clear()
+
+        assert load_snapshot(self.filename)
+        assert word_length('abc') == 3
+        assert word_length.num_calls == 1
+
+    def test_ignores_missing_snapshot(self):
+        assert not load_snapshot(self.filename)
+
+    def test_ignores_different_version(self):
+        word_length('abc')
+        save_snapshot(self.filename)
+        word_length.cache_clear()
+
+        with open(self.filename, 'rb') as file:
+            snapshot = pickle.load(file)
+        snapshot['version'] = 'old grammar'
+        with open(self.filename, 'wb') as file:
+            pickle.dump(snapshot, file)
+
+        assert not load_snapshot(self.filename)
+        assert word_length.results == {}
@@ -0,0 +1,68 @@
+import unittest
+from parsing.grammar_profile import FULL, SPELLING, EXACT, using_profile
+from parsing import grammar_profile
+from parsing.parser import *
+from parsing.parse_action import statement
+from parsing.pre_processing import pre_process
+from parsing.annotation import annotated
+from unittest import mock
+
+
+class GrammarProfileTestCase(unittest.TestCase):
+    def test_exact_spelling(self):
+        with using_profile(EXACT):
+            parser = word_spelling('door')
+
+        assert parser.parse(['door']).response == 1.0
+        assert parser.parse(['dor']).is_failure()
+
+    def test_spelling_profile_compares_spelling(self):
+        with using_profile(SPELLING):
+            parser = word_spelling('door', min_word_length=2)
+
+        assert parser.parse(['dor']).is_success()
+
+    def test_meaning_matches_word(self):
+        with using_profile(SPELLING):
+            parser = word_meaning('walk')
+
+        result = parser.parse(['walks', 'there'])
+        assert result.parsed == 'walk'
+        assert result.remaining == ['there']
+
+    def test_restores_profile(self):
+        with using_profile(EXACT):
+            assert grammar_profile.current_profile() == EXACT
+        assert grammar_profile.current_profile() == FULL
+
+
+class DegradedParseTestCase(unittest.TestCase):
+    def setUp(self):
+        self.num_calls = 0
+
+    def similarity(self, *args) -> float:
+        self.num_calls += 1
+        return 0.0
+
+    def test_parsers_created_while_parsing_use_profile(self):
+        # The meaning parser is created while parsing, as many parsers in the grammar are.
+        parser = word_match('go').then(lambda parsed, response: word_meaning('door', pos='n'))
+
+        with mock.patch('parsing.parser.semantic_similarity', self.similarity), annotated(['go', 'gate']):
+            with_profile(parser, EXACT).parse(['go', 'gate'])
+            assert self.num_calls == 0
+
+            parser.parse(['go', 'gate'])
+            assert self.num_calls == 1
+
+    def test_degraded_statement_does_not_compare_meanings(self):
+        transcripts = ['go through the door', 'pick up the rock', 'where are you', 'hack the terminal then run left']
+
+        with mock.patch('parsing.parser.semantic_similarity', self.similarity):
+            parser = statement(profile=EXACT)
+            for transcript in transcripts:
+                words = pre_process(transcript)
+                with annotated(words):
+                    parser.parse(words)
+
+        assert self.num_calls == 0
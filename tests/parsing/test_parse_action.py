@@ -1,6 +1,7 @@
 import unittest
 from parsing.pre_processing import pre_process
-from parsing.parse_action import statement
+from parsing.parse_action import statement, composite
+from concurrent.futures import ThreadPoolExecutor
 from actions.action import *
 from actions.interaction import *
 from actions.move import *
@@ -76,3 +77,15 @@ class CompositeTestCase(unittest.TestCase):
     def test_fails_if_only_then(self):
         s = pre_process('then')
         assert statement().parse(s).is_failure()
+
+    def test_parses_concurrently_in_order(self):
+        s = pre_process('stop then go left and NAN then pick up the rock')
+
+        expected_actions = [
+            Stop(),
+            Move(Speed.FAST, Directional(MoveDirection.LEFT, Distance.MEDIUM), None),
+            PickUp('rock', ObjectRelativeDirection.VICINITY)
+        ]
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            assert composite(executor).parse(s).parsed == Composite(expected_actions)
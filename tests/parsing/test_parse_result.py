@@ -60,3 +60,15 @@ class ParseResultTestCase(unittest.TestCase):
 
         assert not r1 < r2
         assert not r1 > r2
+
+    def test_shared_failure(self):
+        assert FailureParse() is FailureParse()
+
+    def test_equal_by_contents(self):
+        assert SuccessParse('a', 0.5, ['b']) == SuccessParse('a', 0.5, ['b'])
+        assert SuccessParse('a', 0.5, ['b']) != SuccessParse('a', 0.5, ['c'])
+        assert SuccessParse('a', 0.5, []) != PartialParse(None, 0.5, 'a')
+
+    def test_no_dict(self):
+        assert not hasattr(SuccessParse('a', 0.5, []), '__dict__')
+        assert not hasattr(PartialParse(None, 0.5, 'Type'), '__dict__')
@@ -1,4 +1,5 @@
 import unittest
+from threading import Thread
 from parsing.parser import *
 from parsing.pre_processing import pre_process
 
@@ -181,6 +182,48 @@ class PredicateTestCase(unittest.TestCase):
         s = pre_process('a b c')
         assert predicate(condition, consume=Consume.WORD_ONLY).parse(s) == SuccessParse('b', 1.0, ['a', 'c'])
 
+    def test_matches_first_highest(self):
+        def condition(input_word: Word) -> Response:
+            return 0.0 if input_word == 'a' else 1.0
+
+        s = pre_process('a b c')
+        assert predicate(condition).parse(s) == SuccessParse('b', 1.0, ['c'])
+
+
+class VectorizedPredicateTestCase(unittest.TestCase):
+    @staticmethod
+    @vectorized
+    def condition(input_words: List[Word]) -> np.ndarray:
+        return np.array([0.5 if word == 'b' else 0.0 for word in input_words])
+
+    def test_matches_highest(self):
+        s = pre_process('a b c')
+        assert predicate(self.condition).parse(s) == SuccessParse('b', 0.5, ['c'])
+
+    def test_first_highest(self):
+        s = pre_process('a b c b')
+        assert predicate(self.condition).parse(s) == SuccessParse('b', 0.5, ['c', 'b'])
+
+    def test_first_only(self):
+        s = pre_process('a b')
+        assert predicate(self.condition, first_only=True).parse(s).is_failure()
+        assert predicate(self.condition, first_only=True).parse(s[1:]) == SuccessParse('b', 0.5, [])
+
+    def test_consume_word_only(self):
+        s = pre_process('a b c')
+        assert predicate(self.condition, consume=Consume.WORD_ONLY).parse(s) == SuccessParse('b', 0.5, ['a', 'c'])
+
+    def test_none_if_all_zero(self):
+        s = pre_process('a c')
+        assert predicate(self.condition).parse(s).is_failure()
+
+    def test_scalar_call(self):
+        assert self.condition('b') == 0.5
+
+    def test_adapts_scalar_condition(self):
+        condition = as_vectorized(lambda word: float(len(word)))
+        assert list(condition.responses(['a', 'abc'])) == [1.0, 3.0]
+
 
 class WordSpellingTestCase(unittest.TestCase):
     def test_no_match1(self):
@@ -470,6 +513,148 @@ class StrongestTestCase(unittest.TestCase):
         assert parser.parse(s).response == 0.8
 
 
+class StrongestAdaptiveTestCase(StrongestTestCase):
+    def strongest_parser(self, parsers: List[Parser]) -> Parser:
+        return strongest(parsers, adaptive=True)
+
+    def counted(self, parser: Parser) -> Parser:
+        """
+        :return: the parser, which counts the number of times it has parsed in `self.num_parsed`.
+        """
+        def parse(input: List[Word]) -> ParseResult:
+            self.num_parsed += 1
+            return parser.parse(input)
+
+        return Parser(parse)
+
+    def test_runs_winner_first(self):
+        self.num_parsed = 0
+        parsers = [self.counted(word_match(w)).scale_response(0.5) for w in ['a', 'b']] + [self.counted(word_match('c'))]
+        parser = self.strongest_parser(parsers)
+
+        for _ in range(REORDER_INTERVAL):
+            parser.parse(['c'])
+
+        # The last parser has the most wins so is run first, and the others cannot give a stronger response.
+        self.num_parsed = 0
+        assert parser.parse(['c']).parsed == 'c'
+        assert self.num_parsed == 1
+
+    def test_earliest_perfect_wins(self):
+        parsers = [word_match('a').ignore_parsed('first'), strongest([word_match('a'), word_match('b')]).ignore_parsed('last')]
+        parser = self.strongest_parser(parsers)
+
+        # The last parser gives the strongest response most often, so it is run first.
+        for _ in range(REORDER_INTERVAL):
+            parser.parse(['b'])
+
+        assert parser.parse(['a']).parsed == 'first'
+
+    def test_parsed_from_threads(self):
+        parsers = [word_match(w).scale_response(0.5) for w in ['a', 'b']] + [word_match('c')]
+        parser = self.strongest_parser(parsers)
+        results = []
+
+        def parse():
+            for _ in range(REORDER_INTERVAL * 4):
+                results.append(parser.parse(['b', 'c']).parsed)
+
+        threads = [Thread(target=parse) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ['c'] * REORDER_INTERVAL * 16
+
+
+class MaxResponseTestCase(unittest.TestCase):
+    def test_produce(self):
+        assert produce('a', 0.4).max_response == 0.4
+
+    def test_scale_response(self):
+        parser = word_match('a').scale_response(0.5)
+        assert parser.max_response == 0.5
+        assert parser.parse(['a']).response == 0.5
+
+    def test_kept_by_threshold(self):
+        parser = threshold_success(produce('a', 0.4), 0.1).ignore_parsed('b')
+        assert parser.max_response == 0.4
+
+    def test_strongest(self):
+        assert strongest([produce('a', 0.4), produce('b', 0.6)]).max_response == 0.6
+
+    def test_unknown(self):
+        assert word_match('a').map_response(lambda r: r * 0.5).max_response == 1.0
+
+
+class StrongestBeamTestCase(unittest.TestCase):
+    def test_chooses_same_strongest(self):
+        parsers = [produce('a', 0.5), produce('b', 1.0), produce('c', 1.0)]
+        s = pre_process('x')
+
+        assert strongest(parsers, beam_width=3).parse(s).parsed == strongest(parsers).parse(s).parsed
+
+    def test_alternatives_ranked_by_response(self):
+        parsers = [produce('a', 0.5), produce('b', 1.0), produce('c', 0.8), produce('d', 0.2)]
+        parser = strongest(parsers, beam_width=3)
+
+        s = pre_process('x')
+        result = parser.parse(s)
+        assert result.alternatives == [SuccessParse('c', 0.8, ['x']), SuccessParse('a', 0.5, ['x'])]
+
+    def test_alternatives_first_on_equal_responses(self):
+        parsers = [produce('a', 1.0), produce('b', 0.5), produce('c', 0.5)]
+        parser = strongest(parsers, beam_width=2)
+
+        s = pre_process('x')
+        assert parser.parse(s).alternatives == [SuccessParse('b', 0.5, ['x'])]
+
+    def test_alternatives_distinct(self):
+        parsers = [produce('a', 1.0), produce('a', 0.8), produce('b', 0.5)]
+        parser = strongest(parsers, beam_width=3)
+
+        s = pre_process('x')
+        assert parser.parse(s).alternatives == [SuccessParse('b', 0.5, ['x'])]
+
+    def test_alternatives_ignore_failures(self):
+        parsers = [word_match('a'), word_match('b'), word_match('c')]
+        parser = strongest(parsers, beam_width=3)
+
+        s = pre_process('x b y')
+        assert parser.parse(s).alternatives == []
+
+    def test_nested_alternatives(self):
+        inner = strongest([produce('a', 0.9), produce('b', 0.8)], beam_width=2)
+        parser = strongest([inner, produce('c', 0.5)], beam_width=3)
+
+        s = pre_process('x')
+        result = parser.parse(s)
+        assert result.parsed == 'a'
+        assert [alt.parsed for alt in result.alternatives] == ['b', 'c']
+
+    def test_maps_alternatives(self):
+        parser = strongest([produce('a', 1.0), produce('b', 0.8)], beam_width=2) \
+                .then_ignore(word_match('y'), mix) \
+                .map_parsed(lambda p: p + '!')
+
+        s = pre_process('x y z')
+        result = parser.parse(s)
+        assert result == SuccessParse('a!', 1.0, ['z'], alternatives=[SuccessParse('b!', 0.9, ['z'])])
+
+    def test_maps_alternatives_parsed(self):
+        parser = strongest([produce('a', 1.0), produce('b', 0.8)], beam_width=2).map_parsed(lambda p: p + '!')
+
+        s = pre_process('x')
+        assert parser.parse(s).alternatives == [SuccessParse('b!', 0.8, ['x'])]
+
+    def test_non_consuming_alternatives(self):
+        parser = non_consuming(strongest([word_match('a'), word_match('b')], beam_width=2))
+
+        s = pre_process('a b c')
+        assert parser.parse(s).alternatives == [SuccessParse('b', 1.0, ['a', 'b', 'c'])]
+
+
 class StrongestWordTestCase(unittest.TestCase):
     def test_match_strongest_word(self):
         s = 'a b c'.split()
@@ -493,6 +678,38 @@ class StrongestWordTestCase(unittest.TestCase):
         assert parser.parse(s).parsed == 'run'
 
 
+class MemoisedTestCase(unittest.TestCase):
+    def counting_parser(self) -> Parser:
+        self.num_parses = 0
+
+        def parse(words: List[Word]) -> ParseResult:
+            self.num_parses += 1
+            return word_match('a').parse(words)
+
+        return Parser(parse)
+
+    def test_same_result(self):
+        parser = memoised(self.counting_parser())
+        s = pre_process('b a c')
+
+        assert parser.parse(s) == SuccessParse('a', 1.0, ['c'])
+
+    def test_parses_once(self):
+        parser = memoised(self.counting_parser())
+        _ = parser.parse(pre_process('b a c'))
+        _ = parser.parse(pre_process('b a c'))
+
+        assert self.num_parses == 1
+
+    def test_discards_least_recently_used(self):
+        parser = memoised(self.counting_parser(), max_size=2)
+        for text in ['a', 'b', 'a', 'c', 'a', 'b']:
+            _ = parser.parse(pre_process(text))
+
+        # 'b' was discarded when 'c' was parsed.
+        assert self.num_parses == 4
+
+
 class AnywhereTestCase(unittest.TestCase):
     def test_input_is_unchanged(self):
         """
@@ -0,0 +1,50 @@
+import unittest
+import pickle
+from parsing.path_similarity import path_similarity
+from parsing.parser import semantic_similarity, POS
+from nltk.corpus import wordnet as wn
+from nltk.corpus.reader.wordnet import Synset
+
+
+class PathSimilarityTestCase(unittest.TestCase):
+    def assert_same_similarities(self, w1: str, w2: str, pos=None):
+        s1 = wn.synsets(w1, pos=pos)
+        s2 = wn.synsets(w2, pos=pos)
+        similarities = path_similarity.similarities(s1, s2)
+
+        for i, a in enumerate(s1):
+            for j, b in enumerate(s2):
+                assert similarities[i, j] == (a.path_similarity(b) or 0.0), (a, b)
+
+    def test_nouns(self):
+        self.assert_same_similarities('dog', 'cat', POS.noun)
+
+    def test_verbs(self):
+        # Verbs do not have a common root, so a root is simulated.
+        self.assert_same_similarities('run', 'sprint', POS.verb)
+
+    def test_all_pos(self):
+        self.assert_same_similarities('fly', 'walk')
+
+    def test_instance_hypernyms(self):
+        self.assert_same_similarities('london', 'city', POS.noun)
+
+    def test_call(self):
+        dog = wn.synset('dog.n.01')
+        cat = wn.synset('cat.n.01')
+        assert path_similarity(dog, cat) == dog.path_similarity(cat)
+
+    def test_call_no_path(self):
+        dog = wn.synset('dog.n.01')
+        run = wn.synset('run.v.01')
+        assert path_similarity(dog, run) == dog.path_similarity(run)
+
+    def test_max_similarity_empty(self):
+        assert path_similarity.max_similarity([], wn.synsets('dog')) == 0.0
+
+    def test_semantic_similarity(self):
+        expected = semantic_similarity('run', 'sprint', POS.verb, Synset.path_similarity)
+        assert semantic_similarity('run', 'sprint', POS.verb, path_similarity) == expected
+
+    def test_pickles_shared_instance(self):
+        assert pickle.loads(pickle.dumps(path_similarity)) is path_similarity
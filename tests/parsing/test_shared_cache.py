@@ -0,0 +1,119 @@
+import unittest
+import os
+import tempfile
+from parsing.shared_cache import SharedSimilarityCache, use_shared_cache, float32
+from parsing.similarity_backend import SimilarityBackend
+from parsing.parser import semantic_similarity
+
+
+class CountingBackend(SimilarityBackend):
+    """
+    Gives the same similarity to every pair of words, and counts the number of pairs it has compared.
+    """
+
+    def __init__(self):
+        self.num_compared = 0
+
+    def word_similarity(self, input_word, seed_word, pos):
+        self.num_compared += 1
+        return 0.1
+
+    def __eq__(self, other):
+        return isinstance(other, CountingBackend)
+
+    def __hash__(self):
+        return hash(CountingBackend)
+
+    def __reduce__(self):
+        return CountingBackend, ()
+
+
+class SharedSimilarityCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.filename = os.path.join(tempfile.mkdtemp(), 'similarity_cache.bin')
+
+    def test_get_put(self):
+        cache = SharedSimilarityCache(self.filename, capacity=64)
+        cache.put(('go', 'walk', 'v', 'path'), 0.5)
+
+        assert cache.get(('go', 'walk', 'v', 'path')) == 0.5
+        assert cache.get(('go', 'walk', 'n', 'path')) is None
+        assert len(cache) == 1
+
+    def test_float32(self):
+        cache = SharedSimilarityCache(self.filename, capacity=64)
+        cache.put(('a', 'b'), 1 / 3)
+
+        assert cache.get(('a', 'b')) == float32(1 / 3)
+        self.assertAlmostEqual(cache.get(('a', 'b')), 1 / 3, places=6)
+
+    def test_capacity_power_of_two(self):
+        assert SharedSimilarityCache(self.filename, capacity=100).capacity == 128
+
+    def test_bounded(self):
+        cache = SharedSimilarityCache(self.filename, capacity=8)
+        for i in range(100):
+            cache.put(('word{}'.format(i), 'seed'), 0.5)
+
+        assert len(cache) <= 8
+        assert cache.get(('word99', 'seed')) == 0.5
+
+    def test_shared_between_opens(self):
+        SharedSimilarityCache(self.filename, capacity=64, version='1').put(('a', 'b'), 0.25)
+
+        assert SharedSimilarityCache(self.filename, capacity=64, version='1').get(('a', 'b')) == 0.25
+
+    def test_discarded_if_version_changes(self):
+        SharedSimilarityCache(self.filename, capacity=64, version='1').put(('a', 'b'), 0.25)
+
+        assert SharedSimilarityCache(self.filename, capacity=64, version='2').get(('a', 'b')) is None
+
+    def test_replaced_while_mapped(self):
+        cache = SharedSimilarityCache(self.filename, capacity=64)
+        cache.put(('a', 'b'), 0.25)
+
+        # E.g. a new server started with another capacity while the old workers are still running.
+        SharedSimilarityCache(self.filename, capacity=8)
+
+        assert cache.get(('a', 'b')) == 0.25
+        assert SharedSimilarityCache(self.filename, capacity=8).get(('a', 'b')) is None
+
+    def test_fingerprint_collision(self):
+        cache = SharedSimilarityCache(self.filename, capacity=64)
+        index, fingerprint, check = cache._hash(('a', 'b'))
+        cache.put(('a', 'b'), 0.25)
+
+        # Another key with the same slot and 64-bit fingerprint, but the rest of its hash differs.
+        cache._hash = lambda key: (index, fingerprint, check ^ 1)
+        assert cache.get(('c', 'd')) is None
+
+    def test_shared_with_forked_process(self):
+        cache = SharedSimilarityCache(self.filename, capacity=64)
+
+        pid = os.fork()
+        if pid == 0:
+            cache.put(('a', 'b'), 0.75)
+            os._exit(0)
+
+        os.waitpid(pid, 0)
+        assert cache.get(('a', 'b')) == 0.75
+
+
+class SemanticSimilaritySharedCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.cache = SharedSimilarityCache(os.path.join(tempfile.mkdtemp(), 'similarity_cache.bin'), capacity=64)
+        use_shared_cache(self.cache)
+        semantic_similarity.cache_clear()
+
+    def tearDown(self):
+        use_shared_cache(None)
+        semantic_similarity.cache_clear()
+
+    def test_computed_once(self):
+        backend = CountingBackend()
+        assert semantic_similarity('zebra', 'horse', 'n', backend) == 0.1
+
+        # E.g. another process, which has not cached the similarity itself.
+        semantic_similarity.cache_clear()
+        assert semantic_similarity('zebra', 'horse', 'n', backend) == float32(0.1)
+        assert backend.num_compared == 1
@@ -0,0 +1,110 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from parsing.statement_classifier import StatementClassifier, train, examples_from_log, features, ACTION, QUESTION, \
+    CONVERSATION, FAMILIES
+from parsing.parse_action import classified
+from parsing.parser import word_match
+from parsing.parse_result import SuccessParse
+
+
+examples = [
+    (['go', 'left'], ACTION),
+    (['pick', 'up', 'rock'], ACTION),
+    (['go', 'through', 'door'], ACTION),
+    (['where', 'are', 'you'], QUESTION),
+    (['where', 'is', 'guard'], QUESTION),
+    (['can', 'you', 'see', 'guard'], QUESTION),
+    (['hello'], CONVERSATION),
+    (['what', 'is', 'your', 'name'], CONVERSATION),
+    (['hello', 'there'], CONVERSATION),
+]
+
+
+class StatementClassifierTestCase(unittest.TestCase):
+    def setUp(self):
+        self.classifier = train(examples)
+
+    def test_features(self):
+        assert features(['where', 'are', 'you']) == ['w:where', 'w:are', 'w:you', 'b:where are', 'b:are you',
+                                                     'first:where']
+
+    def test_scores(self):
+        scores = self.classifier.scores(['go', 'left'])
+
+        self.assertAlmostEqual(float(scores.sum()), 1.0)
+        assert FAMILIES[int(np.argmax(scores))] == ACTION
+
+    def test_classifies_training(self):
+        for words, family in examples:
+            assert FAMILIES[int(np.argmax(self.classifier.scores(words)))] == family
+
+    def test_families_pruned(self):
+        assert self.classifier.families(['where', 'are', 'you'], margin=0.3) == {QUESTION}
+
+    def test_families_zero_margin(self):
+        assert self.classifier.families(['where', 'are', 'you'], margin=0.0) == set(FAMILIES)
+
+    def test_families_unknown_words(self):
+        assert self.classifier.families(['xyzzy'], margin=0.3) == set(FAMILIES)
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'classifier.npz')
+            self.classifier.save(filename)
+            loaded = StatementClassifier.load(filename)
+
+        assert loaded.feature_names == self.classifier.feature_names
+        np.testing.assert_array_equal(loaded.scores(['go', 'left']), self.classifier.scores(['go', 'left']))
+
+
+class ExamplesFromLogTestCase(unittest.TestCase):
+    def test_examples(self):
+        log = '\n'.join([
+            '',
+            'transcript: go left',
+            'action: Move',
+            'sending to: action',
+            '',
+            'transcript: where are you',
+            'action: Location',
+            'sending to: questions',
+            '',
+            'transcript: hello',
+            'conversation: Greeting',
+            'success reply: hi',
+            '',
+            'transcript: xyzzy',
+            'failure reply: pardon',
+        ])
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'conversation_log.txt')
+            with open(filename, 'w') as file:
+                file.write(log)
+
+            assert examples_from_log(filename) == [
+                (['go', 'left'], ACTION),
+                (['where', 'are', 'you'], QUESTION),
+                (['hello'], CONVERSATION)
+            ]
+
+
+class ClassifiedTestCase(unittest.TestCase):
+    def setUp(self):
+        self.classifier = train(examples)
+        # Without the classifier, the action parser would be the strongest for 'where' as it occurs first.
+        self.families = {
+            ACTION: word_match('where').ignore_parsed(ACTION),
+            QUESTION: word_match('where').ignore_parsed(QUESTION),
+            CONVERSATION: word_match('hello').ignore_parsed(CONVERSATION)
+        }
+
+    def test_skips_family(self):
+        parser = classified(self.classifier, self.families, margin=0.3, beam_width=1)
+        assert parser.parse(['where', 'are', 'you']) == SuccessParse(QUESTION, 1.0, ['are', 'you'])
+
+    def test_zero_margin(self):
+        parser = classified(self.classifier, self.families, margin=0.0, beam_width=1)
+        assert parser.parse(['where', 'are', 'you']) == SuccessParse(ACTION, 1.0, ['are', 'you'])
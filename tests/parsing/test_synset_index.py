@@ -0,0 +1,36 @@
+import unittest
+from parsing.parser import word_meaning, semantic_similarity, POS
+from parsing.synset_index import synsets, seed_words, build_synset_index
+from nltk.corpus import wordnet as wn
+from nltk.corpus.reader.wordnet import Synset
+
+
+class SynsetIndexTestCase(unittest.TestCase):
+    def test_registers_seed_words(self):
+        word_meaning('hello')
+        word_meaning('pick', pos=POS.verb)
+
+        assert ('hello', None) in seed_words
+        assert ('pick', POS.verb) in seed_words
+
+    def test_synsets(self):
+        assert synsets('run', None) == tuple(wn.synsets('run'))
+
+    def test_synsets_pos(self):
+        assert synsets('run', POS.noun) == tuple(wn.synsets('run', pos=POS.noun))
+
+    def test_no_synsets(self):
+        assert synsets('xyzzy', None) == ()
+
+    def test_builds_index(self):
+        word_meaning('sprint', pos=POS.verb)
+        build_synset_index()
+
+        assert synsets.cache_info().currsize >= len(seed_words)
+
+    def test_same_similarity(self):
+        s1 = wn.synsets('run', pos=POS.verb)
+        s2 = wn.synsets('sprint', pos=POS.verb)
+        expected = max(a.path_similarity(b) or 0.0 for a in s1 for b in s2)
+
+        assert semantic_similarity('run', 'sprint', POS.verb, Synset.path_similarity) == expected
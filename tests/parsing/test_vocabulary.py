@@ -0,0 +1,60 @@
+import unittest
+from threading import Thread
+from parsing.vocabulary import Vocabulary, vocabulary
+from parsing.pre_processing import pre_process
+from parsing.parser import word_match
+
+
+class VocabularyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.vocabulary = Vocabulary()
+
+    def test_add_twice(self):
+        first = self.vocabulary.add('go')
+        second = self.vocabulary.add(''.join(['g', 'o']))
+
+        assert first is second
+        assert list(self.vocabulary.words) == ['go']
+
+    def test_add_from_threads(self):
+        words = ['word{}'.format(i) for i in range(1000)]
+        added = []
+
+        def add():
+            added.append([self.vocabulary.add(''.join(word)) for word in words])
+
+        threads = [Thread(target=add) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert all(a is b for other in added for a, b in zip(added[0], other))
+
+    def test_intern(self):
+        word = self.vocabulary.add('go')
+        input_word = ''.join(['g', 'o'])
+
+        assert self.vocabulary.intern(input_word) is word
+
+    def test_intern_oov(self):
+        first = self.vocabulary.intern(''.join(['xy', 'zzy']))
+        second = self.vocabulary.intern(''.join(['x', 'yzzy']))
+
+        assert first is second
+        assert 'xyzzy' not in self.vocabulary.words
+
+    def test_key(self):
+        assert self.vocabulary.key(['go', 'left']) == self.vocabulary.key(['go', 'left'])
+        assert self.vocabulary.key(['go', 'left']) != self.vocabulary.key(['left', 'go'])
+
+
+class PreProcessTestCase(unittest.TestCase):
+    def test_words(self):
+        assert pre_process('Go Left') == ['go', 'left']
+
+    def test_interns_grammar_words(self):
+        word_match('door')
+        words = pre_process('open the Door')
+
+        assert words[2] is vocabulary.words['door']
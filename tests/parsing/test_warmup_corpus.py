@@ -0,0 +1,42 @@
+import unittest
+import os
+import tempfile
+from parsing.warmup_corpus import primitive_words, generate_corpus, warm_up, coverage_report
+from parsing.parser import word_match, strongest
+from parsing import annotation
+
+
+class WarmupCorpusTestCase(unittest.TestCase):
+    def test_primitive_words(self):
+        assert primitive_words(('word_match', 'rock', 'rocks')) == [('rock', None)]
+        assert primitive_words(('word_spelling', 'hack', False, 3)) == [('hack', None)]
+        assert primitive_words(('word_meaning', 'guard', 'n', None)) == [('guard', 'n')]
+        assert primitive_words(('word_tagged', ('NN', 'NNS'))) == []
+
+    def test_generate_corpus(self):
+        filename = os.path.join(tempfile.mkdtemp(), 'test_parse_example.py')
+        with open(filename, 'w') as file:
+            file.write('s = pre_process("go to the door")\n'
+                       'parse(pre_process(transcript))\n'
+                       'assert pre_process("pick up the rock") == pre_process("go to the door")\n')
+
+        assert generate_corpus(filename) == ['go to the door', 'pick up the rock']
+
+    def test_warm_up_exercised(self):
+        parser = strongest([word_match('zebra'), word_match('giraffe')])
+        zebra = next(key for key in annotation.columns if key[0] == 'word_match' and key[1] == 'zebra')
+        giraffe = next(key for key in annotation.columns if key[0] == 'word_match' and key[1] == 'giraffe')
+
+        progress = []
+        exercised = warm_up(parser, ['zebra', 'go left'], progress.append)
+
+        assert zebra in exercised
+        assert giraffe not in exercised
+        assert progress == [0.5, 1.0]
+
+    def test_coverage_report(self):
+        word_match('okapi')
+        report = coverage_report(set())
+
+        assert 'word_match: 0/' in report
+        assert 'okapi' in report
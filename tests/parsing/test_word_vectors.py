@@ -0,0 +1,77 @@
+import unittest
+import os
+import pickle
+import tempfile
+import numpy as np
+from unittest.mock import patch
+from parsing.parser import word_meaning, semantic_similarity
+from parsing.parse_result import SuccessParse, FailureParse
+from parsing.similarity_backend import use_backend
+from parsing.word_vectors import VectorSimilarity, save_word_vectors, convert_text_vectors
+
+
+class VectorSimilarityTestCase(unittest.TestCase):
+    def setUp(self):
+        # The seed words registered by the grammars created by other tests are not compared to.
+        seed_words = patch('parsing.word_vectors.seed_words', set())
+        seed_words.start()
+        self.addCleanup(seed_words.stop)
+
+        self.directory = os.path.join(tempfile.mkdtemp(), 'vectors')
+        words = ['go', 'walk', 'stop', 'rock']
+        vectors = np.array([[1, 0, 0],
+                            [1, 1, 0],
+                            [-1, 0, 0],
+                            [0, 0, 2]])
+        save_word_vectors(self.directory, words, vectors)
+        self.backend = VectorSimilarity(self.directory)
+
+    def tearDown(self):
+        use_backend(None)
+
+    def test_cosine_similarity(self):
+        assert self.backend.word_similarity('go', 'go', None) == 1.0
+        assert self.backend.word_similarity('walk', 'go', None) == np.float32(1 / np.sqrt(2))
+        assert self.backend.word_similarity('rock', 'go', None) == 0.0
+
+    def test_opposite_meanings(self):
+        assert self.backend.word_similarity('stop', 'go', None) == 0.0
+
+    def test_no_vector(self):
+        assert self.backend.word_similarity('xyzzy', 'go', None) == 0.0
+        assert self.backend.word_similarity('go', 'xyzzy', None) == 0.0
+
+    def test_compares_all_seed_words(self):
+        self.backend.update_seed_words(['go', 'rock'])
+        similarities = self.backend.similarities('rock')
+
+        assert len(similarities) == 2
+        assert np.allclose(sorted(similarities), [0, 1])
+
+    def test_semantic_similarity(self):
+        assert semantic_similarity('walk', 'go', None, self.backend) == self.backend.word_similarity('walk', 'go', None)
+
+    def test_word_meaning(self):
+        parser = word_meaning('go', similarity_measure=self.backend)
+
+        assert isinstance(parser.parse(['walk']), SuccessParse)
+        assert isinstance(parser.parse(['rock']), FailureParse)
+
+    def test_default_backend(self):
+        use_backend(self.backend)
+        parser = word_meaning('go')
+
+        assert isinstance(parser.parse(['walk']), SuccessParse)
+
+    def test_pickles_by_directory(self):
+        assert pickle.loads(pickle.dumps(self.backend)) == self.backend
+
+    def test_convert_text_vectors(self):
+        text_filename = os.path.join(tempfile.mkdtemp(), 'vectors.txt')
+        with open(text_filename, 'w') as file:
+            file.write('2 3\ngo 1 0 0\nwalk 1 1 0\n')
+
+        convert_text_vectors(text_filename, self.directory)
+        backend = VectorSimilarity(self.directory)
+
+        assert backend.word_similarity('walk', 'go', None) == np.float32(1 / np.sqrt(2))
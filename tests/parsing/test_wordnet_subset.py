@@ -0,0 +1,61 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from parsing.parser import semantic_similarity, POS
+from parsing.path_similarity import PathSimilarity
+from parsing.wordnet_subset import build_subset, load_subset
+from nltk.corpus import wordnet as wn
+from nltk.corpus.reader.wordnet import Synset
+
+
+class WordNetSubsetTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = os.path.join(tempfile.mkdtemp(), 'wordnet_subset')
+
+    def test_ignores_missing_subset(self):
+        assert load_subset(self.directory) is None
+
+    def test_ignores_different_version(self):
+        build_subset(self.directory, [('run', POS.verb)])
+        np.save(os.path.join(self.directory, 'version.npy'), np.array('old wordnet'))
+
+        assert load_subset(self.directory) is None
+
+    def test_synsets(self):
+        build_subset(self.directory, [('run', POS.verb), ('dog', None)])
+        subset = load_subset(self.directory)
+
+        assert [subset.names[i] for i in subset.synset_ids('run', POS.verb)] == [s.name() for s in wn.synsets('run', pos=POS.verb)]
+        assert [subset.names[i] for i in subset.synset_ids('dog', None)] == [s.name() for s in wn.synsets('dog')]
+
+    def test_word_not_in_subset(self):
+        build_subset(self.directory, [('run', POS.verb)])
+        subset = load_subset(self.directory)
+
+        assert subset.synset_ids('run', POS.noun) is None
+        assert subset.synset_ids('walk', POS.verb) is None
+
+    def test_same_similarity(self):
+        words = [('run', POS.verb), ('sprint', POS.verb), ('dog', None), ('cat', None), ('xyzzy', None)]
+        build_subset(self.directory, words)
+
+        similarity = PathSimilarity()
+        similarity.use_subset(load_subset(self.directory))
+
+        for w1, pos in words:
+            for w2, _ in words:
+                expected = semantic_similarity(w1, w2, pos, Synset.path_similarity)
+                assert similarity.word_similarity(w1, w2, pos) == expected, (w1, w2)
+
+    def test_falls_back_to_wordnet(self):
+        build_subset(self.directory, [('run', POS.verb)])
+
+        similarity = PathSimilarity()
+        similarity.use_subset(load_subset(self.directory))
+
+        assert similarity.word_similarity('run', 'sprint', POS.verb) is None
+        # Closures from the subset and from the full WordNet are comparable.
+        similarity.word_similarity('run', 'run', POS.verb)
+        expected = semantic_similarity('run', 'sprint', POS.verb, Synset.path_similarity)
+        assert similarity.max_similarity(wn.synsets('run', pos=POS.verb), wn.synsets('sprint', pos=POS.verb)) == expected
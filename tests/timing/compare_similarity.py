@@ -0,0 +1,84 @@
+from parsing.parse_action import memoised_single_action
+from parsing.parser import semantic_similarity
+from parsing.path_similarity import PathSimilarity, path_similarity
+from parsing.similarity_backend import SimilarityBackend, use_backend
+from parsing.lexical_cache import lexical_caches
+from parsing.synset_index import seed_words
+from parsing.word_vectors import VectorSimilarity
+from nltk.corpus import wordnet as wn
+from unittest import TestLoader, TestResult
+from typing import Set, Tuple
+import sys
+import time
+
+
+# Input words compared to every seed word when timing the backends.
+input_words = ['go', 'walk', 'sprint', 'door', 'rock', 'pick', 'throw', 'guard', 'hack', 'terminal', 'stairs', 'hide',
+               'crouch', 'left', 'behind', 'camera', 'hello', 'name', 'time', 'quickly']
+
+
+def clear_caches():
+    """
+    Clears the lexical caches, and the grammar, so that the next parses use the current backend.
+    """
+    for cache in lexical_caches.values():
+        cache.cache_clear()
+    memoised_single_action.cache_clear()
+
+
+def run_tests() -> Tuple[float, Set[str]]:
+    """
+    :return: the time taken to run the parsing tests, and the ids of the tests which failed.
+    """
+    clear_caches()
+    suite = TestLoader().discover(start_dir='../parsing')
+    result = TestResult()
+
+    start_time = time.time()
+    suite.run(result)
+    end_time = time.time()
+
+    return end_time - start_time, {test.id() for test, _ in result.failures + result.errors}
+
+
+def time_word_similarity(backend: SimilarityBackend) -> float:
+    """
+    :return: the time taken to compare each input word to each seed word, without using the lexical caches.
+    """
+    start_time = time.time()
+
+    for input_word in input_words:
+        for seed_word, pos in seed_words:
+            semantic_similarity.function(input_word, seed_word, pos, backend)
+
+    return time.time() - start_time
+
+
+if __name__ == '__main__':
+    # Usage: python compare_similarity.py <word vectors directory>, see parsing/word_vectors.py.
+    vectors = VectorSimilarity(sys.argv[1])
+
+    print('Loading WordNet...')
+    wn.ensure_loaded()
+
+    backends = [('WordNet', path_similarity), ('Word vectors', vectors)]
+    failed = {}
+
+    for name, backend in backends:
+        use_backend(backend)
+        print('Running tests using {}...'.format(name))
+        t, failed[name] = run_tests()
+        print('\ttook %.2fs, %d tests failed\n' % (t, len(failed[name])))
+
+    # New backends are timed, so the closures and vectors they have already found are not reused.
+    for name, backend in [('WordNet', PathSimilarity()), ('Word vectors', VectorSimilarity(sys.argv[1]))]:
+        print('Comparing {} input words to {} seed words using {}...'.format(len(input_words), len(seed_words), name))
+        print('\ttook %.4fs\n' % time_word_similarity(backend))
+
+    print('Failed using word vectors, but not WordNet:')
+    for test_id in sorted(failed['Word vectors'] - failed['WordNet']):
+        print('\t' + test_id)
+
+    print('Failed using WordNet, but not word vectors:')
+    for test_id in sorted(failed['WordNet'] - failed['Word vectors']):
+        print('\t' + test_id)
@@ -0,0 +1,280 @@
+from stub_game_server import StubGameServer
+from threading import Thread
+from typing import Any, List, Optional, Tuple
+import argparse
+import json
+import numpy as np
+import requests
+import subprocess
+import sys
+import time
+
+
+# The transcripts said by the players if no corpus is given.
+default_corpus = [
+    'go through the door',
+    'pick up the rock',
+    'go to the second door on your left',
+    'hack the terminal then take the next left',
+    'throw the rock at the guard',
+    'can you see any guards',
+    'where are you',
+    'how much more time is there',
+    'what are you holding',
+    'hello',
+    "what's your name",
+    'this is nonsense'
+]
+
+# Run in a separate process to start the speech server, sending actions to the stub game server.
+SERVE_APP = """
+import app
+app.GAME_MODE = True
+app.GAME_SERVER = {game_server!r}
+app.preload(fill_cache={fill_cache!r})
+app.socketio.run(app.app, host='0.0.0.0', port={port!r})
+"""
+
+
+class SocketIOClient:
+    """
+    A minimal Socket.IO client, using the HTTP long-polling transport of version 3 of the Engine.IO protocol spoken
+    by the server. Only text events are supported.
+    """
+
+    def __init__(self, url: str, timeout: float = 60):
+        """
+        :param url: the address of the speech server, e.g. 'http://localhost:8080'.
+        :param timeout: the number of seconds to wait for the server to respond.
+        """
+        self.url = url.rstrip('/') + '/socket.io/'
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.sid: Optional[str] = None
+        self.ping_interval = 25.0
+        self.last_ping = time.time()
+        # Events received from the server which have not been waited for.
+        self.events: List[Tuple[str, Any]] = []
+
+    def connect(self):
+        packets = self._poll()
+        handshake = json.loads(packets[0][1:])
+        self.sid = handshake['sid']
+        self.ping_interval = handshake['pingInterval'] / 1000
+        self._receive(packets[1:])
+
+    def emit(self, event: str, data: Any):
+        self._ping_if_due()
+        self._send(['42' + json.dumps([event, data])])
+
+    def wait_for(self, event: str) -> Any:
+        """
+        :return: the data of the next event with the name, polling the server until it arrives.
+        """
+        while True:
+            for i, (name, data) in enumerate(self.events):
+                if name == event:
+                    del self.events[i]
+                    return data
+
+            self._ping_if_due()
+            self._receive(self._poll())
+
+    def close(self):
+        self._send(['1'])
+
+    def _ping_if_due(self):
+        # The server closes the connection if the client does not ping it.
+        if time.time() - self.last_ping > self.ping_interval / 2:
+            self._send(['2'])
+            self.last_ping = time.time()
+
+    def _receive(self, packets: List[str]):
+        for packet in packets:
+            if packet.startswith('42'):
+                name, *data = json.loads(packet[2:])
+                self.events.append((name, data[0] if data else None))
+            elif packet.startswith('1'):
+                raise ConnectionError('Closed by the server')
+
+    def _params(self) -> dict:
+        params = {'EIO': 3, 'transport': 'polling', 'b64': 1, 't': str(time.time())}
+        if self.sid:
+            params['sid'] = self.sid
+        return params
+
+    def _poll(self) -> List[str]:
+        response = self.session.get(self.url, params=self._params(), timeout=self.timeout)
+        response.raise_for_status()
+        return decode_payload(response.text)
+
+    def _send(self, packets: List[str]):
+        response = self.session.post(self.url, params=self._params(), data=encode_payload(packets).encode('utf-8'),
+                                     headers={'Content-Type': 'text/plain;charset=UTF-8'}, timeout=self.timeout)
+        response.raise_for_status()
+
+
+def encode_payload(packets: List[str]) -> str:
+    """
+    :return: the packets in the text payload format, where each packet is prefixed by its length, e.g. '2:40'.
+    """
+    return ''.join('{}:{}'.format(len(packet), packet) for packet in packets)
+
+
+def decode_payload(payload: str) -> List[str]:
+    packets = []
+    i = 0
+    while i < len(payload):
+        separator = payload.index(':', i)
+        length = int(payload[i:separator])
+        packets.append(payload[separator + 1:separator + 1 + length])
+        i = separator + 1 + length
+    return packets
+
+
+def run_client(url: str, transcripts: List[str], latencies: List[float], errors: List[str]):
+    """
+    Says each transcript to the speech server, waiting for the speech reply before saying the next one, as a player
+    would. The latency of each reply is appended to the list.
+    """
+    try:
+        client = SocketIOClient(url)
+        client.connect()
+
+        for transcript in transcripts:
+            start = time.perf_counter()
+            client.emit('recognised', transcript)
+            client.wait_for('speech')
+            latencies.append(time.perf_counter() - start)
+
+        client.close()
+    except Exception as e:
+        errors.append(repr(e))
+
+
+def run_load(url: str, num_clients: int, corpus: List[str], transcripts_per_client: int) -> dict:
+    """
+    :return: the reply latencies and throughput of the speech server with the number of players speaking at once.
+    """
+    latencies: List[float] = []
+    errors: List[str] = []
+    threads = []
+
+    for i in range(num_clients):
+        # Each client starts at a different point in the corpus so the clients are not all saying the same thing.
+        transcripts = [corpus[(i + j) % len(corpus)] for j in range(transcripts_per_client)]
+        threads.append(Thread(target=run_client, args=(url, transcripts, latencies, errors)))
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - start
+
+    return {
+        'clients': num_clients,
+        'replies': len(latencies),
+        'errors': errors,
+        'throughput': len(latencies) / duration,
+        'p50': percentile(latencies, 50),
+        'p90': percentile(latencies, 90),
+        'p99': percentile(latencies, 99),
+        'max': max(latencies, default=float('nan'))
+    }
+
+
+def percentile(latencies: List[float], q: float) -> float:
+    return float(np.percentile(latencies, q)) if latencies else float('nan')
+
+
+def saturation_point(reports: List[dict], min_gain: float = 0.1) -> Optional[int]:
+    """
+    :param min_gain: the fractional increase in throughput expected from adding more clients if the server is not
+                     saturated.
+    :return: the number of clients after which adding more stopped increasing the throughput, or None if the
+             throughput increased at every load.
+    """
+    for previous, report in zip(reports, reports[1:]):
+        if report['throughput'] < previous['throughput'] * (1 + min_gain):
+            return previous['clients']
+    return None
+
+
+def read_corpus(filename: Optional[str]) -> List[str]:
+    """
+    :return: the transcripts in the file, one per line, or the default corpus if there is no file.
+    """
+    if filename is None:
+        return default_corpus
+
+    with open(filename) as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def start_app(port: int, game_server: str, fill_cache: bool, timeout: float = 600) -> subprocess.Popen:
+    """
+    :return: the process of the speech server, once it is accepting connections.
+    """
+    code = SERVE_APP.format(game_server=game_server, fill_cache=fill_cache, port=port)
+    process = subprocess.Popen([sys.executable, '-c', code])
+
+    start = time.time()
+    while time.time() - start < timeout:
+        try:
+            requests.get('http://localhost:{}/'.format(port), timeout=1)
+            return process
+        except requests.ConnectionError:
+            time.sleep(1)
+
+    process.kill()
+    raise TimeoutError('The speech server did not start')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measures the reply latency and throughput of the speech server.')
+    parser.add_argument('--url', default='http://localhost:8080', help='the address of the speech server')
+    parser.add_argument('--start-server', action='store_true',
+                        help='starts the speech server at the port of --url, sending actions to the stub game server')
+    parser.add_argument('--fill-cache', action='store_true', help='fills the cache of the started speech server')
+    parser.add_argument('--clients', default='1,2,4,8,16,32', help='the numbers of players speaking at once')
+    parser.add_argument('--transcripts-per-client', type=int, default=20)
+    parser.add_argument('--corpus', help='a file of transcripts, one per line')
+    parser.add_argument('--game-port', type=int, default=9000)
+    parser.add_argument('--game-latency', type=float, default=0.05)
+    parser.add_argument('--game-jitter', type=float, default=0.02)
+    parser.add_argument('--game-error-rate', type=float, default=0.0)
+    parser.add_argument('--game-failure-rate', type=float, default=0.1)
+    args = parser.parse_args()
+
+    StubGameServer(args.game_port, args.game_latency, args.game_jitter, args.game_error_rate,
+                   args.game_failure_rate).start()
+
+    app_process = None
+    if args.start_server:
+        print('Starting Speech Server...')
+        port = int(args.url.rsplit(':', 1)[1].strip('/'))
+        app_process = start_app(port, 'http://localhost:{}/'.format(args.game_port), args.fill_cache)
+
+    corpus = read_corpus(args.corpus)
+    reports = []
+
+    try:
+        print('clients  replies  errors  throughput  p50      p90      p99      max')
+        for num_clients in [int(n) for n in args.clients.split(',')]:
+            report = run_load(args.url, num_clients, corpus, args.transcripts_per_client)
+            reports.append(report)
+
+            print('%-7d  %-7d  %-6d  %6.2f/s    %.3fs   %.3fs   %.3fs   %.3fs' %
+                  (report['clients'], report['replies'], len(report['errors']), report['throughput'],
+                   report['p50'], report['p90'], report['p99'], report['max']))
+    finally:
+        if app_process:
+            app_process.terminate()
+
+    saturated = saturation_point(reports)
+    if saturated is None:
+        print('\nNot saturated')
+    else:
+        print('\nSaturated at %d clients (%.2f replies/s)' %
+              (saturated, next(r['throughput'] for r in reports if r['clients'] == saturated)))
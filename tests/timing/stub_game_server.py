@@ -0,0 +1,78 @@
+from interface.mock_game import mock_game_response
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+from threading import Thread
+import argparse
+import json
+import random
+import time
+
+
+class StubGameServer(ThreadingMixIn, HTTPServer):
+    """
+    Stands in for the game, replying to the actions and questions posted by the speech server with responses in the
+    same format as `mock_post_to_game`, after a delay.
+    """
+    daemon_threads = True
+
+    def __init__(self, port: int, latency: float = 0.05, jitter: float = 0.0, error_rate: float = 0.0,
+                 failure_rate: float = 0.0):
+        """
+        :param latency: the average number of seconds the game takes to respond.
+        :param jitter: the standard deviation of the number of seconds the game takes to respond.
+        :param error_rate: the fraction of requests the game responds to with a server error.
+        :param failure_rate: the fraction of actions the game cannot perform, e.g. if there is no rock to pick up.
+        """
+        super().__init__(('', port), StubGameHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.failure_rate = failure_rate
+
+    def delay(self) -> float:
+        return max(0.0, random.gauss(self.latency, self.jitter))
+
+    def start(self) -> 'StubGameServer':
+        """
+        Serves requests in a background thread.
+        """
+        Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class StubGameHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        # Read the action, even though it is not used, so the connection can be reused.
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(self.server.delay())
+
+        if random.random() < self.server.error_rate:
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        success = random.random() >= self.server.failure_rate
+        body = json.dumps(mock_game_response(success)).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Logging every request would slow the server down under load.
+        pass
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Runs a stub of the game server.')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    print('Stub game server on port', args.port)
+    StubGameServer(args.port, args.latency, args.jitter, args.error_rate, args.failure_rate).serve_forever()
@@ -3,7 +3,7 @@ import time
 import numpy as np
 from typing import List
 from nltk.corpus import wordnet as wn
-from unittest import TestLoader, TextTestRunner
+from parsing.warmup_corpus import read_corpus, warm_up, coverage_report
 
 
 action_transcripts = [
@@ -60,10 +60,8 @@ if __name__ == '__main__':
     # Preload WordNet so it doesn't affect the timing of the first parse.
     print('Loading WordNet...')
     wn.ensure_loaded()
-    print('Filling Cache (Running Tests)...')
-    loader = TestLoader()
-    suite = loader.discover(start_dir='../parsing')
-    TextTestRunner(verbosity=0).run(suite)
+    print('Filling Cache (Parsing Warmup Corpus)...')
+    print(coverage_report(warm_up(action(), read_corpus('../../warmup_corpus.txt'))))
 
     print('Starting Timing...\n')
 
@@ -0,0 +1,68 @@
+from interface import prefork
+from parsing.parse_action import statement
+from parsing.warmup_corpus import read_corpus, warm_up
+from nltk.corpus import wordnet as wn
+from typing import List
+import os
+import sys
+import time
+
+
+def private_memory(pid: int) -> int:
+    """
+    :return: the number of kilobytes of memory the process does not share with other processes, e.g. pages of its
+             parent which it has written to since it was forked. Only available on Linux.
+    """
+    with open('/proc/{}/smaps_rollup'.format(pid)) as file:
+        return sum(int(line.split()[1]) for line in file if line.startswith(('Private_Clean', 'Private_Dirty')))
+
+
+def fork_workers(num_workers: int, transcripts: List[str], freeze: bool) -> List[int]:
+    """
+    Forks the workers, each of which parses the transcripts, as a worker serving players would.
+    :return: the private memory of each worker, in kilobytes, after parsing.
+    """
+    if freeze:
+        prefork.before_fork()
+
+    pids = []
+    pipes = []
+
+    for _ in range(num_workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+
+        if pid == 0:
+            prefork.after_fork()
+            grammar = statement()
+            warm_up(grammar, transcripts)
+            os.write(write_fd, str(private_memory(os.getpid())).encode())
+            os._exit(0)
+
+        pids.append(pid)
+        pipes.append(read_fd)
+
+    sizes = [int(os.read(fd, 64)) for fd in pipes]
+    for pid in pids:
+        os.waitpid(pid, 0)
+
+    return sizes
+
+
+if __name__ == '__main__':
+    num_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    corpus = read_corpus('warmup_corpus.txt')
+
+    prefork.before_loading()
+    start = time.perf_counter()
+    print('Loading WordNet and Filling Cache...')
+    wn.ensure_loaded()
+    warm_up(statement(), corpus)
+    print('Preloaded in %.1fs\n' % (time.perf_counter() - start))
+
+    # The same transcripts are parsed again by the workers, so they only read the warmed caches.
+    for freeze in [False, True]:
+        start = time.perf_counter()
+        sizes = fork_workers(num_workers, corpus, freeze)
+        print('gc.freeze: {:<5}  private memory per worker: {:.1f}MB  took {:.1f}s'.format(
+            str(freeze), sum(sizes) / len(sizes) / 1024, time.perf_counter() - start))
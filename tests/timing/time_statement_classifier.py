@@ -0,0 +1,87 @@
+from parsing.parse_action import statement
+from parsing.statement_classifier import StatementClassifier, Example, examples_from_log, train, FAMILIES
+from interface.conversation_logging import LOG_FILENAME
+from nltk.corpus import wordnet as wn
+from parsing.warmup_corpus import read_corpus, warm_up
+from typing import List
+import numpy as np
+import random
+import sys
+import time
+
+
+def split(examples: List[Example], test_fraction: float = 0.2) -> (List[Example], List[Example]):
+    """
+    :return: the examples shuffled and split into training and test examples.
+    """
+    examples = list(examples)
+    random.Random(0).shuffle(examples)
+    num_test = max(1, int(len(examples) * test_fraction))
+    return examples[num_test:], examples[:num_test]
+
+
+def accuracy(classifier: StatementClassifier, examples: List[Example], margin: float) -> (float, float, float):
+    """
+    :return: the fraction of examples whose family is the most likely, the fraction whose family is not skipped, and
+             the average number of families parsed.
+    """
+    top = kept = num_families = 0
+
+    for words, family in examples:
+        scores = classifier.scores(words)
+        families = classifier.families(words, margin)
+
+        top += scores is None or FAMILIES[int(np.argmax(scores))] == family
+        kept += family in families
+        num_families += len(families)
+
+    return top / len(examples), kept / len(examples), num_families / len(examples)
+
+
+def parse_time(classifier: StatementClassifier, examples: List[Example], margin: float) -> (float, float, float):
+    """
+    :return: the average time, in seconds, to parse the examples with every grammar, and with only the grammars kept
+             by the classifier. Also the fraction of examples parsed the same both ways.
+    """
+    full = statement()
+    pruned = statement(classifier=classifier, margin=margin)
+
+    full_times, pruned_times, same = [], [], 0
+
+    for words, _ in examples:
+        start = time.perf_counter()
+        full_result = full.parse(words)
+        full_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        pruned_result = pruned.parse(words)
+        pruned_times.append(time.perf_counter() - start)
+
+        same += full_result == pruned_result
+
+    return float(np.mean(full_times)), float(np.mean(pruned_times)), same / len(examples)
+
+
+if __name__ == '__main__':
+    # The labelled transcripts are read from the conversation log, e.g. from play testing.
+    log_filename = sys.argv[1] if len(sys.argv) > 1 else LOG_FILENAME
+    train_examples, test_examples = split(examples_from_log(log_filename))
+    print('Training on {} transcripts, testing on {}'.format(len(train_examples), len(test_examples)))
+
+    start = time.perf_counter()
+    classifier = train(train_examples)
+    print('Trained in %.2fs\n' % (time.perf_counter() - start))
+
+    # Preload WordNet and fill the cache so they don't affect the timing of the parses.
+    print('Loading WordNet...')
+    wn.ensure_loaded()
+    print('Filling Cache (Parsing Warmup Corpus)...')
+    warm_up(statement(), read_corpus('warmup_corpus.txt'))
+
+    print('\nmargin  top-1  kept   families  full    pruned  speedup  same parse')
+    for margin in [0.01, 0.05, 0.1, 0.2]:
+        top, kept, num_families = accuracy(classifier, test_examples, margin)
+        full_time, pruned_time, same = parse_time(classifier, test_examples, margin)
+
+        print('%.2f    %.3f  %.3f  %.2f      %.3fs  %.3fs  %.2fx    %.3f' %
+              (margin, top, kept, num_families, full_time, pruned_time, full_time / pruned_time, same))
@@ -3,6 +3,8 @@ from typing import List, Callable
 
 
 class PartialClassMixin:
+    __slots__ = ()
+
     @classmethod
     def partial_init(cls) -> Callable:
         def f(*args, **kwargs):